@@ -15,29 +15,41 @@
 # FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
 #
 
+import asyncio
 import base58
 import codecs
 import hashlib
+import hmac
+import inspect
 import itertools
 import json
 import logging
 import math
+import os
 import re
 import secrets
 import string
+import threading
 import warnings
 
-from functools		import wraps
-from collections	import namedtuple
-from typing		import Dict, List, Sequence, Tuple, Optional, Union, Callable
+from array		import array
+from functools		import partial, wraps
+from collections	import namedtuple, OrderedDict
+from types		import MappingProxyType
+from typing		import Dict, List, Sequence, Tuple, Optional, Union, Callable, Container, Iterable
 
-from shamir_mnemonic	import generate_mnemonics
+from shamir_mnemonic	import cipher as shamir_cipher, generate_mnemonics
 
 import hdwallet
 from hdwallet		import cryptocurrencies
-
-from .defaults		import BITS_DEFAULT, BITS, MNEM_ROWS_COLS, GROUP_REQUIRED_RATIO, CRYPTO_PATHS
-from .util		import ordinal, commas
+from hdwallet.libs.base58 import checksum_encode
+from hdwallet.libs.bech32 import bech32_decode, bech32_encode, convertbits
+from Crypto.Hash	import keccak  # A python-hdwallet dependency
+
+from .defaults		import (
+    BITS_DEFAULT, BITS, MNEM_ROWS_COLS, GROUP_REQUIRED_RATIO, CRYPTO_PATHS, DERIVATION_CACHE_SIZE,
+)
+from .util		import ordinal, commas, lazy_sequence, parallel_chunked, timer
 from .recovery		import produce_bip39, recover_bip39
 
 log				= logging.getLogger( __package__ )
@@ -69,6 +81,17 @@ except ImportError as exc:
     paper_wallet_issues.append( message )
 
 
+# The python-hdwallet pure-Python RIPEMD-160 is very slow; use OpenSSL's, if available
+try:
+    hashlib.new( 'ripemd160' )
+
+    def ripemd160( data ):
+        return hashlib.new( 'ripemd160', data ).digest()
+except ValueError as exc:
+    from hdwallet.libs.ripemd160 import ripemd160
+    log.info( f"Using python-hdwallet RIPEMD-160: {exc}" )
+
+
 RANDOM_BYTES			= secrets.token_bytes
 
 
@@ -80,24 +103,97 @@ def paper_wallet_available():
     return available
 
 
+class DerivationPath( tuple ):
+    """A full BIP-32 derivation path, compiled to a tuple of its uint32 indices (w/ the 2^31 hardened
+    bit), w/ its "m/..." string form cached.  Accepted (in place of a path str) by path_parser,
+    path_edit, path_hardened and Account.from_path, so derivations need never re-parse path text.
+
+    >>> path = DerivationPath( "m/44'/60'/0'/0/1" )
+    >>> path, path[-1], str( path[:3] ), path[:3] + ( 1, )
+    (DerivationPath("m/44'/60'/0'/0/1"), 1, "m/44'/60'/0'", DerivationPath("m/44'/60'/0'/1"))
+    >>> path == DerivationPath( path_indices( "m/44'/60'/0'/0/1" )), str( DerivationPath() )
+    (True, 'm/')
+    """
+    HARDENED			= 2**31
+
+    def __new__( cls, path: Union[str,Iterable[int]] = () ):
+        if isinstance( path, cls ):
+            return path
+        if isinstance( path, str ):
+            if not path.startswith( "m" ):
+                raise ValueError( f"Unrecognized HD wallet derivation path: {path!r}" )
+            indices		= path_indices( path )
+        else:
+            indices		= path
+        self			= super( DerivationPath, cls ).__new__( cls, indices )
+        if not all( isinstance( i, int ) and 0 <= i < 2**32 for i in self ):
+            raise ValueError( f"Invalid HD wallet derivation path indices: {indices!r}" )
+        return self
+
+    def __str__( self ):
+        try:
+            return self._path
+        except AttributeError:
+            self._path		= path_format( self ) or "m/"
+        return self._path
+
+    def __repr__( self ):
+        return f'{self.__class__.__name__}("{self}")'
+
+    def __getitem__( self, index ):
+        if isinstance( index, slice ):
+            return self.__class__( super( DerivationPath, self ).__getitem__( index ))
+        return super( DerivationPath, self ).__getitem__( index )
+
+    def __add__( self, other ):
+        return self.__class__( super( DerivationPath, self ).__add__( tuple( other )))
+
+    def hardened( self ) -> Tuple["DerivationPath","DerivationPath"]:
+        """Split into the leading hardened, and the trailing non-hardened path (relative to it)."""
+        split			= len( self )
+        while split and self[split-1] < self.HARDENED:
+            split	       -= 1
+        return self[:split], self[split:]
+
+
 def path_edit(
-    path: str,
-    edit: str,
+    path: Union[str,DerivationPath],
+    edit: Union[str,DerivationPath],
 ):
     """Replace the current path w/ the new path, either entirely, or if only partially if a continuation
-    '../' followed by some new path segments is provided.
-
+    '../' followed by some new path segments is provided.  If the current path is a DerivationPath, so
+    is the result.  Empty replacement segments (eg. "../") are rejected.
+
+    >>> path_edit( "m/44'/60'/0'/0/0", "../1/2" )
+    "m/44'/60'/0'/1/2"
+    >>> str( path_edit( DerivationPath( "m/44'/60'/0'/0/0" ), "../1/2" ))
+    "m/44'/60'/0'/1/2"
+    >>> path_edit( "m/44'/60'/0'/0/0", "../" )
+    Traceback (most recent call last):
+        ...
+    ValueError: Cannot use ../ to replace segments of m/44'/60'/0'/0/0 w/ an empty segment
+    >>> path_edit( DerivationPath( "m/44'/60'/0'/0/0" ), "../" )
+    Traceback (most recent call last):
+        ...
+    ValueError: Cannot use ../ to replace segments of m/44'/60'/0'/0/0 w/ an empty segment
     """
-    if edit.startswith( '.' ):
-        new_segs	= edit.lstrip( './' ).split( '/' )
-        cur_segs	= path.split( '/' )
-        log.debug( f"Using {edit} to replace last {len(new_segs)} of {path} with {'/'.join(new_segs)}" )
-        if len( new_segs ) >= len( cur_segs ):
-            raise ValueError( f"Cannot use {edit} to replace last {len(new_segs)} of {path} with {'/'.join(new_segs)}" )
-        res_segs	= cur_segs[:len(cur_segs)-len(new_segs)] + new_segs
-        return '/'.join( res_segs )
-    else:
+    if isinstance( edit, DerivationPath ):
         return edit
+    if not edit.startswith( '.' ):
+        return edit
+    new_segs			= edit.lstrip( './' ).split( '/' )
+    if not all( new_segs ):
+        raise ValueError( f"Cannot use {edit} to replace segments of {path} w/ an empty segment" )
+    if isinstance( path, DerivationPath ):
+        if len( new_segs ) > len( path ):
+            raise ValueError( f"Cannot use {edit} to replace last {len(new_segs)} of {path} with {'/'.join(new_segs)}" )
+        return path[:len( path ) - len( new_segs )] + path_indices( 'm/' + '/'.join( new_segs ))
+    cur_segs			= path.split( '/' )
+    log.debug( f"Using {edit} to replace last {len(new_segs)} of {path} with {'/'.join(new_segs)}" )
+    if len( new_segs ) >= len( cur_segs ):
+        raise ValueError( f"Cannot use {edit} to replace last {len(new_segs)} of {path} with {'/'.join(new_segs)}" )
+    res_segs			= cur_segs[:len(cur_segs)-len(new_segs)] + new_segs
+    return '/'.join( res_segs )
 
 
 class CronosMainnet( cryptocurrencies.Cryptocurrency ):
@@ -242,6 +338,120 @@ class XRPHDWallet( hdwallet.HDWallet ):
         return base58.b58encode_check( p2pkh, base58.RIPPLE_ALPHABET ).decode( 'UTF-8' )
 
 
+CryptoDescriptor		= namedtuple( 'CryptoDescriptor', ('crypto', 'format', 'wallet_cls', 'cryptocurrency', 'path', 'symbol') )
+
+
+class DerivationCache:
+    """A bounded (LRU) cache of derived python-hdwallet node states, by (<seed fingerprint>, <crypto>,
+    <path prefix indices>), shared by the Accounts derived by one call (eg. accounts, accountgroups).
+    Each sibling address under eg. m/44'/60'/0'/0/- then only pays for its own final child
+    derivation, instead of re-deriving the master key and every (hardened) parent.
+
+    These states hold private key material, so a cache is never process-wide: use it as a context
+    manager, to discard its states when the derivations are complete.
+
+    """
+    def __init__( self, size: int = DERIVATION_CACHE_SIZE ):
+        self.size		= size
+        self.states		= OrderedDict()
+        self.lock		= threading.Lock()
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, *exc ):
+        self.clear()
+
+    def __len__( self ):
+        return len( self.states )
+
+    def __iter__( self ):
+        with self.lock:
+            return iter( list( self.states ))
+
+    def clear( self ):
+        with self.lock:
+            self.states.clear()
+
+    def get( self, key ):
+        with self.lock:
+            state		= self.states.get( key )
+            if state is not None:
+                self.states.move_to_end( key )
+            return state
+
+    def put( self, key, state ):
+        """Remember the state under key, evicting the least recently used."""
+        if not self.size:
+            return
+        with self.lock:
+            self.states[key]	= state
+            self.states.move_to_end( key )
+            while len( self.states ) > self.size:
+                self.states.popitem( last=False )
+
+
+class HDWalletState:
+    """Saves, restores and shares the derived node state of a python-hdwallet HDWallet, for the
+    DerivationCache and Account.from_account.  This state is internal to python-hdwallet, so it is
+    only handled for a supported (major) version whose HDWallets have every attribute required;
+    otherwise, a warning is logged (once) and Accounts derive every node via the public API.
+
+    """
+    VERSIONS			= ( 2, )
+    # A derived node; the seeded state after .from_seed (which may already include a BIP-44/84 class
+    # default derivation) additionally includes the seed and root keys.
+    NODE			= (
+        '_private_key', '_chain_code', '_key', '_verified_key',
+        '_path', '_path_class', '_depth', '_index', '_parent_fingerprint',
+    )
+    SEED			= NODE + (
+        '_seed', '_i', '_root_private_key', '_root_public_key', '_public_key', '_semantic',
+    )
+    # The state specific to its crypto, address format and class; all other state (keys, chain
+    # codes, path) is shared by every (secp256k1) crypto derived at an identical path.
+    CRYPTO			= frozenset( ('_cryptocurrency', '_semantic', '_from_class', '_path_class', '_use_default_path') )
+    SUPPORTED			= {}		# By HDWallet class
+
+    @staticmethod
+    def version() -> Optional[int]:
+        """The python-hdwallet major version, eg. 2 for "v2.2.1" (None if unknown)."""
+        try:
+            return int( getattr( hdwallet, '__version__', '' ).lstrip( 'v' ).split( '.' )[0] )
+        except ValueError:
+            return None
+
+    @classmethod
+    def supported( cls, wallet: hdwallet.HDWallet ) -> bool:
+        """If the wallet's internal state may be saved, restored and shared (determined once per class)."""
+        supported		= cls.SUPPORTED.get( type( wallet ) )
+        if supported is None:
+            supported		= cls.SUPPORTED[type( wallet )] = (
+                cls.version() in cls.VERSIONS and all( hasattr( wallet, a ) for a in cls.SEED )
+            )
+            if not supported:
+                log.warning(
+                    f"python-hdwallet {getattr( hdwallet, '__version__', '(unknown)' )} {type( wallet ).__name__}"
+                    " state unsupported; HD wallet derivations will not be cached" )
+        return supported
+
+    @staticmethod
+    def save( wallet: hdwallet.HDWallet, attrs: Sequence[str] ) -> tuple:
+        return tuple( getattr( wallet, a ) for a in attrs )
+
+    @staticmethod
+    def restore( wallet: hdwallet.HDWallet, attrs: Sequence[str], state: tuple ):
+        for a,v in zip( attrs, state ):
+            setattr( wallet, a, v )
+
+    @classmethod
+    def adopt( cls, wallet: hdwallet.HDWallet, other: hdwallet.HDWallet ):
+        """Adopt the other wallet's derived keys and path, retaining the wallet's crypto-specific state."""
+        for a,v in vars( other ).items():
+            if a not in cls.CRYPTO:
+                setattr( wallet, a, v )
+
+
 class Account:
     """A Cryptocurrency "Account" / Wallet, based on a variety of underlying Python crypto-asset
     support modules.  Presently, only meherett/python-hdwallet is used.
@@ -356,12 +566,76 @@ class Account:
         )
     )
 
+    # Immutable (<crypto>, <format>) --> CryptoDescriptor table and "<name>/<symbol>" --> <crypto>
+    # aliases, precomputed from the above at import.  Saves re-normalizing the crypto and format, and
+    # python-hdwallet's (very slow) search for its cryptocurrency class, on every Account creation.
+    CRYPTO_DESCRIPTORS		= MappingProxyType( {} )
+    CRYPTO_ALIASES		= MappingProxyType( {} )
+
+    def derivation_cache_get( self, key, attrs ):
+        """Restore the cached HD wallet state attrs for key, returning True iff found.  The seeded
+        state (HDWalletState.SEED) is cached under (<seed fingerprint>, <crypto>, <format>), and
+        each derived node (HDWalletState.NODE) under (<seed fingerprint>, <crypto>, <path indices>).
+
+        """
+        state			= self.cache.get( key ) if self.cache is not None else None
+        if state is None:
+            return False
+        HDWalletState.restore( self.hdwallet, attrs, state )
+        return True
+
+    def derivation_cache_put( self, key, attrs ):
+        """Remember the HD wallet's current state attrs under key, if caching."""
+        if self.cache is not None:
+            self.cache.put( key, HDWalletState.save( self.hdwallet, attrs ))
+
+    @classmethod
+    def descriptors( cls ):
+        """Build the CryptoDescriptor of every supported (<crypto>, <format>), and the aliases by which
+        each supported crypto may be named.
+
+        """
+        descriptors		= {}
+        for crypto in cls.CRYPTOCURRENCIES:
+            cryptocurrency	= cls.CRYPTO_LOCAL.get( crypto ) or cryptocurrencies.get_cryptocurrency( crypto )
+            for format in cls.FORMATS:
+                wallet_cls	= cls.CRYPTO_WALLET_CLS.get( crypto ) or (
+                    hdwallet.BIP84HDWallet if format == "bech32" else hdwallet.BIP44HDWallet
+                )
+                descriptors[crypto,format] = CryptoDescriptor(
+                    crypto		= crypto,
+                    format		= format,
+                    wallet_cls		= wallet_cls,
+                    cryptocurrency	= cryptocurrency,
+                    path		= cls.CRYPTO_FORMAT_PATH[crypto].get( format ),
+                    symbol		= cls.CRYPTO_LOCAL_SYMBOL.get( crypto, crypto ),
+                )
+        aliases			= { name.lower(): crypto for name,crypto in cls.CRYPTO_NAMES.items() }
+        aliases.update( { crypto.lower(): crypto for crypto in cls.CRYPTOCURRENCIES } )
+        aliases.update( { crypto: crypto for crypto in cls.CRYPTOCURRENCIES } )
+        return MappingProxyType( descriptors ), MappingProxyType( aliases )
+
+    @classmethod
+    def descriptor( cls, crypto, format=None ):
+        """Return the CryptoDescriptor for the crypto in the given (or its default) address format."""
+        found			= cls.CRYPTO_DESCRIPTORS.get( (crypto, format or cls.CRYPTO_FORMAT.get( crypto )) )
+        if found is None:
+            crypto		= cls.supported( crypto )
+            format		= format.lower() if format else cls.address_format( crypto )
+            found		= cls.CRYPTO_DESCRIPTORS.get( (crypto, format) )
+            if found is None:
+                raise ValueError( f"{crypto} does not support address format {format}" )
+        return found
+
     @classmethod
     def path_default( cls, crypto, format=None ):
         """Return the default derivation path for the given crypto, based on its currently selected default
         address format.
 
         """
+        found			= cls.CRYPTO_DESCRIPTORS.get( (crypto, format or cls.CRYPTO_FORMAT.get( crypto )) )
+        if found is not None and found.path:
+            return found.path
         crypto			= cls.supported( crypto )
         format			= format.lower() if format else cls.address_format( crypto )
         if format not in cls.CRYPTO_FORMAT_PATH[crypto]:
@@ -375,6 +649,8 @@ class Account:
         default derivation path.
 
         """
+        if format is None and crypto in cls.CRYPTO_FORMAT:
+            return cls.CRYPTO_FORMAT[crypto]
         crypto			= cls.supported( crypto )
         if format is None:
             return cls.CRYPTO_FORMAT[crypto]
@@ -390,10 +666,7 @@ class Account:
         for it, or raises an a ValueError.  Eg. "Ethereum" --> "ETH"
 
         """
-        validated		= cls.CRYPTO_NAMES.get(
-            crypto.lower(),
-            crypto.upper() if crypto.upper() in cls.CRYPTOCURRENCIES else None
-        )
+        validated		= cls.CRYPTO_ALIASES.get( crypto ) or cls.CRYPTO_ALIASES.get( crypto.lower() )
         if validated:
             return validated
         raise ValueError( f"{crypto} not presently supported; specify {commas( cls.CRYPTOCURRENCIES )}" )
@@ -410,35 +683,51 @@ class Account:
     def __repr__( self ):
         return f"{self.__class__.__name__}({self} @{self.path})"
 
-    def __init__( self, crypto, format=None ):
-        crypto			= Account.supported( crypto )
-        cryptocurrency		= self.CRYPTO_LOCAL.get( crypto )
-        self.format		= format.lower() if format else Account.address_format( crypto )
-        hdwallet_cls		= self.CRYPTO_WALLET_CLS.get( crypto )
-        if hdwallet_cls is None and self.format in ("legacy", "segwit",):
-            hdwallet_cls	= hdwallet.BIP44HDWallet
-        if hdwallet_cls is None and self.format in ("bech32",):
-            hdwallet_cls	= hdwallet.BIP84HDWallet
-        if hdwallet_cls is None:
-            raise ValueError( f"{crypto} does not support address format {self.format}" )
-        self.hdwallet		= hdwallet_cls( symbol=crypto, cryptocurrency=cryptocurrency )
-
-    def from_seed( self, seed: str, path: str = None ) -> "Account":
+    def __init__( self, crypto, format=None, cache: Optional[DerivationCache] = None ):
+        descriptor		= Account.descriptor( crypto, format )
+        self.format		= descriptor.format
+        self.hdwallet		= descriptor.wallet_cls( symbol=descriptor.crypto, cryptocurrency=descriptor.cryptocurrency )
+        self.cache		= cache if cache is not None and HDWalletState.supported( self.hdwallet ) else None
+        self.fingerprint	= None  # Of the seed, iff derived via .from_seed w/ a DerivationCache
+
+    def from_seed( self, seed: str, path: Union[str,DerivationPath] = None ) -> "Account":
         """Derive the Account from the supplied seed and (optionally) path; uses the default derivation path
         for the Account address format, if None provided.
 
         """
         if type( seed ) is bytes:
             seed		= codecs.encode( seed, 'hex_codec' ).decode( 'ascii' )
-        self.hdwallet.from_seed( seed )
+        if self.cache is None:
+            self.fingerprint	= None
+            self.hdwallet.from_seed( seed )
+            self.from_path( path )
+            return self
+        self.fingerprint	= hashlib.sha256( seed.lower().encode( 'ascii' )).digest()
+        seeded			= ( self.fingerprint, self.crypto, self.format )
+        if not self.derivation_cache_get( seeded, HDWalletState.SEED ):
+            self.hdwallet.from_seed( seed )
+            self.derivation_cache_put( seeded, HDWalletState.SEED )
         self.from_path( path )
         return self
 
+    def from_account( self, other: "Account" ) -> "Account":
+        """Adopt the derived keys and path of another Account, eg. of another crypto (such as ETH, BNB
+        and CRO) derived at an identical path; these differ only in their address encoding.  Requires
+        a python-hdwallet whose state is supported (see HDWalletState).
+
+        """
+        if not HDWalletState.supported( self.hdwallet ):
+            raise ValueError( f"Cannot adopt the derived keys of {other!r}: unsupported python-hdwallet" )
+        HDWalletState.adopt( self.hdwallet, other.hdwallet )
+        self.fingerprint	= other.fingerprint
+        return self
+
     def from_mnemonic( self, mnemonic: str, path: str = None ) -> "Account":
         """Derive the Account from the supplied BIP-39 mnemonic and (optionally) path; uses the
         default derivation path for the Account address format, if None provided.
 
         """
+        self.fingerprint	= None
         self.hdwallet.from_mnemonic( mnemonic )
         self.from_path( path )
         return self
@@ -468,16 +757,18 @@ class Account:
             m/44'/60'/0'/1'/0
 
         """
+        self.fingerprint	= None
         self.hdwallet.from_xpublic_key( xpubkey )
         self.from_path( path )
         return self
 
     def from_xprvkey( self, xprvkey: str, path: str = None ) -> "Account":
+        self.fingerprint	= None
         self.hdwallet.from_xprivate_key( xprvkey )
         self.from_path( path )
         return self
 
-    def from_path( self, path: str = None ) -> "Account":
+    def from_path( self, path: Union[str,DerivationPath] = None ) -> "Account":
         """Change the Account to derive from the provided path.
 
         If a partial path is provided (eg "...1'/0/3"), then use it to replace the given segments in
@@ -485,16 +776,50 @@ class Account:
 
         If the derivation path is empty (only "m/") then leave the Account at clean_derivation state
 
+        If a (compiled) DerivationPath is provided, its indices are used directly, w/o parsing.
+
+        If derived from a seed w/ a DerivationCache, resume from the deepest cached parent node of
+        the path (eg. the m/44'/60'/0'/0 of m/44'/60'/0'/0/123), and cache each newly derived parent
+        node.
+
         """
-        from_path		= self.path or Account.path_default( self.crypto, self.format )
-        if path:
-            from_path		= path_edit( from_path, path )
-        self.hdwallet.clean_derivation()
-        # Valid HD wallet derivation paths always start with "m/"
-        if not ( from_path and len( from_path ) >= 2 and from_path.startswith( "m/" ) ):
-            raise ValueError( f"Unrecognized HD wallet derivation path: {from_path!r}" )
-        if len( from_path ) > 2:
-            self.hdwallet.from_path( from_path )
+        if isinstance( path, DerivationPath ):
+            indices		= tuple( path )
+        else:
+            from_path		= self.path or Account.path_default( self.crypto, self.format )
+            if path:
+                from_path	= path_edit( from_path, path )
+            # Valid HD wallet derivation paths always start with "m/"
+            if not ( from_path and len( from_path ) >= 2 and from_path.startswith( "m/" ) ):
+                raise ValueError( f"Unrecognized HD wallet derivation path: {from_path!r}" )
+            # Segmented and parsed identically to python-hdwallet's .from_path
+            indices		= tuple(
+                int( seg[:-1] ) + DerivationPath.HARDENED if "'" in seg else int( seg )
+                for seg in ( from_path.lstrip( "m/" ).split( "/" ) if len( from_path ) > 2 else [] )
+            )
+
+        if self.fingerprint is None:
+            depth		= 0
+            self.hdwallet.clean_derivation()
+        else:
+            for depth in reversed( range( len( indices ))):
+                if self.derivation_cache_get(
+                    ( self.fingerprint, self.crypto, indices[:depth] ), HDWalletState.NODE
+                ):
+                    break
+            else:
+                depth		= 0
+                self.hdwallet.clean_derivation()
+                if indices:
+                    self.derivation_cache_put( ( self.fingerprint, self.crypto, () ), HDWalletState.NODE )
+        for depth in range( depth, len( indices )):
+            index		= indices[depth]
+            if index >= DerivationPath.HARDENED:
+                self.hdwallet.from_index( index - DerivationPath.HARDENED, hardened=True )
+            else:
+                self.hdwallet.from_index( index )
+            if self.fingerprint is not None and depth + 1 < len( indices ):
+                self.derivation_cache_put( ( self.fingerprint, self.crypto, indices[:depth + 1] ), HDWalletState.NODE )
         return self
 
     @property
@@ -573,6 +898,7 @@ class Account:
         return self.hdwallet.xpublic_key()
 
     def from_private_key( self, private_key ):
+        self.fingerprint	= None
         self.hdwallet.from_private_key( private_key )
         return self
 
@@ -658,14 +984,19 @@ class Account:
         return self
 
 
+Account.CRYPTO_DESCRIPTORS,Account.CRYPTO_ALIASES = Account.descriptors()
+
+
 def path_parser(
-    paths: str,
+    paths: Union[str,DerivationPath],
     allow_unbounded: bool	= True,
 ) -> Tuple[str, Dict[str, Callable[[], int]]]:
     """Create a format and a dictionary of iterators to feed into it.
 
     Supports paths with an arbitrary prefix, eg. 'm/' or '../'
     """
+    if isinstance( paths, DerivationPath ):
+        return str( paths ), {}
     path_segs			= paths.split( '/' )
     unbounded			= False
     ranges			= {}
@@ -694,11 +1025,155 @@ def path_parser(
     return path_fmt, ranges
 
 
+class PathSequence:
+    """An indexable sequence of the paths produced by modulating the format specifiers of the path_fmt
+    according to their value sources in ranges (eg. as produced by path_parser), the final segment's
+    values varying fastest.  Any path may be computed directly from its index via mixed-radix
+    arithmetic, so resuming at (or sharding from) the N'th path doesn't require producing the N-1
+    paths before it.
+
+    >>> seq = path_sequence( *path_parser( "m/44'/60'/-1'/0/-2" ))
+    >>> len( seq ), seq[4], list( seq[1:6:2] )
+    (6, "m/44'/60'/1'/0/1", ["m/44'/60'/0'/0/1", "m/44'/60'/1'/0/0", "m/44'/60'/1'/0/2"])
+    >>> [ list( part ) for part in seq.partition( 4 ) ][-2:]
+    [["m/44'/60'/1'/0/1"], ["m/44'/60'/1'/0/2"]]
+
+    Only the first range may be unbounded (eg. from "-", an itertools.count).  These sequences have
+    no len(), and support only non-negative indices and slices; they are partitioned into strided
+    (rather than contiguous) shards:
+
+    >>> seq = path_sequence( *path_parser( "m/44'/60'/0'/0/5-" ))
+    >>> seq[1000000], seq[10:][0], list( seq.partition( 3 )[1][:2] )
+    ("m/44'/60'/0'/0/1000005", "m/44'/60'/0'/0/15", ["m/44'/60'/0'/0/6", "m/44'/60'/0'/0/9"])
+
+    If compiled, full "m/..." paths are produced as DerivationPaths directly from the range values,
+    w/o formatting (or later re-parsing) any path text:
+
+    >>> path_sequence( *path_parser( "m/44'/60'/0'/0/5-" ), compiled=True )[2]
+    DerivationPath("m/44'/60'/0'/0/7")
+
+    """
+    __slots__			= ( 'path_fmt', 'keys', 'values', 'start', 'stop', 'step', 'template' )
+
+    def __init__(
+        self,
+        path_fmt: str,
+        ranges: Dict[str, Callable[[], Iterable[int]]],
+        start: int		= 0,
+        stop: Optional[int]	= None,		# Default: the end of the (bounded) ranges, or unbounded
+        step: int		= 1,
+        compiled: bool		= False,  # Produce full paths as DerivationPaths
+    ):
+        self.path_fmt		= path_fmt
+        self.keys		= sorted( ranges )
+        self.template		= None		# Each segment's fixed index, or (<key>, <hardened bit>)
+        if compiled and path_fmt in ( "m", "m/" ):
+            self.template	= []
+        elif compiled and path_fmt.startswith( "m/" ):
+            self.template	= [
+                ( seg[1], DerivationPath.HARDENED if seg.endswith( "'" ) else 0 ) if seg.startswith( '{' )
+                else int( seg[:-1] ) + DerivationPath.HARDENED if seg.endswith( "'" ) else int( seg )
+                for seg in path_fmt[2:].split( '/' )
+            ]
+        self.values		= []		# A sequence of each key's values; or an unbounded count's start
+        for i,k in enumerate( self.keys ):
+            values		= ranges[k]() if callable( ranges[k] ) else ranges[k]
+            if isinstance( values, itertools.count ):
+                assert i == 0, \
+                    f"Only the first range in {path_fmt} may be unbounded"
+                values		= next( values )
+            elif not isinstance( values, ( range, int )):
+                values		= tuple( values )
+            self.values.append( values )
+        if stop is None and not self.unbounded:
+            stop		= math.prod( len( v ) for v in self.values )
+        self.start		= start
+        self.stop		= stop
+        self.step		= step
+
+    @property
+    def unbounded( self ) -> bool:
+        return bool( self.values ) and isinstance( self.values[0], int )
+
+    def view( self, start, stop, step ) -> "PathSequence":
+        """A PathSequence of the same paths, over a different window of indices."""
+        seq			= self.__class__.__new__( self.__class__ )
+        seq.path_fmt,seq.keys,seq.values,seq.template = self.path_fmt, self.keys, self.values, self.template
+        seq.start,seq.stop,seq.step = start, stop, step
+        return seq
+
+    def path( self, n: int ) -> Union[str,DerivationPath]:
+        """Produce the n'th path of the full sequence of paths (ignoring any window)."""
+        values			= {}
+        for k,v in zip( reversed( self.keys ), reversed( self.values )):
+            if isinstance( v, int ):
+                values[k]	= v + n
+            else:
+                n,i		= divmod( n, len( v ))
+                values[k]	= v[i]
+        if self.template is not None:
+            return DerivationPath(
+                seg if isinstance( seg, int ) else values[seg[0]] + seg[1]
+                for seg in self.template
+            )
+        return self.path_fmt.format( **values )
+
+    def window( self ) -> range:
+        if self.stop is None:
+            raise TypeError( f"Unbounded sequence of {self.path_fmt} paths has no len()" )
+        return range( self.start, self.stop, self.step )
+
+    def __len__( self ):
+        return len( self.window() )
+
+    def __bool__( self ):
+        return self.stop is None or bool( self.window() )
+
+    def __iter__( self ):
+        return map( self.path, itertools.count( self.start, self.step ) if self.stop is None else self.window() )
+
+    def __getitem__( self, index: Union[int,slice] ):
+        if self.stop is not None:
+            if isinstance( index, slice ):
+                window		= self.window()[index]
+                return self.view( window.start, window.stop, window.step )
+            return self.path( self.window()[index] )
+        # Unbounded; only non-negative indices/slices w/ positive steps are meaningful
+        if isinstance( index, slice ):
+            begin,end,step	= index.start or 0, index.stop, index.step or 1
+            if begin < 0 or ( end is not None and end < 0 ) or step < 1:
+                raise IndexError( f"Unbounded sequence of {self.path_fmt} paths supports only non-negative slices" )
+            return self.view(
+                self.start + begin * self.step,
+                None if end is None else self.start + max( begin, end ) * self.step,
+                self.step * step,
+            )
+        if index < 0:
+            raise IndexError( f"Unbounded sequence of {self.path_fmt} paths supports only non-negative indices" )
+        return self.path( self.start + index * self.step )
+
+    def partition( self, k: int ) -> List["PathSequence"]:
+        """Partition the paths into k contiguous (nearly) equal sequences; unbounded sequences are
+        partitioned into k interleaved sequences, instead.
+
+        """
+        if self.stop is None:
+            return [ self[i::k] for i in range( k ) ]
+        size,extra		= divmod( len( self ), k )
+        bounds			= [ i * size + min( i, extra ) for i in range( k + 1 ) ]
+        return [ self[b:e] for b,e in zip( bounds, bounds[1:] ) ]
+
+    def __repr__( self ):
+        window			= f"{self.start}:{'' if self.stop is None else self.stop}" + ( f":{self.step}" if self.step != 1 else "" )
+        return f"{self.__class__.__name__}({self.path_fmt!r}[{window}])"
+
+
 def path_sequence(
     path_fmt: str,
     ranges: Dict[str, Callable[[], int]],
-):
-    """Yield a sequence of paths, modulating the format specifiers of the
+    compiled: bool		= False,
+) -> PathSequence:
+    """Return the sequence of paths, modulating the format specifiers of the
     path_fmt according to their value sources in ranges.
 
     For example, a
@@ -711,33 +1186,11 @@ def path_sequence(
         "m/44'/60'/0'/0/0"
         "m/44'/60'/0'/0/1"
         "m/44'/60'/0'/0/2"
+
+    The PathSequence is indexable, and may be sliced or partitioned (eg. to resume or shard).  If
+    compiled, any full "m/..." paths are produced as DerivationPaths.
     """
-    # Stert all the iterators
-    viters			= {
-        k: iter( l() )
-        for k,l in ranges.items()
-    }
-    values			= {		# Initial round of values; must provide at least one
-        k: next( viters[k] )
-        for k in viters
-    }
-    assert all( v is not None for v in values.values() ), \
-        "Iterators for path segment values must yield at least an initial value"
-
-    while not any( v is None for v in values.values() ):
-        yield path_fmt.format( **values )
-        if not ranges:
-            break				# No variable records at all; just one
-        # Get the next value.  Working from the lowest iterator up, cycle value(s)
-        for i,k in enumerate( sorted( viters.keys(), reverse=True )):
-            values[k]		= next( viters[k], None )
-            if values[k] is not None:
-                break
-            # OK, this iterable has ended.  Restart it, and cycle to the next one up, iff
-            # there are remaining ranges
-            if i+1 < len( ranges ):
-                viters[k]	= iter( ranges[k]() )
-                values[k]	= next( viters[k], None )
+    return PathSequence( path_fmt, ranges, compiled=compiled )
 
 
 def path_hardened( path ):
@@ -754,8 +1207,10 @@ def path_hardened( path ):
     >>> path_hardened( "m/1/2/3'/4" )
     ("m/1/2/3'", 'm/4')
 
-    Returns  the two components as a tuple of two paths
+    Returns  the two components as a tuple of two paths (DerivationPaths, if path is one)
     """
+    if isinstance( path, DerivationPath ):
+        return path.hardened()
     segs			= path.split( '/' )
     # Always leaves the m/ on the hard path
     for hardened in range( 1, len( segs ) + 1 ):
@@ -901,6 +1356,7 @@ def create(
     iteration_exponent: int	= 1,
     cryptopaths: Optional[Sequence[Union[str,Tuple[str,str]]]] = None,  # default: ETH, BTC at default paths
     strength: int		= 128,
+    lazy: bool			= False,		# Derive Details.accounts groups only on demand
 ) -> Tuple[str,int,Dict[str,Tuple[int,List[str]]], Sequence[Sequence[Account]], bool]:
     """Creates a SLIP-39 encoding for supplied master_secret Entropy, and 1 or more Cryptocurrency
     accounts.  Returns the Details, in a form directly compatible with the layout.produce_pdf API.
@@ -908,6 +1364,12 @@ def create(
     The master_secret Seed Entropy is discarded (because it is, of course, always recoverable from
     the SLIP-39 mnemonics).
 
+    If lazy, the Details.accounts are a lazy (memoizing) sequence of the accountgroups; each group
+    is only derived when indexed or iterated.  For example, produce_pdf only uses accounts[0]
+    (unless paper wallets are requested), so the remainder of a wide range of derivation paths need
+    never be derived.  However, the wallet derivation Seed is then retained (by the sequence) until
+    every group has been derived.
+
     Creates accountgroups derived from the Seed Entropy.  By default, this is done in the SLIP-39
     standard, using the master_secret Entropy directly.  If a passphrase is supplied, this is also
     used in the SLIP-39 standard fashion (not recommended -- not Trezor "Model T" compatible).
@@ -939,11 +1401,11 @@ def create(
                 if log.isEnabledFor( logging.DEBUG ) else ""
             )
         )
-        accts			= list( accountgroups(
+        accts			= accountgroups(
             master_secret	= bip39_seed,
             cryptopaths		= cryptopaths,
             allow_unbounded	= False,
-        ))
+        )
         passphrase		= b""
     else:
         # For SLIP-39, accounts are generated directly from supplied Entropy, and passphrase
@@ -954,11 +1416,19 @@ def create(
                 if log.isEnabledFor( logging.DEBUG ) else ""
             )
         )
-        accts			= list( accountgroups(
+        accts			= accountgroups(
             master_secret	= master_secret,
             cryptopaths		= cryptopaths,
             allow_unbounded	= False,
-        ))
+        )
+
+    # Derive (and validate the cryptopaths of) the first group of accounts now; if lazy, the
+    # remainder only on demand.
+    if lazy:
+        accts			= lazy_sequence( accts )
+        accts.produce( 1 )
+    else:
+        accts			= list( accts )
 
     # Generate the SLIP-39 Mnemonics representing the supplied master_secret Seed Entropy.  This
     # always recovers the Seed Entropy; if not using_bip39, this is also the wallet derivation Seed;
@@ -1016,11 +1486,41 @@ def mnemonics(
         iteration_exponent = iteration_exponent )
 
 
+ENCRYPTION_COSTS		= {}  # Calibrated seconds per SLIP-39 encryption at iteration_exponent 0, by strength
+
+
+def encryption_costs(
+    iteration_exponents: Iterable[int] = range( 6 ),
+    strength: int		= 128,
+    samples: int		= 3,
+) -> Dict[int,float]:
+    """Estimate the seconds required on this machine to encrypt (or decrypt) a strength-bit SLIP-39
+    master secret, at each iteration_exponent.  The PBKDF2-based Feistel rounds cost 10,000 x
+    2^iteration_exponent iterations, so the fastest of a few exponent 0 encryptions is measured
+    (once per strength), and scaled.
+
+    """
+    if strength not in ENCRYPTION_COSTS:
+        secret			= bytes( strength // 8 )
+        cost			= None
+        for _ in range( samples ):
+            beg			= timer()
+            shamir_cipher.encrypt( secret, b"", 0, 0 )
+            dur			= timer() - beg
+            cost		= dur if cost is None else min( cost, dur )
+        ENCRYPTION_COSTS[strength] = cost
+    return {
+        iteration_exponent: ENCRYPTION_COSTS[strength] * 2 ** iteration_exponent
+        for iteration_exponent in iteration_exponents
+    }
+
+
 def account(
     master_secret: Union[str,bytes],
     crypto: str			= None,  # default 'ETH'
-    path: str			= None,  # default to the crypto's path_default
+    path: Union[str,DerivationPath] = None,  # default to the crypto's path_default
     format: str			= None,  # eg. 'bech32', or use the default address format for the crypto
+    cache: Optional[DerivationCache] = None,  # Share derived parent nodes w/ other Accounts
 ):
     """Generate an HD wallet Account from the supplied master_secret seed, at the given HD derivation
     path, for the specified cryptocurrency.
@@ -1034,6 +1534,7 @@ def account(
         acct			= Account(
             crypto	= crypto or 'ETH',
             format	= format,
+            cache	= cache,
         )
         acct.from_seed(
             seed	= master_secret,
@@ -1073,17 +1574,19 @@ def accounts(
     allow_unbounded		= True,
 ):
     """Create accounts for crypto, at the provided paths (allowing ranges), with the optionsal address format. """
-    for path in [None] if paths is None else path_sequence( *path_parser(
-        paths		= paths,
-        allow_unbounded	= allow_unbounded,
-    )):
-        yield account( master_secret, crypto=crypto, path=path, format=format )
+    with DerivationCache() as cache:
+        for path in [None] if paths is None else path_sequence( *path_parser(
+            paths		= paths,
+            allow_unbounded	= allow_unbounded,
+        )):
+            yield account( master_secret, crypto=crypto, path=path, format=format, cache=cache )
 
 
 def accountgroups(
     master_secret: Union[str,bytes],
     cryptopaths: Optional[Sequence[Union[str,Tuple[str,str]]]] = None,  # Default: ETH, BTC
     allow_unbounded: bool	= True,
+    start: int			= 0,     # Begin at this group, eg. to resume; prior paths aren't generated
 ) -> Sequence[Sequence[Account]]:
     """Generate the desired cryptocurrency account(s) at each crypto's given path(s).  This is useful
     for generating sequences of groups of wallets for multiple cryptocurrencies, eg. for receiving
@@ -1106,15 +1609,44 @@ def accountgroups(
         ...
 
     """
-    yield from zip( *[
-        accounts(
-            master_secret	= master_secret,
-            crypto		= crypto,
-            paths		= paths,
-            allow_unbounded	= allow_unbounded,
-        )
-        for crypto,paths in cryptopaths_parser( cryptopaths )
-    ])
+    cryptopaths			= cryptopaths_parser( cryptopaths )
+    cryptoformats		= [
+        (crypto, Account.address_format( crypto ))
+        for crypto,_ in cryptopaths
+    ]
+    with DerivationCache() as cache:
+        for paths in zip( *[
+            path_sequence( *path_parser(
+                paths		= paths,
+                allow_unbounded	= allow_unbounded,
+            ), compiled=True )[start:]
+            for _,paths in cryptopaths
+        ]):
+            yield accountgroup( master_secret, cryptoformats, paths, cache=cache )
+
+
+def accountgroup(
+    master_secret: Union[str,bytes],
+    cryptoformats: Sequence[Tuple[str,str]],
+    paths: Sequence[str],
+    cache: Optional[DerivationCache] = None,
+) -> Tuple[Account, ...]:
+    """Derive a group of Accounts for each (<crypto>, <format>) at the corresponding path.  Cryptos at
+    an identical full path (eg. ETH, BNB and CRO at m/44'/60'/0'/0/0) derive its keys only once, and
+    each adopts them to produce its own address encoding.  Partial paths (eg. "../0/1") are relative
+    to each crypto's own default path, so are always derived separately.
+
+    """
+    derived			= {}
+    group			= []
+    for (crypto,format),path in zip( cryptoformats, paths ):
+        prior			= derived.get( path ) if isinstance( path, DerivationPath ) or path.startswith( "m/" ) else None
+        if prior is None or not HDWalletState.supported( prior.hdwallet ):
+            acct		= derived[path] = account( master_secret, crypto=crypto, path=path, format=format, cache=cache )
+        else:
+            acct		= Account( crypto=crypto, format=format ).from_account( prior )
+        group.append( acct )
+    return tuple( group )
 
 
 def address(
@@ -1148,20 +1680,653 @@ def addresses(
         yield (acct.crypto, acct.path, acct.address)
 
 
+def addressgroups_chunk(
+    master_secret: Union[str,bytes],
+    cryptoformats: Sequence[Tuple[str,str]],
+    pathgroups: Sequence[Sequence[str]],
+) -> List[Tuple[Tuple[str,str,str], ...]]:
+    """Derive the address groups for a chunk of path groups, eg. in an addressgroups worker process.
+    The chunk's DerivationCache retains the shared (hardened) parent nodes, so they are derived only
+    once per chunk.
+
+    """
+    with DerivationCache() as cache:
+        return [
+            tuple(
+                (acct.crypto, acct.path, acct.address)
+                for acct in accountgroup( master_secret, cryptoformats, paths, cache=cache )
+            )
+            for paths in pathgroups
+        ]
+
+
 def addressgroups(
     master_secret: Union[str,bytes],
     cryptopaths: Optional[Sequence[Union[str,Tuple[str,str]]]] = None,  # Default ETH, BTC
     allow_unbounded: bool	= True,
+    workers: Optional[int]	= None,  # Derive in a pool of this many processes (default: serially)
+    chunksize: int		= 100,   # ...in chunks of this many address groups
+    start: int			= 0,     # Begin at this group, eg. to resume; prior paths aren't generated
 ) -> Sequence[str]:
     """Yields account (<crypto>, <path>, <address>) records for the desired cryptocurrencies at paths.
 
+    If workers are specified, the sequence of path groups is partitioned into chunks, derived across
+    a pool of processes, and yielded in path order.  Only a bounded number of chunks are in-flight,
+    so (unbounded) ranges are generated only as fast as they are consumed.
+
     """
-    yield from zip( *[
-        addresses(
+    if workers:
+        yield from addressgroups_parallel(
             master_secret	= master_secret,
-            paths		= paths,
-            crypto		= crypto,
+            cryptopaths		= cryptopaths,
             allow_unbounded	= allow_unbounded,
+            workers		= workers,
+            chunksize		= chunksize,
+            start		= start,
         )
-        for crypto,paths in cryptopaths_parser( cryptopaths )
+        return
+    for group in accountgroups(
+        master_secret	= master_secret,
+        cryptopaths	= cryptopaths,
+        allow_unbounded	= allow_unbounded,
+        start		= start,
+    ):
+        yield tuple( (acct.crypto, acct.path, acct.address) for acct in group )
+
+
+def addressgroups_parallel(
+    master_secret: Union[str,bytes],
+    cryptopaths: Optional[Sequence[Union[str,Tuple[str,str]]]] = None,  # Default ETH, BTC
+    allow_unbounded: bool	= True,
+    workers: int		= None,  # default: os.cpu_count()
+    chunksize: int		= 100,
+    start: int			= 0,
+) -> Sequence[str]:
+    """Yields the addressgroups, derived in chunks of path groups by a pool of worker processes.
+
+    The path groups are cheaply formatted here, and the expensive derivations performed in the
+    workers.  Each crypto's address format is resolved here, since any changes to the default
+    Account.address_format may not be visible in (eg. spawned) worker processes.
+
+    The shared (hardened) parent nodes are derived once per chunk, not once per worker: each chunk's
+    DerivationCache is discarded w/ its results, so no private key material outlives it in the
+    workers.  A larger chunksize amortizes these parent derivations over more path groups.
+
+    """
+    cryptopaths			= cryptopaths_parser( cryptopaths )
+    cryptoformats		= [
+        (crypto, Account.address_format( crypto ))
+        for crypto,_ in cryptopaths
+    ]
+    pathgroups			= zip( *[
+        path_sequence( *path_parser(
+            paths		= paths,
+            allow_unbounded	= allow_unbounded,
+        ), compiled=True )[start:]
+        for _,paths in cryptopaths
     ])
+    yield from parallel_chunked(
+        partial( addressgroups_chunk, master_secret, cryptoformats ), pathgroups,
+        chunksize=chunksize, workers=workers )
+
+
+def used_predicate(
+    used: Union[str,os.PathLike,Container[str],Callable[[List[str]],Iterable[bool]]],
+) -> Tuple[Callable[[List[str]],List[bool]],Callable[[],None]]:
+    """Adapt a "used?" source into a batch predicate, returning it and a function to close it.
+
+    The source may be a file name (of addresses, one per line), a container of addresses (eg. a set),
+    or a (sync or async) callable accepting a list of addresses, returning an iterable of bools.  If
+    called within a running event loop (which can't be re-entered), an async callable is run on its
+    own event loop, in a separate thread.
+
+    """
+    if inspect.iscoroutinefunction( used ):
+        loop			= asyncio.new_event_loop()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return lambda addrs: list( loop.run_until_complete( used( addrs ))), loop.close
+        thread			= threading.Thread( target=loop.run_forever, daemon=True )
+        thread.start()
+
+        def close():
+            loop.call_soon_threadsafe( loop.stop )
+            thread.join()
+            loop.close()
+        return lambda addrs: list( asyncio.run_coroutine_threadsafe( used( addrs ), loop ).result()), close
+    if callable( used ):
+        return lambda addrs: list( used( addrs )), lambda: None
+    if isinstance( used, ( str, os.PathLike )):
+        with open( used ) as f:
+            used		= set( filter( None, ( line.strip() for line in f )))
+    return lambda addrs: [ addr in used for addr in addrs ], lambda: None
+
+
+def discover(
+    master_secret: Union[str,bytes],
+    cryptopaths: Optional[Sequence[Union[str,Tuple[str,str]]]] = None,  # Default ETH, BTC
+    used: Union[str,os.PathLike,Container[str],Callable[[List[str]],Iterable[bool]]] = None,
+    gap: int			= 20,   # BIP-44 gap limit: stop a chain after this many unused addresses
+    batch: Optional[int]	= None,  # Ask the used predicate about (at most) this many addresses at once
+    gap_accounts: int		= 1,    # Stop a cryptopath after this many accounts w/ no used addresses
+) -> Iterable[Tuple[str,str,str]]:
+    """Discover the used (<crypto>, <path>, <address>) accounts of each cryptopath, w/ BIP-44 account
+    discovery.  Each chain (the paths sharing all but the final path segment, eg. the receive
+    m/44'/60'/0'/0/...) is scanned 'til gap consecutive unused addresses.  Every chain of an account
+    (the paths sharing all but the final two segments, eg. m/44'/60'/0'/...) is scanned, and the
+    cryptopath stops after gap_accounts consecutive accounts w/ no used addresses on any chain.
+
+    The paths (eg. "m/44'/60'/0'/0/-" or, to scan accounts and their receive and change chains,
+    "m/44'/60'/-'/-1/-19") are generated lazily, and addresses derived only as far as necessary: a
+    batch never extends beyond where the chain would terminate if none of its addresses were used.
+
+    """
+    assert used is not None, \
+        "A used predicate, set or file of addresses is required"
+    predicate,close		= used_predicate( used )
+    batch			= batch or gap
+    cache			= DerivationCache()
+    try:
+        for crypto,paths in cryptopaths_parser( cryptopaths ):
+            format		= Account.address_format( crypto )
+            # If the final segment is (the only permitted) unbounded range, there's just 1 chain
+            single		= paths.rstrip( "'" ).endswith( '-' )
+            empty		= 0
+            for acct_prefix,acct_paths in itertools.groupby(
+                path_sequence( *path_parser( paths, allow_unbounded=True )),
+                key	= lambda path: path.rsplit( '/', 2 )[0]
+            ):
+                acct_found	= 0
+                for prefix,chain in itertools.groupby(
+                    acct_paths,
+                    key	= lambda path: path.rsplit( '/', 1 )[0]
+                ):
+                    found = run	= 0
+                    while run < gap:
+                        pths	= list( itertools.islice( chain, min( batch, gap - run )))
+                        if not pths:
+                            break
+                        addrs	= [ account( master_secret, crypto, path, format, cache=cache ).address for path in pths ]
+                        hits	= predicate( addrs )
+                        if len( hits ) != len( addrs ):
+                            raise ValueError( f"Used predicate returned {len( hits )} results for {len( addrs )} addresses" )
+                        for path,addr,hit in zip( pths, addrs, hits ):
+                            if hit:
+                                found  += 1
+                                run	= 0
+                                yield (crypto, path, addr)
+                            else:
+                                run    += 1
+                    log.info( f"{crypto:5} {prefix}/...: {found} used addresses" )
+                    acct_found	       += found
+                    if single:
+                        break
+                empty		= 0 if acct_found else empty + 1
+                if single or empty >= gap_accounts:
+                    break
+    finally:
+        cache.clear()
+        close()
+
+
+def path_indices( path: Optional[str] ) -> List[int]:
+    """Convert a full derivation path to its BIP-32 indices (w/ the 2^31 hardened bit).
+
+    >>> path_indices( "m/44'/60'/0'/0/1" )
+    [2147483692, 2147483708, 2147483648, 0, 1]
+    >>> path_indices( None ), path_indices( "m/" )
+    ([], [])
+    """
+    if not path or path in ( "m", "m/" ):
+        return []
+    return [
+        int( seg[:-1] ) + 2**31 if seg.endswith( "'" ) else int( seg )
+        for seg in path.lstrip( "m/" ).split( "/" )
+    ]
+
+
+def path_format( indices: Sequence[int] ) -> Optional[str]:
+    """Convert BIP-32 indices back into a derivation path (None for the root, like Account.path).
+
+    >>> path_format( [2147483692, 2147483708, 2147483648, 0, 1] )
+    "m/44'/60'/0'/0/1"
+    """
+    if not indices:
+        return None
+    return "m/" + "/".join(
+        f"{i - 2**31}'" if i >= 2**31 else f"{i}"
+        for i in indices
+    )
+
+
+class AccountTable:
+    """A compact, columnar table of groups of accounts, eg. as produced by accountgroups or
+    addressgroups.  Instead of full Account objects (each w/ an hdwallet.HDWallet, its keys, chain
+    codes, etc.), each account stores only its crypto id, its packed BIP-32 path indices and its
+    decoded address bytes (eg. the 20-byte Ethereum address; see address_codec), in flat arrays.
+
+    Indexing the table yields a group of full Accounts, (re-)derived on demand from the
+    master_secret, so it may be used in place of a list( accountgroups( ... )).  Use .addressgroup
+    or .addressgroups to access just the (<crypto>, <path>, <address>) records, w/ no derivation.
+
+    """
+    __slots__			= (
+        'master_secret', 'cryptos', 'codecs', 'width',
+        'crypto_ids', 'path_ends', 'path_indices', 'address_ends', 'address_bytes',
+    )
+
+    def __init__( self, master_secret: Union[str,bytes] = None ):
+        self.master_secret	= master_secret
+        self.cryptos		= []		# The (crypto, format) of each crypto id
+        self.codecs		= []		# The address (decode, encode) of each crypto id
+        self.width		= None		# Accounts per group
+        self.crypto_ids		= array( 'B' )
+        self.path_ends		= array( 'Q' )  # End offset of each account's path indices
+        self.path_indices	= array( 'I' )
+        self.address_ends	= array( 'Q' )  # End offset of each account's address bytes
+        self.address_bytes	= bytearray()
+
+    @classmethod
+    def from_addressgroups(
+        cls,
+        master_secret: Union[str,bytes],
+        cryptopaths: Optional[Sequence[Union[str,Tuple[str,str]]]] = None,  # Default ETH, BTC
+        allow_unbounded: bool	= False,
+        **kwds					 # eg. workers=N
+    ) -> "AccountTable":
+        table			= cls( master_secret )
+        for group in addressgroups(
+            master_secret	= master_secret,
+            cryptopaths		= cryptopaths,
+            allow_unbounded	= allow_unbounded,
+            **kwds
+        ):
+            table.append( group )
+        return table
+
+    def append( self, group: Sequence[Union[Account,Tuple[str,str,str]]] ):
+        """Append a group of Accounts, or of (<crypto>, <path>, <address>) records."""
+        if self.width is None:
+            self.width		= len( group )
+        if len( group ) != self.width:
+            raise ValueError( f"Account group of {len( group )} accounts; {self.width} required" )
+        for acct in group:
+            if isinstance( acct, Account ):
+                crypto,format,path,address = acct.crypto, acct.format, acct.path, acct.address
+            else:
+                (crypto,path,address),format = acct, Account.address_format( acct[0] )
+            try:
+                crypto_id	= self.cryptos.index( (crypto,format) )
+            except ValueError:
+                crypto_id	= len( self.cryptos )
+                self.cryptos.append( (crypto,format) )
+                self.codecs.append( address_codec( crypto, format ))
+            self.crypto_ids.append( crypto_id )
+            self.path_indices.extend( path_indices( path ))
+            self.path_ends.append( len( self.path_indices ))
+            self.address_bytes += self.codecs[crypto_id][0]( address )
+            self.address_ends.append( len( self.address_bytes ))
+
+    def __len__( self ):
+        return len( self.crypto_ids ) // self.width if self.width else 0
+
+    def entries( self, row: int ) -> range:
+        """The entries of the group at row (negative rows index from the end)"""
+        if row < 0:
+            row		       += len( self )
+        if not 0 <= row < len( self ):
+            raise IndexError( "AccountTable index out of range" )
+        return range( row * self.width, ( row + 1 ) * self.width )
+
+    def entry( self, e: int ) -> Tuple[str,str,Optional[str],str]:
+        """Return the (<crypto>, <format>, <path>, <address>) of the entry."""
+        crypto,format		= self.cryptos[self.crypto_ids[e]]
+        path			= path_format( self.path_indices[self.path_ends[e-1] if e else 0:self.path_ends[e]] )
+        address			= self.codecs[self.crypto_ids[e]][1](
+            bytes( self.address_bytes[self.address_ends[e-1] if e else 0:self.address_ends[e]] ))
+        return crypto,format,path,address
+
+    def addressgroup( self, row: int ) -> Tuple[Tuple[str,Optional[str],str], ...]:
+        """Return the group's (<crypto>, <path>, <address>) records, w/o deriving any Accounts."""
+        return tuple(
+            (crypto,path,address)
+            for crypto,_,path,address in map( self.entry, self.entries( row ))
+        )
+
+    def addressgroups( self ):
+        for row in range( len( self )):
+            yield self.addressgroup( row )
+
+    def accountgroup( self, row: int ) -> Tuple[Account, ...]:
+        """Derive the group's full Accounts from the master_secret."""
+        if self.master_secret is None:
+            raise ValueError( "No master_secret available to derive Accounts" )
+        with DerivationCache() as cache:
+            return tuple(
+                account( self.master_secret, crypto=crypto, path=path or "m/", format=format, cache=cache )
+                for crypto,format,path,_ in map( self.entry, self.entries( row ))
+            )
+
+    def __getitem__( self, row: Union[int,slice] ):
+        if isinstance( row, slice ):
+            return [ self.accountgroup( r ) for r in range( *row.indices( len( self ))) ]
+        return self.accountgroup( row )
+
+    def __iter__( self ):
+        for row in range( len( self )):
+            yield self.accountgroup( row )
+
+
+#
+# Public-key only (non-hardened BIP-32 CKDpub) derivation of address ranges from an xpubkey, eg. for
+# watch-only address indexers that never hold private keys.  Each node is a compact (x, y,
+# chain_code) tuple, with the public key as an affine secp256k1 point of integers.  Each child's
+# il*G uses a precomputed table of multiples of G, so costs only ~32 point additions (no doublings)
+# instead of a full scalar multiplication.  Batches of sibling children (eg. the innermost range of a
+# path_sequence) are normalized to affine together, sharing a single modular inversion.
+#
+SECP256K1_P			= 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+SECP256K1_N			= 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+SECP256K1_G			= (
+    0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+    0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
+)
+
+
+def point_double( X1, Y1, Z1 ):
+    """Double the Jacobian secp256k1 point (X1, Y1, Z1); None is the point at infinity."""
+    P				= SECP256K1_P
+    if not Y1:
+        return None
+    A				= X1 * X1 % P
+    B				= Y1 * Y1 % P
+    C				= B * B % P
+    D				= 2 * ( ( X1 + B ) ** 2 - A - C ) % P
+    E				= 3 * A % P
+    X3				= ( E * E - 2 * D ) % P
+    return X3, ( E * ( D - X3 ) - 8 * C ) % P, 2 * Y1 * Z1 % P
+
+
+def point_add( J, x2, y2 ):
+    """Add the affine point (x2, y2) to the Jacobian secp256k1 point J (None is the point at
+    infinity), returning the Jacobian result.
+
+    """
+    if J is None:
+        return x2, y2, 1
+    P				= SECP256K1_P
+    X1,Y1,Z1			= J
+    Z1Z1			= Z1 * Z1 % P
+    H				= ( x2 * Z1Z1 - X1 ) % P
+    r				= 2 * ( y2 * Z1 * Z1Z1 - Y1 ) % P
+    if not H:
+        return point_double( *J ) if not r else None
+    HH				= H * H % P
+    HH4				= 4 * HH % P
+    HI				= H * HH4 % P
+    V				= X1 * HH4 % P
+    X3				= ( r * r - HI - 2 * V ) % P
+    return X3, ( r * ( V - X3 ) - 2 * Y1 * HI ) % P, ( ( Z1 + H ) ** 2 - Z1Z1 - HH ) % P
+
+
+def point_affine( J ):
+    """Normalize the Jacobian secp256k1 point J to affine (x, y), or None if at infinity."""
+    if J is None or not J[2]:
+        return None
+    P				= SECP256K1_P
+    X,Y,Z			= J
+    z				= pow( Z, -1, P )
+    zz				= z * z % P
+    return X * zz % P, Y * zz * z % P
+
+
+def points_affine( Js ):
+    """Normalize a sequence of Jacobian secp256k1 points to a list of affine (x, y) (or None, if at
+    infinity), using Montgomery's simultaneous inversion trick: a single modular inversion (instead
+    of one per point), plus 3 multiplications per point.
+
+    """
+    P				= SECP256K1_P
+    products			= []		# products[i] == Z_0 * ... * Z_i (omitting any infinities)
+    product			= 1
+    for J in Js:
+        if J is not None and J[2]:
+            product		= product * J[2] % P
+        products.append( product )
+    inverse			= pow( product, -1, P )  # == 1 / ( Z_0 * ... * Z_i ), working down from last i
+    affine			= [ None ] * len( products )
+    for i in reversed( range( len( products ))):
+        J			= Js[i]
+        if J is None or not J[2]:
+            continue
+        z			= inverse * ( products[i-1] if i else 1 ) % P
+        inverse			= inverse * J[2] % P
+        zz			= z * z % P
+        affine[i]		= J[0] * zz % P, J[1] * zz * z % P
+    return affine
+
+
+def point_multiply_g_table():
+    """The table of 32 x 255 affine multiples of G for each 8-bit window, computed on first use.  It
+    is built (under a lock) in a local list, and only then published, so concurrent callers never
+    see a partial table.
+
+    """
+    table			= point_multiply_g.table
+    if table is None:
+        with point_multiply_g.lock:
+            table		= point_multiply_g.table
+            if table is None:
+                table		= []
+                base		= SECP256K1_G		# 2^(8*w) * G
+                for w in range( 32 ):
+                    row		= [ point_add( None, *base ) ]
+                    for _ in range( 254 ):
+                        row.append( point_add( row[-1], *base ))
+                    table.append( points_affine( row ))
+                    J		= point_add( None, *base )
+                    for _ in range( 8 ):
+                        J	= point_double( *J )
+                    base	= point_affine( J )
+                point_multiply_g.table = table
+    return table
+
+
+def point_multiply_g( k ):
+    """Return Jacobian k*G, by adding precomputed multiples of G for each 8-bit window of k."""
+    J				= None
+    for row in point_multiply_g_table():
+        if k & 0xFF:
+            J			= point_add( J, *row[( k & 0xFF ) - 1] )
+        k		      >>= 8
+    return J
+point_multiply_g.table		= None  # noqa: E305
+point_multiply_g.lock		= threading.Lock()
+
+
+def version_bytes( version: int ) -> bytes:
+    """The address version prefix bytes, in its minimal even-length hex; eg. 0 is 00, 0x1e is 1e."""
+    prefix			= f"{version:x}"
+    return bytes.fromhex( '0' * ( len( prefix ) % 2 ) + prefix )
+
+
+def point_sec( x, y ):
+    """The 33-byte compressed SEC encoding of the affine point (x, y)"""
+    return bytes( ( 3 if y & 1 else 2, )) + x.to_bytes( 32, 'big' )
+
+
+def xpubkey_node( xpubkey: str ) -> Tuple[int,int,bytes]:
+    """Decode an {x,y,z}pub... into a compact (x, y, chain_code) public derivation node."""
+    raw				= base58.b58decode_check( xpubkey )
+    if len( raw ) != 78 or raw[45] not in ( 2, 3 ):
+        raise ValueError( f"Only x/y/z + pub public keys supported; {xpubkey[:8]+'...'!r} supplied" )
+    P				= SECP256K1_P
+    x				= int.from_bytes( raw[46:78], 'big' )
+    y				= pow( ( pow( x, 3, P ) + 7 ) % P, ( P + 1 ) // 4, P )
+    if ( y * y - pow( x, 3, P ) - 7 ) % P:
+        raise ValueError( f"Invalid public key in {xpubkey[:8]+'...'!r}" )
+    if y & 1 != raw[45] & 1:
+        y			= P - y
+    return x, y, raw[13:45]
+
+
+def xpubkey_children( node: Tuple[int,int,bytes], indices: Sequence[int] ) -> List[Optional[Tuple[int,int,bytes]]]:
+    """BIP-32 CKDpub: derive the non-hardened child nodes at each index, or None if invalid (in which
+    case BIP-32 recommends proceeding with the next index).  The batch of child points is normalized
+    to affine with a single shared modular inversion.
+
+    """
+    x,y,chain_code		= node
+    sec				= point_sec( x, y )
+    points,chain_codes		= [],[]
+    for index in indices:
+        if not 0 <= index < 2**31:
+            raise ValueError( f"Hardened derivation index {index} is impossible from a public key" )
+        i			= hmac.digest( chain_code, sec + index.to_bytes( 4, 'big' ), 'sha512' )
+        il			= int.from_bytes( i[:32], 'big' )
+        points.append( point_add( point_multiply_g( il ), x, y ) if il < SECP256K1_N else None )
+        chain_codes.append( i[32:] )
+    return [
+        child + ( child_chain_code, ) if child else None
+        for child,child_chain_code in zip( points_affine( points ), chain_codes )
+    ]
+
+
+def xpubkey_child( node: Tuple[int,int,bytes], index: int ) -> Optional[Tuple[int,int,bytes]]:
+    """BIP-32 CKDpub: derive the non-hardened child node at index, or None if invalid."""
+    return xpubkey_children( node, [index] )[0]
+
+
+def hash160( data ):
+    return ripemd160( hashlib.sha256( data ).digest() )
+
+
+def address_encoder(
+    crypto: str			= None,  # default 'ETH'
+    format: str			= None,  # default: the crypto's address_format
+) -> Callable[[int, int], str]:
+    """Return a function producing the crypto's address in the given format for an affine public key
+    point (x, y), equivalent to the corresponding Account.address.
+
+    """
+    descriptor			= Account.descriptor( crypto or 'ETH', format )
+    cryptocurrency,symbol	= descriptor.cryptocurrency, descriptor.symbol
+    if descriptor.format == "legacy" and symbol == "ETH":
+        def encoder( x, y ):
+            keccak_256		= keccak.new( digest_bits=256 )
+            keccak_256.update( x.to_bytes( 32, 'big' ) + y.to_bytes( 32, 'big' ))
+            return checksum_encode( keccak_256.hexdigest()[24:], crypto="eth" )
+    elif descriptor.format == "legacy":
+        prefix			= version_bytes( cryptocurrency.PUBLIC_KEY_ADDRESS )
+        alphabet		= base58.RIPPLE_ALPHABET if symbol == "XRP" else base58.BITCOIN_ALPHABET
+
+        def encoder( x, y ):
+            return base58.b58encode_check( prefix + hash160( point_sec( x, y )), alphabet ).decode( 'ascii' )
+    elif descriptor.format == "segwit":
+        prefix			= version_bytes( cryptocurrency.SCRIPT_ADDRESS )
+
+        def encoder( x, y ):
+            script		= b'\x76\xa9\x14' + hash160( point_sec( x, y )) + b'\x88\xac'
+            return base58.b58encode_check( prefix + hash160( script )).decode( 'ascii' )
+    elif descriptor.format == "bech32":
+        hrp			= cryptocurrency.SEGWIT_ADDRESS.HRP
+
+        def encoder( x, y ):
+            if hrp is None:
+                return None
+            return bech32_encode( hrp, [0] + convertbits( hash160( point_sec( x, y )), 8, 5 ))
+    else:
+        raise ValueError( f"Unknown addresses semantic: {descriptor.format}" )
+    return encoder
+
+
+def address_codec(
+    crypto: str			= None,  # default 'ETH'
+    format: str			= None,  # default: the crypto's address_format
+) -> Tuple[Callable[[str], bytes], Callable[[bytes], str]]:
+    """Return functions to decode the crypto's addresses in the given format into their compact binary
+    payload (eg. the 20-byte Ethereum address, or the version and hash160 of a base58check address),
+    and to encode the payload back into the identical address.
+
+    >>> decode,encode = address_codec( 'ETH' )
+    >>> decode( '0x336cBeAB83aCCdb2541e43D514B62DC6C53675f4' ).hex()
+    '336cbeab83accdb2541e43d514b62dc6c53675f4'
+    >>> encode( decode( '0x336cBeAB83aCCdb2541e43D514B62DC6C53675f4' ))
+    '0x336cBeAB83aCCdb2541e43D514B62DC6C53675f4'
+    """
+    descriptor			= Account.descriptor( crypto or 'ETH', format )
+    cryptocurrency,symbol	= descriptor.cryptocurrency, descriptor.symbol
+    if descriptor.format == "legacy" and symbol == "ETH":
+        def decode( address ):
+            return bytes.fromhex( address[2:] )
+
+        def encode( payload ):
+            return checksum_encode( payload.hex(), crypto="eth" )
+    elif descriptor.format in ( "legacy", "segwit" ):
+        alphabet		= base58.RIPPLE_ALPHABET if symbol == "XRP" else base58.BITCOIN_ALPHABET
+
+        def decode( address ):
+            return base58.b58decode_check( address, alphabet )
+
+        def encode( payload ):
+            return base58.b58encode_check( payload, alphabet ).decode( 'ascii' )
+    elif descriptor.format == "bech32":
+        hrp			= cryptocurrency.SEGWIT_ADDRESS.HRP
+
+        def decode( address ):
+            _,data		= bech32_decode( address )
+            if not data:
+                raise ValueError( f"Invalid {descriptor.crypto} bech32 address: {address!r}" )
+            return bytes( data[:1] + convertbits( data[1:], 5, 8, False ))
+
+        def encode( payload ):
+            return bech32_encode( hrp, list( payload[:1] ) + convertbits( payload[1:], 8, 5 ))
+    else:
+        raise ValueError( f"Unknown addresses semantic: {descriptor.format}" )
+    return decode, encode
+
+
+def xpubaddresses(
+    xpubkey: str,
+    crypto: str			= None,  # default 'ETH'
+    paths: str			= None,  # default "m/0/0"; non-hardened, relative to the xpubkey; supports ranges
+    format: str			= None,  # default: deduced from the x/y/z + pub prefix
+    allow_unbounded: bool	= True,
+    batch: int			= 64,    # Derive up to this many sibling addresses at once
+):
+    """Generate a sequence of (<path>, <address>) from an {x,y,z}pub... public key, for each of the
+    (relative, non-hardened) paths, eg. "m/0/-".  Equivalent to the addresses of Accounts produced by
+    Account.from_xpubkey, but without any python-hdwallet instances.  The parent node of each run of
+    sibling paths is derived once, and the siblings derived in batches.
+
+    Any (exceedingly unlikely) invalid child is skipped, as recommended by BIP-32.
+
+    """
+    if format is None:
+        format			= dict(
+            xpub	= 'legacy',
+            ypub	= 'segwit',
+            zpub	= 'bech32',
+        ).get( xpubkey[:4] )
+    encoder			= address_encoder( crypto, format )
+    root			= xpubkey_node( xpubkey )
+    for prefix,siblings in itertools.groupby( path_sequence( *path_parser(
+        paths		= paths or "m/0/0",
+        allow_unbounded	= allow_unbounded,
+    )), key=lambda path: path.rsplit( '/', 1 )[0] ):
+        if not ( prefix == "m" or prefix.startswith( "m/" )) or "'" in prefix:
+            raise ValueError( f"Only non-hardened paths relative to the xpubkey may be derived, not {prefix!r}/..." )
+        parent			= root
+        for seg in prefix[2:].split( '/' ) if prefix != "m" else []:
+            parent		= parent and xpubkey_child( parent, int( seg ))
+        for chunk in iter( lambda: list( itertools.islice( siblings, batch )), [] ):
+            if parent is None:
+                children	= [ None ] * len( chunk )
+            else:
+                children	= xpubkey_children( parent, [ int( path.rsplit( '/', 1 )[1] ) for path in chunk ] )
+            for path,child in zip( chunk, children ):
+                if child is None:
+                    log.warning( f"Skipping invalid BIP-32 derivation path {path}" )
+                    continue
+                yield path, encoder( *child[:2] )
@@ -1,4 +1,6 @@
 # -*- mode: python ; coding: utf-8 -*-
+import asyncio
+import itertools
 import json
 import pytest
 
@@ -15,7 +17,13 @@ except ImportError:
 
 import shamir_mnemonic
 
+from concurrent.futures	import ThreadPoolExecutor
+
 from .			import account, create, addresses, addressgroups, accountgroups, Account
+from .api		import (
+    AccountTable, xpubaddresses, point_multiply_g, point_affine, points_affine, discover, path_parser, path_sequence,
+    DerivationCache, DerivationPath, HDWalletState, path_edit, path_hardened, encryption_costs,
+)
 from .recovery		import recover
 
 from .dependency_test	import substitute, nonrandom_bytes, SEED_XMAS, SEED_ONES
@@ -224,6 +232,44 @@ def test_create():
     assert recover( details.groups['fren'][1][:3] ) == SEED_XMAS
 
 
+def test_create_lazy():
+    """Only the first group of accounts is derived by create; the remainder on demand."""
+    details			= create(
+        "SLIP39 Wallet: Lazy",
+        1,
+        dict( fren = (3,5) ),
+        SEED_ONES,
+        cryptopaths	= [ ('ETH', ".../-99"), ('BTC', ".../-99") ],
+        lazy		= True,
+    )
+    assert details.accounts.produce( 1 ) == 1
+    (eth,btc),			= details.accounts[:1]
+    assert eth.address == "0x824b174803e688dE39aF5B3D7Cd39bE6515A19a1"
+    assert details.accounts[3][1].address == "bc1qxwekjd46aa5n0s3dtsynvtsjwsne7c5f5w5dsd"
+    assert details.accounts.produce( 1 ) == 4
+
+    # Once every group has been derived, the sequence no longer refers to the Seed (via accountgroups)
+    assert len( details.accounts ) == 100 and details.accounts.iterator is None
+
+    # By default, every group of accounts is derived eagerly
+    details			= create(
+        "SLIP39 Wallet: Eager", 1, dict( fren = (3,5) ), SEED_ONES,
+        cryptopaths	= [ ('ETH', ".../-2"), ('BTC', ".../-2") ],
+    )
+    assert isinstance( details.accounts, list ) and len( details.accounts ) == 3
+
+    with pytest.raises( ValueError ):
+        create( "SLIP39 Wallet: Bad", 1, dict( fren = (3,5) ), SEED_ONES, cryptopaths=[ 'ETH', 'NOPE' ] )
+
+
+def test_encryption_costs():
+    costs			= encryption_costs( range( 4 ))
+    assert list( costs ) == [0, 1, 2, 3]
+    assert 0 < costs[0] < 10
+    assert costs[3] == costs[0] * 8
+    assert encryption_costs( [1] )[1] == costs[1]  # calibrated once
+
+
 @substitute( shamir_mnemonic.shamir, 'RANDOM_BYTES', nonrandom_bytes )
 def test_create_bip39():
     """Standard SLIP-39 Mnemonic from BIP-39 backup and account creation.
@@ -379,6 +425,22 @@ def test_addressgroups():
     ]
 
 
+def test_addressgroups_workers():
+    """Parallel derivation yields identical address groups, in order, incl. from unbounded ranges."""
+    cryptopaths			= [
+        ('ETH',	".../-9"),
+        ('BTC',	"m/84'/0'/0'/0/-9"),
+        ('XRP',	".../-1/-4"),
+    ]
+    serial			= list( addressgroups( SEED_ONES, cryptopaths=cryptopaths ))
+    assert len( serial ) == 10
+    assert list( addressgroups( SEED_ONES, cryptopaths=cryptopaths, workers=2, chunksize=3 )) == serial
+
+    unbounded			= addressgroups( SEED_ONES, cryptopaths=[('ETH', ".../-")], workers=2, chunksize=4 )
+    assert [ grp for _,grp in zip( range( 10 ), unbounded ) ] == [ (eth,) for eth,_,_ in serial ]
+    unbounded.close()
+
+
 def test_accountgroups():
     master_secret		= b'\xFF' * 16
     acctgrps			= list( accountgroups(
@@ -390,3 +452,272 @@ def test_accountgroups():
     ))
     # print( json.dumps( acctgrps, default=repr ))
     assert len(acctgrps) == 4
+
+
+def test_account_derivation_cache():
+    """Sibling accounts resume from the cached parent node, and yield identical results."""
+    with DerivationCache() as cache:
+        acct			= account( SEED_XMAS, path="m/44'/60'/0'/0/1", cache=cache )
+        assert acct.address == '0x3b774e485fC818F0f377FBA657dfbF92B46f8504'
+        # The seeded state, and each parent node m, m/44', ..., m/44'/60'/0'/0 is retained
+        cached			= [ key[2] for key in cache if key[0] == acct.fingerprint ]
+        assert DerivationPath( "m/44'/60'/0'/0" ) in cached and DerivationPath( "m/44'/60'/0'/0/1" ) not in cached
+        assert len( cached ) == 1 + 5
+
+        acct			= account( SEED_XMAS, path="m/44'/60'/0'/0/1", cache=cache )
+        assert acct.address == '0x3b774e485fC818F0f377FBA657dfbF92B46f8504'
+        assert acct.key == 'bf299fe7a7d948fdb98474557bbee73395e01f3a6a73638d45d345f9adb451fb'
+        assert acct.xpubkey == 'xpub6FVwqKQUrDre2ZPtAvcqR7GYW4662JTM7R1FGuwGAH3b1TjntLCbMa3HY7C1BR4ifXEtwfX63a69FEAcCSCgrgQZNd3WYgvKhAghRNucEc6'
+        acct.from_path( "m/" )
+        assert acct.path is None
+        acct.from_path( "m/44'/60'/0'/0/0" )
+        assert acct.address == '0x336cBeAB83aCCdb2541e43D514B62DC6C53675f4'
+        # A compiled DerivationPath resumes from the same cached parent nodes
+        acct.from_path( DerivationPath( "m/44'/60'/0'/0/1" ))
+        assert acct.path == "m/44'/60'/0'/0/1"
+        assert acct.address == '0x3b774e485fC818F0f377FBA657dfbF92B46f8504'
+    # The (private key) states are discarded on exit
+    assert len( cache ) == 0
+
+    # W/o a cache, nothing is retained; results unchanged
+    acct			= account( SEED_XMAS, path="m/44'/60'/0'/0/1" )
+    assert acct.fingerprint is None and acct.address == '0x3b774e485fC818F0f377FBA657dfbF92B46f8504'
+
+    # Bounded, LRU eviction; results unchanged
+    expected			= list( addresses( SEED_XMAS, paths="m/44'/60'/0'/0/-2" ))
+    with DerivationCache( size=3 ) as cache:
+        assert [
+            (acct.crypto, acct.path, acct.address)
+            for acct in ( account( SEED_XMAS, path=f"m/44'/60'/0'/0/{i}", cache=cache ) for i in range( 3 ))
+        ] == expected
+        assert len( cache ) == 3
+        assert list( cache )[-1][2] == DerivationPath( "m/44'/60'/0'/0" )
+
+
+def test_account_derivation_unsupported( monkeypatch, caplog ):
+    """W/ an unsupported python-hdwallet, nothing is cached or adopted, and results are unchanged."""
+    cryptopaths			= [ ('ETH', ".../-2"), ('BNB', ".../-2"), ('BTC', ".../-2") ]
+    expected			= list( addressgroups( SEED_XMAS, cryptopaths=cryptopaths ))
+    monkeypatch.setattr( HDWalletState, 'VERSIONS', () )
+    monkeypatch.setattr( HDWalletState, 'SUPPORTED', {} )
+    with DerivationCache() as cache:
+        acct			= account( SEED_XMAS, path="m/44'/60'/0'/0/1", cache=cache )
+        assert acct.cache is None and len( cache ) == 0
+        assert acct.address == '0x3b774e485fC818F0f377FBA657dfbF92B46f8504'
+    assert "state unsupported" in caplog.text
+    assert list( addressgroups( SEED_XMAS, cryptopaths=cryptopaths )) == expected
+    with pytest.raises( ValueError ):
+        Account( 'BNB' ).from_account( acct )
+
+
+def test_xpubaddresses():
+    """Public-only derivation from an xpubkey yields the same addresses as the full derivation."""
+    xpubkey			= account( SEED_ONES, path="m/44'/60'/0'" ).xpubkey
+    assert list( xpubaddresses( xpubkey, paths="m/0/-3" )) == [
+        ("m/0/0", "0x824b174803e688dE39aF5B3D7Cd39bE6515A19a1"),
+        ("m/0/1", "0x8D342083549C635C0494d3c77567860ee7456963"),
+        ("m/0/2", "0x52787E24965E1aBd691df77827A3CfA90f0166AA"),
+        ("m/0/3", "0xc2442382Ae70c77d6B6840EC6637dB2422E1D44e"),
+    ]
+    for crypto,format,hardened in (
+        ('BTC',	'bech32',	"m/84'/0'/0'"),
+        ('BTC',	'segwit',	"m/49'/0'/0'"),
+        ('DOGE', 'legacy',	"m/44'/3'/0'"),
+        ('CRO',	'bech32',	"m/84'/60'/0'"),
+        ('XRP',	'legacy',	"m/44'/144'/0'"),
+    ):
+        xpubkey			= account( SEED_ONES, crypto='BTC', path=hardened, format=format ).xpubkey
+        assert list( xpubaddresses( xpubkey, crypto=crypto, paths="m/0-1/-2", format=format )) == [
+            (path.replace( hardened, 'm' ), addr)
+            for _,path,addr in addresses( SEED_ONES, crypto=crypto, paths=hardened+"/0-1/-2", format=format )
+        ]
+
+    with pytest.raises( ValueError ):
+        next( xpubaddresses( xpubkey, paths="m/0'/0" ))
+    assert list( xpubaddresses( xpubkey, paths="m/0/-9", batch=4 )) == list( xpubaddresses( xpubkey, paths="m/0/-9" ))
+
+
+def test_points_affine():
+    """Montgomery simultaneous inversion normalizes a batch of Jacobian points, incl. infinities."""
+    points			= [ point_multiply_g( k ) for k in ( 1, 2, 3, 2**255 + 12345 ) ]
+    points.insert( 2, None )
+    assert points_affine( points ) == [ point_affine( J ) for J in points ]
+    assert points_affine( points )[0] == (
+        0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+        0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
+    )
+    assert points_affine( [] ) == []
+
+    # Concurrent first use of the precomputed G table sees only the complete table
+    point_multiply_g.table	= None
+    with ThreadPoolExecutor( max_workers=4 ) as executor:
+        assert list( executor.map( point_multiply_g, [ 2**255 + 12345 ] * 8 )) == [ points[-1] ] * 8
+
+
+def test_accounttable():
+    """A compact AccountTable stores just the address groups, deriving full Accounts on demand."""
+    cryptopaths			= [
+        ('ETH',	".../-3"),
+        ('BTC',	".../-3"),
+    ]
+    table			= AccountTable.from_addressgroups( SEED_ONES, cryptopaths=cryptopaths )
+    assert len( table ) == 4
+    assert list( table.addressgroups() ) == list( addressgroups( SEED_ONES, cryptopaths=cryptopaths ))
+    assert table.addressgroup( -1 ) == (
+        ("ETH", "m/44'/60'/0'/0/3", "0xc2442382Ae70c77d6B6840EC6637dB2422E1D44e"),
+        ("BTC", "m/84'/0'/0'/0/3",  "bc1qxwekjd46aa5n0s3dtsynvtsjwsne7c5f5w5dsd"),
+    )
+    eth,btc			= table[1]
+    assert isinstance( eth, Account ) and eth.path == "m/44'/60'/0'/0/1" and eth.key
+    assert btc.address == "bc1qnec684yvuhfrmy3q856gydllsc54p2tx9w955c"
+    assert [ [ a.address for a in grp ] for grp in table[2:] ] == [
+        [ a.address for a in grp ] for grp in list( accountgroups( SEED_ONES, cryptopaths=cryptopaths ))[2:]
+    ]
+    with pytest.raises( IndexError ):
+        table[4]
+
+    # Accounts may be appended directly
+    direct			= AccountTable()
+    for group in accountgroups( SEED_ONES, cryptopaths=cryptopaths ):
+        direct.append( group )
+    assert list( direct.addressgroups() ) == list( table.addressgroups() )
+
+    # Addresses are stored decoded: a 20-byte Ethereum address, and a 1+20 byte bech32 witness program
+    assert table.path_indices.typecode == 'I'
+    assert list( table.address_ends[:2] ) == [ 20, 41 ]
+
+
+def test_discover( tmp_path ):
+    def address( path ):
+        return account( SEED_XMAS, 'ETH', path ).address
+
+    used			= { address( f"m/44'/60'/0'/0/{i}" ) for i in ( 0, 3, 25 ) }
+    queried			= []
+
+    def predicate( addrs ):
+        queried.extend( addrs )
+        return ( a in used for a in addrs )
+
+    # Derives (and asks about) only up to the gap limit after the last used address
+    assert [ p for _,p,_ in discover( SEED_XMAS, [ "ETH:m/44'/60'/0'/0/-" ], used=predicate, gap=5, batch=2 ) ] \
+        == [ "m/44'/60'/0'/0/0", "m/44'/60'/0'/0/3" ]
+    assert len( queried ) == 9
+    assert [ p for _,p,_ in discover( SEED_XMAS, [ "ETH:m/44'/60'/0'/0/-" ], used=used, gap=25 ) ] \
+        == [ "m/44'/60'/0'/0/0", "m/44'/60'/0'/0/3", "m/44'/60'/0'/0/25" ]
+
+    # A predicate must return a result for each address
+    with pytest.raises( ValueError ):
+        list( discover( SEED_XMAS, [ "ETH:m/44'/60'/0'/0/-" ], used=lambda addrs: [ False ], gap=5 ))
+
+    # Accounts, w/ receive and change chains; an async predicate, and a file of used addresses.  Each
+    # account's chains are all scanned, and discovery stops at the first account w/ no used addresses.
+    used			= { address( p ) for p in ( "m/44'/60'/0'/0/2", "m/44'/60'/1'/1/0", "m/44'/60'/3'/0/0" ) }
+
+    async def used_async( addrs ):
+        await asyncio.sleep( 0 )
+        return [ a in used for a in addrs ]
+
+    assert [ p for _,p,_ in discover( SEED_XMAS, [ "ETH:m/44'/60'/-'/-1/-9" ], used=used_async, gap=3 ) ] \
+        == [ "m/44'/60'/0'/0/2", "m/44'/60'/1'/1/0" ]
+    name			= tmp_path / 'used.txt'
+    name.write_text( '\n'.join( used ) + '\n' )
+    assert [ p for _,p,_ in discover( SEED_XMAS, [ "ETH:m/44'/60'/-'/-1/-9" ], used=name, gap=3, gap_accounts=2 ) ] \
+        == [ "m/44'/60'/0'/0/2", "m/44'/60'/1'/1/0", "m/44'/60'/3'/0/0" ]
+
+    # An async predicate may be used within a running event loop
+    async def discover_async():
+        return [ p for _,p,_ in discover( SEED_XMAS, [ "ETH:m/44'/60'/-'/-1/-9" ], used=used_async, gap=3 ) ]
+
+    assert asyncio.run( discover_async() ) == [ "m/44'/60'/0'/0/2", "m/44'/60'/1'/1/0" ]
+
+
+def test_account_descriptors():
+    assert Account.supported( 'Ethereum' ) == Account.supported( 'eth' ) == 'ETH'
+    with pytest.raises( ValueError ):
+        Account.supported( 'XYZ' )
+    descriptor			= Account.descriptor( 'bitcoin', 'Legacy' )
+    assert descriptor is Account.CRYPTO_DESCRIPTORS['BTC','legacy']
+    assert descriptor.path == "m/44'/0'/0'/0/0"
+    assert Account.descriptor( 'BNB' ).symbol == 'ETH'
+    with pytest.raises( TypeError ):
+        Account.CRYPTO_DESCRIPTORS['BTC','legacy'] = None
+    with pytest.raises( ValueError ):
+        Account( 'ETH', 'foo' )
+    with pytest.raises( ValueError ):
+        Account.path_default( 'ETH', 'segwit' )
+
+    # Changing the default address format is reflected in new Accounts, and their default paths
+    try:
+        Account.address_format( 'BTC', 'segwit' )
+        assert Account( 'BTC' ).format == 'segwit'
+        assert Account.path_default( 'BTC' ) == "m/44'/0'/0'/0/0"
+    finally:
+        Account.address_format( 'BTC', 'bech32' )
+    assert Account.path_default( 'BTC' ) == "m/84'/0'/0'/0/0"
+
+
+def test_accountgroups_shared_paths():
+    cryptopaths			= [
+        ('ETH', "m/44'/60'/0'/0/-2"),
+        ('BNB', "m/44'/60'/0'/0/-2"),
+        ('CRO', "m/44'/60'/0'/0/-2"),
+        ('BTC', "m/84'/0'/0'/0/-2"),
+    ]
+    for eth,bnb,cro,btc in accountgroups( SEED_XMAS, cryptopaths ):
+        # The keys are derived once, and shared by the cryptos at the identical path
+        assert bnb.hdwallet._key is eth.hdwallet._key
+        assert cro.hdwallet._key is eth.hdwallet._key
+        assert btc.hdwallet._key is not eth.hdwallet._key
+        for acct in ( eth, bnb, cro, btc ):
+            solo		= account( SEED_XMAS, acct.crypto, acct.path )
+            assert ( acct.path, acct.address, acct.pubkey, acct.prvkey ) \
+                == ( solo.path, solo.address, solo.pubkey, solo.prvkey )
+        assert cro.address.startswith( 'crc1' )
+
+
+def test_path_sequence():
+    for paths in ( "m/44'/60'/0'/0/-9", "m/44'/60'/2-4'/-1/3-5", "m/44'/60'/0'/0/0", "../1-3" ):
+        seq			= path_sequence( *path_parser( paths ))
+        paths			= list( seq )
+        assert len( seq ) == len( paths )
+        assert [ seq[i] for i in range( -len( seq ), len( seq )) ] == paths + paths
+        assert list( seq[2:7:2] ) == paths[2:7:2]
+        assert list( seq[::-1] ) == paths[::-1]
+        for k in ( 1, 2, 5, len( paths ) + 3 ):
+            parts		= seq.partition( k )
+            assert len( parts ) == k
+            assert sum( ( list( part ) for part in parts ), [] ) == paths
+    assert list( path_sequence( *path_parser( "m/44'/60'/0'/0/-" ))[5:8] ) \
+        == [ "m/44'/60'/0'/0/5", "m/44'/60'/0'/0/6", "m/44'/60'/0'/0/7" ]
+    seq				= path_sequence( *path_parser( "m/44'/60'/-'/0/-1" ))
+    assert list( itertools.islice( seq, 5 )) \
+        == [ "m/44'/60'/0'/0/0", "m/44'/60'/0'/0/1", "m/44'/60'/1'/0/0", "m/44'/60'/1'/0/1", "m/44'/60'/2'/0/0" ]
+    assert seq[5000001] == "m/44'/60'/2500000'/0/1"
+    assert list( seq[3::2][:3] ) == [ "m/44'/60'/1'/0/1", "m/44'/60'/2'/0/1", "m/44'/60'/3'/0/1" ]
+    shards			= seq.partition( 3 )
+    assert [ s[1] for s in shards ] == [ seq[3], seq[4], seq[5] ]
+    with pytest.raises( TypeError ):
+        len( seq )
+    with pytest.raises( IndexError ):
+        seq[-1]
+
+
+def test_derivation_path():
+    path			= DerivationPath( "m/44'/60'/0'/0/1" )
+    assert path == ( 2**31 + 44, 2**31 + 60, 2**31, 0, 1 )
+    assert str( path ) == "m/44'/60'/0'/0/1"
+    assert path_edit( path, "../1/2" ) == DerivationPath( "m/44'/60'/0'/1/2" )
+    assert path_edit( "m/44'/60'/0'/0/1", path[:3] ) is not None and str( path_edit( "m/", path[:3] )) == "m/44'/60'/0'"
+    with pytest.raises( ValueError ):
+        path_edit( path[:2], "../0/0/0" )
+    assert path_hardened( path ) == ( DerivationPath( "m/44'/60'/0'" ), DerivationPath( "m/0/1" ))
+    assert tuple( map( str, path_hardened( path[:3] ))) == path_hardened( "m/44'/60'/0'" )
+    assert path_parser( path ) == ( "m/44'/60'/0'/0/1", {} )
+    assert list( path_sequence( *path_parser( "m/44'/60'/0'/0/-2" ), compiled=True )) \
+        == [ DerivationPath( f"m/44'/60'/0'/0/{i}" ) for i in range( 3 ) ]
+    # Partial paths can't be compiled
+    assert list( path_sequence( *path_parser( "../0/-1" ), compiled=True )) == [ "../0/0", "../0/1" ]
+    for bad in ( "44'/0'", [ -1 ], [ 2**32 ] ):
+        with pytest.raises( ValueError ):
+            DerivationPath( bad )
+    assert account( SEED_XMAS, 'BTC', path ).address == account( SEED_XMAS, 'BTC', str( path )).address
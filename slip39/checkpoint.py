@@ -0,0 +1,158 @@
+
+#
+# Python-slip39 -- Ethereum SLIP-39 Account Generation and Recovery
+#
+# Copyright (c) 2022, Dominion Research & Development Corp.
+#
+# Python-slip39 is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.  It is also available under alternative (eg. Commercial) licenses, at
+# your option.  See the LICENSE file at the top of the source tree.
+#
+# Python-slip39 is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+
+"""
+Checkpointed, resumable generation of long sequences of account or address groups.
+
+The position (the next address group to produce) is periodically persisted to a small JSON state
+file, along with a digest identifying the job: the master secret's salted, stretched digest (w/ a
+random salt per state file), and the cryptocurrencies, address formats and paths.  The master secret
+itself is never stored.  On restart, the job resumes
+directly at the persisted position, w/o re-generating any prior paths or addresses.
+
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+
+from datetime		import datetime, timezone
+from typing		import Iterable, Optional, Sequence, Tuple, Union
+
+from .api		import Account, accountgroups, addressgroups, cryptopaths_parser
+from .util		import secret_digest
+
+log				= logging.getLogger( __package__ )
+
+CHECKPOINT_INTERVAL		= 10.0		# Seconds between state file updates
+CHECKPOINT_SALT			= 16		# Bytes of random salt for each state file's job digest
+
+
+def job_digest(
+    master_secret: Union[str,bytes],
+    cryptopaths: Sequence[Tuple[str,str]],
+    salt: bytes,
+) -> str:
+    """Identify a job by its master secret (w/o revealing it), and its cryptos' formats and paths."""
+    job				= json.dumps( [
+        secret_digest( master_secret, salt ),
+        [ (crypto, Account.address_format( crypto ), paths) for crypto,paths in cryptopaths ],
+    ] )
+    return hashlib.sha256( job.encode( 'UTF-8' )).hexdigest()
+
+
+def checkpoint_load(
+    state: Union[str,os.PathLike],
+    master_secret: Union[str,bytes],
+    cryptopaths: Sequence[Tuple[str,str]],
+    restart: bool		= False,
+) -> Tuple[int,bytes,str]:
+    """Return the next address group index persisted for the job in state (0, if none), and the
+    state's salt and job digest (new, if none).
+
+    """
+    try:
+        with open( state, 'r' ) as f:
+            saved		= json.load( f )
+    except FileNotFoundError:
+        saved			= None
+    if saved is not None:
+        salt			= bytes.fromhex( saved.get( 'salt', '' ))
+        digest			= job_digest( master_secret, cryptopaths, salt )
+        if hmac.compare_digest( saved.get( 'digest', '' ), digest ):
+            return saved['next'], salt, digest
+        if not restart:
+            raise ValueError( f"Checkpoint {state} is for a different master secret and/or cryptopaths" )
+        log.warning( f"Checkpoint {state} is for a different job; restarting from 0" )
+    salt			= secrets.token_bytes( CHECKPOINT_SALT )
+    return 0, salt, job_digest( master_secret, cryptopaths, salt )
+
+
+def checkpoint_save(
+    state: Union[str,os.PathLike],
+    salt: bytes,
+    digest: str,
+    position: int,
+    complete: bool		= False,
+):
+    """Atomically persist the job's next address group index to state."""
+    temp			= f"{state}.tmp"
+    with open( temp, 'w' ) as f:
+        json.dump( dict(
+            salt	= salt.hex(),
+            digest	= digest,
+            next	= position,
+            complete	= complete,
+            updated	= datetime.now( timezone.utc ).isoformat( timespec='seconds' ),
+        ), f, indent=4 )
+        f.write( '\n' )
+        f.flush()
+        os.fsync( f.fileno() )
+    os.replace( temp, state )
+
+
+def checkpointed(
+    state: Union[str,os.PathLike],		# The job's checkpoint state file
+    master_secret: Union[str,bytes],
+    cryptopaths: Optional[Sequence[Union[str,Tuple[str,str]]]] = None,  # Default ETH, BTC
+    accounts: bool		= False,		# Produce groups of Accounts, instead of address records
+    allow_unbounded: bool	= True,
+    workers: Optional[int]	= None,		# Derive address groups in parallel (not w/ accounts)
+    interval: float		= CHECKPOINT_INTERVAL,
+    restart: bool		= False,		# Ignore (and replace) a checkpoint for a different job
+) -> Iterable[Tuple[int, Sequence]]:
+    """Yield enumerated (<index>, <group>) address (or Account) groups, resuming from (and periodically
+    updating) the checkpoint state file.  A group is deemed complete once the next group is requested,
+    so the last group yielded before an interruption is produced again on resume (at-least-once).
+
+    """
+    cryptopaths			= cryptopaths_parser( cryptopaths )
+    start,salt,digest		= checkpoint_load( state, master_secret, cryptopaths, restart=restart )
+    if start:
+        log.info( f"Resuming from address group {start} of checkpoint {state}" )
+    if accounts:
+        groups			= accountgroups(
+            master_secret	= master_secret,
+            cryptopaths		= cryptopaths,
+            allow_unbounded	= allow_unbounded,
+            start		= start,
+        )
+    else:
+        groups			= addressgroups(
+            master_secret	= master_secret,
+            cryptopaths		= cryptopaths,
+            allow_unbounded	= allow_unbounded,
+            workers		= workers,
+            start		= start,
+        )
+    done,complete		= start,False
+    saved			= time.monotonic()
+    try:
+        for index,group in enumerate( groups, start=start ):
+            yield index,group
+            done		= index + 1
+            if time.monotonic() - saved >= interval:
+                checkpoint_save( state, salt, digest, done )
+                saved		= time.monotonic()
+        complete		= True
+    finally:
+        checkpoint_save( state, salt, digest, done, complete=complete )
+        log.info( f"{'Completed' if complete else 'Checkpointed'} at address group {done} in {state}" )
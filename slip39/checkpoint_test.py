@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from .api		import addressgroups
+from .checkpoint	import checkpointed
+
+
+def test_checkpointed( tmp_path ):
+    master_secret		= b'\xff' * 16
+    cryptopaths			= [
+        ('ETH', "m/44'/60'/0'/0/-"),
+        ('BTC', "m/84'/0'/0'/0/-"),
+    ]
+    expected			= list( zip( range( 12 ), addressgroups( master_secret, cryptopaths )))
+    state			= tmp_path / 'job.json'
+
+    # Interrupted after processing groups 0-4; group 5 was yielded but not completed
+    produced			= []
+    for index,group in checkpointed( state, master_secret, cryptopaths ):
+        if index == 5:
+            break
+        produced.append( (index,group) )
+    saved			= json.loads( state.read_text() )
+    assert saved['next'] == 5 and not saved['complete']
+    assert master_secret.hex() not in state.read_text()
+    assert len( bytes.fromhex( saved['salt'] )) == 16
+
+    # Resumes at group 5, checkpointing as it goes
+    for index,group in checkpointed( state, master_secret, cryptopaths, interval=0 ):
+        produced.append( (index,group) )
+        assert json.loads( state.read_text() )['next'] == index
+        if index == 11:
+            break
+    assert produced == expected
+
+    # A different job (secret or paths) is refused, unless restarted
+    with pytest.raises( ValueError ):
+        next( checkpointed( state, b'\x00' * 16, cryptopaths ))
+    assert next( checkpointed( state, b'\x00' * 16, cryptopaths, restart=True ))[0] == 0
+
+    # A bounded job completes, and then produces nothing more
+    state			= tmp_path / 'bounded.json'
+    assert len( list( checkpointed( state, master_secret, [ "ETH:m/44'/60'/0'/0/-2" ], accounts=True ))) == 3
+    assert json.loads( state.read_text() )['complete']
+    assert list( checkpointed( state, master_secret, [ "ETH:m/44'/60'/0'/0/-2" ], accounts=True )) == []
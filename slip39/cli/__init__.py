@@ -21,6 +21,9 @@ import logging
 import string
 
 from ..			import addresses as slip39_addresses
+from ..export		import export as slip39_export, EXPORTERS, COMPRESSIONS
+from ..recovery		import screen_entropy_file
+from ..recovery.screen	import SCREEN_FORMATS
 from ..util		import log_cfg, log_level, input_secure
 
 """
@@ -87,3 +90,60 @@ def addresses( crypto, paths, secret, format, unbounded ):
 
 
 cli.add_command( addresses )
+
+
+@click.command()
+@click.argument( "filename" )
+@click.option( "--cryptocurrency", "-c", multiple=True, help="A crypto name and optional derivation path w/ ranges, eg. \"ETH:m/44'/60'/0'/0/-99\" (default: ETH, BTC)" )
+@click.option( "--secret", help="A hex seed to derive HD wallet addresses from; '-' (the default) reads it from stdin" )
+@click.option( "--format", type=click.Choice( list( EXPORTERS )), help="The export format (default: from filename suffix, or jsonl)" )
+@click.option( "--compression", type=click.Choice( list( COMPRESSIONS )), help="The export compression (default: from filename suffix, eg. .gz)" )
+@click.option( "--workers", "-j", type=int, help="Derive addresses in parallel using a pool of worker processes" )
+@click.option( '--unbounded/--no-unbounded', default=False, help="Allow unbounded sequences of addresses")
+def export( filename, cryptocurrency, secret, format, compression, workers, unbounded ):
+    """Export the address groups of the cryptocurrencies' paths to FILENAME ('-' for stdout)."""
+    if not secret or secret == '-':
+        secret			= input_secure( 'Master secret hex: ', secret=True )
+    else:
+        log.warning( "It is recommended to not use '-s|--secret <hex>'; specify '-' to read from input" )
+    if secret.lower().startswith('0x'):
+        secret			= secret[2:]
+    count			= slip39_export(
+        file		= click.get_binary_stream( 'stdout' ) if filename == '-' else filename,
+        master_secret	= secret,
+        cryptopaths	= cryptocurrency or None,
+        format		= format,
+        compression	= compression,
+        allow_unbounded	= unbounded,
+        workers		= workers,
+    )
+    log.info( f"Exported {count} address groups to {filename}" )
+
+
+cli.add_command( export )
+
+
+@click.command()
+@click.argument( "filename" )
+@click.option( "--format", type=click.Choice( list( SCREEN_FORMATS )), default='hex', help="Hex lines, fixed-size raw binary records, or lines of die rolls (default: hex)" )
+@click.option( "--size", type=int, default=32, help="Bytes per raw record (default: 32)" )
+@click.option( "--output", "-o", default='-', help="The JSONL verdicts file (default: '-' for stdout)" )
+@click.option( "--signal-threshold", type=float, help="Signal harmonic threshold (default: known limits by entropy size, or 3.0)" )
+@click.option( "--shannon-threshold", type=float, help="Shannon entropy deficit threshold (default: known limits by entropy size, or 0.1)" )
+@click.option( "--workers", "-j", type=int, help="Screen records in parallel using a pool of worker processes" )
+def screen( filename, format, size, output, signal_threshold, shannon_threshold, workers ):
+    """Screen each entropy record in FILENAME ('-' for stdin) for non-random patterns, emitting a JSONL verdict per record."""
+    source			= click.open_file( filename, 'rb' )
+    with source, click.open_file( output, 'w' ) as verdicts:
+        count,failed,elapsed	= screen_entropy_file(
+            source, verdicts,
+            format		= format,
+            size		= size,
+            signal_threshold	= signal_threshold,
+            shannon_threshold	= shannon_threshold,
+            workers		= workers,
+        )
+    click.echo( f"Screened {count} records in {elapsed:.3f}s ({count / ( elapsed or 1e-9 ):.1f} records/s); {failed} failed", err=True )
+
+
+cli.add_command( screen )
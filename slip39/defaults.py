@@ -129,6 +129,9 @@ FILENAME_FORMAT			= "{name}-{date}+{time}-{crypto}-{address}.pdf"
 # Default Crypto accounts (and optional paths) to generate
 CRYPTO_PATHS			= ('ETH', 'BTC')
 
+# Number of derived HD wallet nodes (eg. the hardened m/44'/60'/0'/0 parent) retained, LRU
+DERIVATION_CACHE_SIZE		= 1024
+
 __d				= "55"
 __m				= "88"
 __o				= "BB"
@@ -0,0 +1,269 @@
+
+#
+# Python-slip39 -- Ethereum SLIP-39 Account Generation and Recovery
+#
+# Copyright (c) 2022, Dominion Research & Development Corp.
+#
+# Python-slip39 is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.  It is also available under alternative (eg. Commercial) licenses, at
+# your option.  See the LICENSE file at the top of the source tree.
+#
+# Python-slip39 is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+
+"""
+Bulk export of address groups (eg. from slip39.addressgroups) to CSV, JSONL or a compact binary
+columnar format, w/ optional gzip, bz2 or lzma compression.
+
+Each writer consumes an iterable of address groups, formatting them into a bounded buffer which is
+written in large chunks, so memory use is constant regardless of the number of addresses exported.
+The CSV and JSONL formats emit one record per account: index, crypto, path, address.
+
+The columnar format is a sequence of chunks, each a small JSON header describing the chunk's
+(crypto, format) ids and group width, followed by the columns of an AccountTable: crypto ids, path
+depths, (little-endian uint32) BIP-32 path indices, address lengths and decoded address bytes (see
+slip39.api.address_codec).
+"""
+
+import bz2
+import csv
+import gzip
+import io
+import itertools
+import json
+import logging
+import lzma
+import os
+import struct
+import sys
+
+from array		import array
+from json.encoder	import encode_basestring_ascii
+from typing		import Iterable, Sequence, Tuple, Union, Optional
+
+from .api		import AccountTable, address_codec, addressgroups, path_format
+
+log				= logging.getLogger( __package__ )
+
+EXPORT_BUFFER			= 1 << 20  # Bytes of formatted output buffered per write()
+
+COMPRESSIONS			= dict(
+    gzip	= gzip.open,
+    bz2		= bz2.open,
+    lzma	= lzma.open,
+)
+COMPRESSION_SUFFIXES		= {
+    '.gz':	'gzip',
+    '.bz2':	'bz2',
+    '.xz':	'lzma',
+    '.lzma':	'lzma',
+}
+
+COLUMNAR_MAGIC			= b"SLIP39AC\x02"  # SLIP-39 Address Columns, version 2
+COLUMNAR_COUNTS			= struct.Struct( '<III' )  # entries, path indices, address bytes
+COLUMNAR_HEADER			= struct.Struct( '<I' )    # JSON chunk header length
+
+
+def export_open( file: Union[str,os.PathLike], compression: Optional[str] = None, mode: str = 'wb' ):
+    """Open the named file (or an existing binary file object) for export, optionally compressed.
+    The compression is deduced from a file name's suffix, if not specified (use '' for none).
+
+    """
+    if compression is None and isinstance( file, ( str, os.PathLike )):
+        compression		= COMPRESSION_SUFFIXES.get( os.path.splitext( file )[1].lower() )
+    if compression:
+        if compression not in COMPRESSIONS:
+            raise ValueError( f"Unknown compression {compression!r}; specify one of {', '.join( COMPRESSIONS )}" )
+        return COMPRESSIONS[compression]( file, mode )
+    if isinstance( file, ( str, os.PathLike )):
+        return open( file, mode )
+    return file
+
+
+def export_csv(
+    groups: Iterable[Sequence[Tuple[str,str,str]]],
+    file,
+    header: bool		= True,
+    buffer: int			= EXPORT_BUFFER,
+) -> int:
+    """Write each account of each address group as a CSV index,crypto,path,address row.  Returns the
+    number of groups written.
+
+    """
+    text			= io.StringIO()
+    writer			= csv.writer( text, lineterminator='\n' )
+    if header:
+        writer.writerow( ('index', 'crypto', 'path', 'address') )
+    count			= 0
+    for count,group in enumerate( groups, start=1 ):
+        writer.writerows( (count - 1, crypto, path, address) for crypto,path,address in group )
+        if text.tell() >= buffer:
+            file.write( text.getvalue().encode( 'ascii' ))
+            text.seek( 0 )
+            text.truncate()
+    file.write( text.getvalue().encode( 'ascii' ))
+    return count
+
+
+def export_jsonl(
+    groups: Iterable[Sequence[Tuple[str,str,str]]],
+    file,
+    buffer: int			= EXPORT_BUFFER,
+) -> int:
+    """Write each account of each address group as a JSON {"index":..., "crypto":..., "path":...,
+    "address":...} line.  Returns the number of groups written.
+
+    """
+    lines			= []
+    size			= 0
+    count			= 0
+    for count,group in enumerate( groups, start=1 ):
+        for crypto,path,address in group:
+            line		= (
+                f'{{"index":{count - 1},"crypto":{encode_basestring_ascii( crypto )},'
+                f'"path":{"null" if path is None else encode_basestring_ascii( path )},'
+                f'"address":{encode_basestring_ascii( address )}}}\n'
+            )
+            lines.append( line )
+            size	       += len( line )
+        if size >= buffer:
+            file.write( ''.join( lines ).encode( 'ascii' ))
+            lines,size		= [],0
+    file.write( ''.join( lines ).encode( 'ascii' ))
+    return count
+
+
+def export_columnar(
+    groups: Iterable[Sequence[Tuple[str,str,str]]],
+    file,
+    chunk: int			= 65536,  # address groups per chunk
+) -> int:
+    """Write the address groups in compact binary columnar chunks of an AccountTable.  Returns the
+    number of groups written.
+
+    """
+    file.write( COLUMNAR_MAGIC )
+    count			= 0
+    groups			= iter( groups )
+    while True:
+        table			= AccountTable()
+        for group in itertools.islice( groups, chunk ):
+            table.append( group )
+        if not len( table ):
+            break
+        count		       += len( table )
+        depths			= array( 'B', (
+            end - beg
+            for beg,end in zip( itertools.chain( ( 0, ), table.path_ends ), table.path_ends )
+        ))
+        lengths			= array( 'B', (
+            end - beg
+            for beg,end in zip( itertools.chain( ( 0, ), table.address_ends ), table.address_ends )
+        ))
+        indices			= array( 'I', table.path_indices )
+        if sys.byteorder != 'little':
+            indices.byteswap()
+        header			= json.dumps( dict(
+            width	= table.width,
+            cryptos	= table.cryptos,
+        )).encode( 'UTF-8' )
+        file.write( b''.join( (
+            COLUMNAR_HEADER.pack( len( header )),
+            header,
+            COLUMNAR_COUNTS.pack( len( table.crypto_ids ), len( indices ), len( table.address_bytes )),
+            table.crypto_ids.tobytes(),
+            depths.tobytes(),
+            indices.tobytes(),
+            lengths.tobytes(),
+            bytes( table.address_bytes ),
+        )))
+    return count
+
+
+def import_columnar( file ) -> Iterable[Tuple[Tuple[str,Optional[str],str], ...]]:
+    """Yield the address groups of (<crypto>, <path>, <address>) from a binary columnar export."""
+    magic			= file.read( len( COLUMNAR_MAGIC ))
+    if magic != COLUMNAR_MAGIC:
+        raise ValueError( f"Not a SLIP-39 columnar address export: {magic!r}" )
+    while header_len := file.read( COLUMNAR_HEADER.size ):
+        header			= json.loads( file.read( COLUMNAR_HEADER.unpack( header_len )[0] ))
+        width,cryptos		= header['width'], header['cryptos']
+        encoders		= [ address_codec( crypto, format )[1] for crypto,format in cryptos ]
+        entries,n_indices,n_bytes = COLUMNAR_COUNTS.unpack( file.read( COLUMNAR_COUNTS.size ))
+        crypto_ids		= file.read( entries )
+        depths			= file.read( entries )
+        indices			= array( 'I' )
+        indices.frombytes( file.read( n_indices * indices.itemsize ))
+        if sys.byteorder != 'little':
+            indices.byteswap()
+        lengths			= file.read( entries )
+        addresses		= file.read( n_bytes )
+        records			= []
+        i = a			= 0
+        for crypto_id,depth,length in zip( crypto_ids, depths, lengths ):
+            records.append( (
+                cryptos[crypto_id][0], path_format( indices[i:i+depth] ), encoders[crypto_id]( addresses[a:a+length] )
+            ) )
+            i		       += depth
+            a		       += length
+            if len( records ) == width:
+                yield tuple( records )
+                records		= []
+
+
+EXPORTERS			= dict(
+    csv		= export_csv,
+    jsonl	= export_jsonl,
+    columnar	= export_columnar,
+)
+EXPORT_SUFFIXES			= {
+    '.csv':	'csv',
+    '.jsonl':	'jsonl',
+    '.json':	'jsonl',
+    '.sac':	'columnar',
+}
+
+
+def export(
+    file,					# A file name, or binary file object
+    master_secret: Union[str,bytes],
+    cryptopaths: Optional[Sequence[Union[str,Tuple[str,str]]]] = None,  # Default ETH, BTC
+    format: Optional[str]	= None,		# csv, jsonl or columnar; default: from file name, or jsonl
+    compression: Optional[str]	= None,		# gzip, bz2 or lzma; default: from file name
+    allow_unbounded: bool	= False,
+    workers: Optional[int]	= None,		# Derive addressgroups in parallel
+    **kwds					# eg. buffer=..., chunk=...
+) -> int:
+    """Stream the addressgroups of the master_secret at the cryptopaths to the file in the desired
+    format.  Returns the number of address groups exported.
+
+    """
+    if format is None:
+        name			= file if isinstance( file, ( str, os.PathLike )) else ''
+        stem,suffix		= os.path.splitext( name )
+        if suffix.lower() in COMPRESSION_SUFFIXES:
+            suffix		= os.path.splitext( stem )[1]
+        format			= EXPORT_SUFFIXES.get( suffix.lower(), 'jsonl' )
+    if format not in EXPORTERS:
+        raise ValueError( f"Unknown export format {format!r}; specify one of {', '.join( EXPORTERS )}" )
+    output			= export_open( file, compression )
+    try:
+        count			= EXPORTERS[format](
+            addressgroups(
+                master_secret	= master_secret,
+                cryptopaths	= cryptopaths,
+                allow_unbounded	= allow_unbounded,
+                workers		= workers,
+            ),
+            output,
+            **kwds
+        )
+    finally:
+        if output is not file:
+            output.close()
+    log.info( f"Exported {count} address groups in {format} format" + ( f" w/ {compression} compression" if compression else "" ))
+    return count
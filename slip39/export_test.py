@@ -0,0 +1,60 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from .api		import addressgroups
+from .export		import export, export_open, import_columnar
+
+
+CRYPTOPATHS			= [
+    ('ETH', "m/44'/60'/0'/0/-9"),
+    ('BTC', "m/84'/0'/0'/0/-9"),
+]
+
+
+def test_export( tmp_path ):
+    master_secret		= b'\xff' * 16
+    groups			= list( addressgroups( master_secret, CRYPTOPATHS ))
+    records			= [
+        (index, crypto, path, address)
+        for index,group in enumerate( groups )
+        for crypto,path,address in group
+    ]
+    assert len( groups ) == 10
+
+    # CSV, w/ a tiny buffer to exercise the buffer flushing
+    name			= tmp_path / 'addresses.csv'
+    assert export( name, master_secret, CRYPTOPATHS, buffer=100 ) == 10
+    with open( name, newline='' ) as f:
+        rows			= list( csv.reader( f ))
+    assert rows[0] == ['index', 'crypto', 'path', 'address']
+    assert [ (int( i ), c, p, a) for i,c,p,a in rows[1:] ] == records
+
+    # JSONL w/ gzip compression deduced from the suffix
+    name			= tmp_path / 'addresses.jsonl.gz'
+    assert export( name, master_secret, CRYPTOPATHS, buffer=100 ) == 10
+    with gzip.open( name, 'rt' ) as f:
+        lines			= [ json.loads( line ) for line in f ]
+    assert [ tuple( line.values() ) for line in lines ] == records
+    assert list( lines[0] ) == ['index', 'crypto', 'path', 'address']
+
+    # Columnar, in several chunks, to an open binary file
+    output			= io.BytesIO()
+    assert export( output, master_secret, CRYPTOPATHS, format='columnar', chunk=4 ) == 10
+    assert list( import_columnar( io.BytesIO( output.getvalue() ))) == groups
+
+    # Columnar w/ lzma compression
+    name			= tmp_path / 'addresses.sac.xz'
+    assert export( name, master_secret, CRYPTOPATHS ) == 10
+    with export_open( name, mode='rb' ) as f:
+        assert list( import_columnar( f )) == groups
+
+    with pytest.raises( ValueError ):
+        export( io.BytesIO(), master_secret, CRYPTOPATHS, format='parquet' )
+    with pytest.raises( ValueError ):
+        export( io.BytesIO(), master_secret, CRYPTOPATHS, compression='zip' )
+    with pytest.raises( ValueError ):
+        list( import_columnar( io.BytesIO( b'not columnar' )))
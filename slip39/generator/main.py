@@ -11,7 +11,8 @@ from .			import chacha20poly1305, accountgroups_output, accountgroups_input
 from ..util		import log_cfg, log_level, input_secure
 from ..defaults		import BITS, BAUDRATE, CRYPTO_PATHS
 from ..			import Account, cryptopaths_parser
-from ..api		import accountgroups, RANDOM_BYTES
+from ..api		import accountgroups, addressgroups, RANDOM_BYTES
+from ..checkpoint	import checkpointed
 
 log				= logging.getLogger( __package__ )
 
@@ -96,6 +97,12 @@ satisfactory.  This first nonce record is transmitted with an enumeration prefix
     ap.add_argument( '--path',
                      default=None,
                      help="Modify all derivation paths by replacing the final segment(s) w/ the supplied range(s), eg. '.../1/-' means .../1/[0,...)")
+    ap.add_argument( '-j', '--workers', type=int,
+                     default=None,
+                     help="Derive wallet addresses in a pool of this many processes (not w/ --xpub)" )
+    ap.add_argument( '--state', type=str,
+                     default=None,
+                     help="Resume from (and periodically checkpoint progress to) this state file; never contains the secret" )
     ap.add_argument( '-d', '--device', type=str,
                      default=None,
                      help="Use this serial device to transmit (or --receive) records" )
@@ -356,10 +363,29 @@ satisfactory.  This first nonce record is transmitted with an enumeration prefix
     nonce_emit			= True
     nonce			= RANDOM_BYTES( 12 )
 
-    for index,group in enumerate( accountgroups(
-        master_secret	= secret,
-        cryptopaths	= cryptopaths,
-    )):
+    # Wallet addresses (but not xpubkeys) may be derived in parallel, yielding (<crypto>, <path>,
+    # <address>) records (in order) instead of Accounts.  If a --state file is supplied, resume from
+    # (and checkpoint) the index of the next group to be sent.
+    if args.state:
+        groups			= checkpointed(
+            state		= args.state,
+            master_secret	= secret,
+            cryptopaths		= cryptopaths,
+            accounts		= args.xpub or not args.workers,
+            workers		= args.workers,
+        )
+    elif args.workers and not args.xpub:
+        groups			= enumerate( addressgroups(
+            master_secret	= secret,
+            cryptopaths		= cryptopaths,
+            workers		= args.workers,
+        ))
+    else:
+        groups			= enumerate( accountgroups(
+            master_secret	= secret,
+            cryptopaths		= cryptopaths,
+        ))
+    for index,group in groups:
         if file is None and file_opener:
             file		= file_opener()
             if healthy_waiter:
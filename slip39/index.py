@@ -0,0 +1,266 @@
+
+#
+# Python-slip39 -- Ethereum SLIP-39 Account Generation and Recovery
+#
+# Copyright (c) 2022, Dominion Research & Development Corp.
+#
+# Python-slip39 is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.  It is also available under alternative (eg. Commercial) licenses, at
+# your option.  See the LICENSE file at the top of the source tree.
+#
+# Python-slip39 is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+
+"""
+A persistent address -> (<crypto>, <path>) reverse index, for answering "is this address ours, and
+at what derivation path?" without re-deriving the addresses.
+
+The index file holds a small JSON header (the cryptopaths indexed, their address formats, the number
+of address groups indexed so far, and a salted, stretched digest identifying the master secret --
+never the secret itself), followed by fixed-width records sorted by a 128-bit BLAKE2b digest of
+each address.  Hex (eg. ETH) addresses are keyed case-insensitively, so a lower-case address (or
+one w/ a different checksum case) is found.  The
+records are memory-mapped and binary searched, so a lookup touches only a few pages regardless of
+the index size.
+
+The index is extended as the gap limit grows, by deriving only the next address groups and merging
+their (sorted) records into the existing records.
+
+"""
+
+import bisect
+import functools
+import hashlib
+import heapq
+import hmac
+import itertools
+import json
+import logging
+import mmap
+import os
+import re
+import secrets
+import struct
+
+from typing		import List, Optional, Sequence, Tuple, Union
+
+from .api		import (
+    Account, addressgroups_chunk, cryptopaths_parser, path_format, path_indices, path_parser, path_sequence,
+)
+from .util		import parallel_chunked, secret_digest
+
+log				= logging.getLogger( __package__ )
+
+INDEX_MAGIC			= b"SLIP39AI\x02"  # SLIP-39 Address Index, version 2
+INDEX_HEADER			= struct.Struct( '<I' )  # JSON header length
+INDEX_DEPTH			= 8		# Maximum derivation path depth indexed
+INDEX_RECORD			= struct.Struct( f'<16sBB{INDEX_DEPTH}I' )  # address digest, crypto id, depth, indices
+INDEX_KEY			= 16
+INDEX_SALT			= 16		# Bytes of random salt for each index's master secret digest
+
+HEX_ADDRESS			= re.compile( r'^0[xX][0-9a-fA-F]{40}$' )
+
+
+def address_digest( address: str ) -> bytes:
+    """The index key of an address; hex addresses' (eg. ETH's EIP-55) checksum case is ignored."""
+    if HEX_ADDRESS.match( address ):
+        address			= address.lower()
+    return hashlib.blake2b( address.encode( 'UTF-8' ), digest_size=INDEX_KEY ).digest()
+
+
+class _Keys:
+    """A sequence view of the address digests of the memory-mapped records, for bisect."""
+    __slots__			= ( 'records', )
+
+    def __init__( self, records ):
+        self.records		= records
+
+    def __len__( self ):
+        return len( self.records ) // INDEX_RECORD.size
+
+    def __getitem__( self, i ):
+        offset			= i * INDEX_RECORD.size
+        return bytes( self.records[offset:offset + INDEX_KEY] )
+
+
+class AddressIndex:
+    """A sorted, memory-mapped address -> (<crypto>, <path>) index, built incrementally from the
+    address groups of a master secret's cryptopaths.  Create one, and extend it as required:
+
+        with AddressIndex.create( "addresses.idx", master_secret, ["ETH", "BTC"], count=1000 ) as idx:
+            idx.lookup( "0x824b17..." )     # [("ETH", "m/44'/60'/0'/0/0")]
+            idx.extend( master_secret, count=1000 )
+
+    Later, open it w/ AddressIndex( "addresses.idx" ) for lookups; the master secret is only required
+    to extend it.
+
+    """
+    def __init__( self, filename: Union[str,os.PathLike] ):
+        self.filename		= filename
+        self.file		= None
+        self.map		= None
+        self.open()
+
+    @classmethod
+    def create(
+        cls,
+        filename: Union[str,os.PathLike],
+        master_secret: Union[str,bytes],
+        cryptopaths: Optional[Sequence[Union[str,Tuple[str,str]]]] = None,  # Default ETH, BTC
+        count: int		= 0,		# Initial address groups to index
+        **kwds					# eg. workers=N
+    ) -> "AddressIndex":
+        cryptopaths		= cryptopaths_parser( cryptopaths )
+        salt			= secrets.token_bytes( INDEX_SALT )
+        header			= dict(
+            salt	= salt.hex(),
+            digest	= secret_digest( master_secret, salt ),
+            cryptopaths	= cryptopaths,
+            cryptos	= [ (crypto, Account.address_format( crypto )) for crypto,_ in cryptopaths ],
+            groups	= 0,
+        )
+        cls.write( filename, header, [] )
+        index			= cls( filename )
+        if count:
+            index.extend( master_secret, count, **kwds )
+        return index
+
+    @staticmethod
+    def write( filename, header, records ):
+        """Write an index file w/ the header and the sorted, packed records."""
+        with open( filename, 'wb' ) as f:
+            head		= json.dumps( header ).encode( 'UTF-8' )
+            f.write( INDEX_MAGIC + INDEX_HEADER.pack( len( head )) + head )
+            f.writelines( records )
+
+    def open( self ):
+        self.file		= open( self.filename, 'rb' )
+        self.map		= mmap.mmap( self.file.fileno(), 0, access=mmap.ACCESS_READ )
+        if self.map[:len( INDEX_MAGIC )] != INDEX_MAGIC:
+            self.close()
+            raise ValueError( f"Not a SLIP-39 address index: {self.filename}" )
+        offset			= len( INDEX_MAGIC )
+        length,			= INDEX_HEADER.unpack_from( self.map, offset )
+        offset		       += INDEX_HEADER.size
+        self.header		= json.loads( self.map[offset:offset + length] )
+        self.records		= memoryview( self.map )[offset + length:]
+        self.keys		= _Keys( self.records )
+
+    def close( self ):
+        if self.map is not None:
+            self.records = self.keys = None
+            self.map.close()
+            self.map		= None
+        if self.file is not None:
+            self.file.close()
+            self.file		= None
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, *exc ):
+        self.close()
+
+    @property
+    def groups( self ) -> int:
+        """The number of address groups indexed (ie. the next address group's sequence number)."""
+        return self.header['groups']
+
+    def __len__( self ):
+        """The number of addresses indexed."""
+        return len( self.keys )
+
+    def record( self, i: int ) -> Tuple[str,Optional[str]]:
+        """Return the i'th record's (<crypto>, <path>)."""
+        _,crypto_id,depth,*indices = INDEX_RECORD.unpack_from( self.records, i * INDEX_RECORD.size )
+        return self.header['cryptos'][crypto_id][0], path_format( indices[:depth] )
+
+    def lookup( self, address: str ) -> List[Tuple[str,Optional[str]]]:
+        """Return the (<crypto>, <path>) of each account with the address (eg. ETH and BNB share
+        addresses), or an empty list if the address is not indexed.
+
+        """
+        key			= address_digest( address )
+        i			= bisect.bisect_left( self.keys, key )
+        found			= []
+        while i < len( self.keys ) and self.keys[i] == key:
+            found.append( self.record( i ))
+            i		       += 1
+        return found
+
+    def __contains__( self, address: str ) -> bool:
+        key			= address_digest( address )
+        i			= bisect.bisect_left( self.keys, key )
+        return i < len( self.keys ) and self.keys[i] == key
+
+    def extend(
+        self,
+        master_secret: Union[str,bytes],
+        count: int,				# Additional address groups to index
+        workers: Optional[int]	= None,		# Derive in a pool of this many processes
+        chunksize: int		= 100,
+    ) -> int:
+        """Derive and index the next count address groups, returning the number of groups added (less
+        than count, if the cryptopaths' ranges are exhausted).
+
+        """
+        if not hmac.compare_digest(
+                secret_digest( master_secret, bytes.fromhex( self.header['salt'] )), self.header['digest'] ):
+            raise ValueError( f"Master secret does not match the one used to create {self.filename}" )
+        begin			= self.groups
+        pathgroups		= zip( *[
+            path_sequence( *path_parser(
+                paths		= paths,
+                allow_unbounded	= True,
+            ), compiled=True )[begin:begin + count]  # Resumes w/o re-generating the prior paths
+            for _,paths in self.header['cryptopaths']
+        ])
+        cryptoformats		= [ tuple( cf ) for cf in self.header['cryptos'] ]
+        crypto_ids		= { cf: i for i,cf in enumerate( cryptoformats ) }
+
+        added			= []
+        groups			= 0
+
+        derive			= functools.partial( addressgroups_chunk, master_secret, cryptoformats )
+        if workers:
+            results		= parallel_chunked( derive, pathgroups, chunksize=chunksize, workers=workers )
+        else:
+            results		= itertools.chain.from_iterable(
+                derive( chunk ) for chunk in iter( lambda: list( itertools.islice( pathgroups, chunksize )), [] ))
+        for group in results:
+            groups	       += 1
+            for (crypto,path,address),cf in zip( group, cryptoformats ):
+                indices		= path_indices( path )
+                if len( indices ) > INDEX_DEPTH:
+                    raise ValueError( f"Derivation path {path} deeper than {INDEX_DEPTH}" )
+                added.append( INDEX_RECORD.pack(
+                    address_digest( address ), crypto_ids[cf], len( indices ),
+                    *indices, *[0] * ( INDEX_DEPTH - len( indices )) ))
+        if not groups:
+            return 0
+
+        # Merge the newly sorted records w/ the existing sorted records into a new index file, and
+        # then (once the existing index is unmapped) atomically replace the existing index file.
+        added.sort()
+        existing		= (
+            bytes( self.records[i:i + INDEX_RECORD.size] )
+            for i in range( 0, len( self.records ), INDEX_RECORD.size )
+        )
+        temp			= f"{self.filename}.tmp"
+        try:
+            self.write( temp, dict( self.header, groups=begin + groups ), heapq.merge( existing, added ))
+            self.close()
+            os.replace( temp, self.filename )
+        except BaseException:
+            if os.path.exists( temp ):
+                os.remove( temp )
+            raise
+        finally:
+            if self.map is None:
+                self.open()
+        log.info( f"Indexed address groups {begin}-{begin + groups - 1} of {self.filename}; {len( self )} addresses" )
+        return groups
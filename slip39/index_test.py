@@ -0,0 +1,63 @@
+import pytest
+
+from .api		import account, addressgroups
+from .index		import AddressIndex
+
+
+def test_address_index( tmp_path ):
+    master_secret		= b'\xff' * 16
+    cryptopaths			= [
+        ('ETH', "m/44'/60'/0'/0/-"),
+        ('BNB', "m/44'/60'/0'/0/-"),
+        ('BTC', "m/84'/0'/0'/0/-19"),
+    ]
+    groups			= list( addressgroups( master_secret, cryptopaths ))
+    assert len( groups ) == 20
+    name			= tmp_path / 'addresses.idx'
+
+    with AddressIndex.create( name, master_secret, cryptopaths, count=5 ) as idx:
+        assert idx.groups == 5
+        assert len( idx ) == 15
+        assert idx.extend( master_secret, 10, chunksize=3 ) == 10
+        assert idx.groups == 15
+    with pytest.raises( ValueError ):
+        AddressIndex( name ).extend( b'\x00' * 16, 10 )
+
+    with AddressIndex( name ) as idx:
+        assert idx.groups == 15
+        # BTC's range is exhausted after 20 groups
+        assert idx.extend( master_secret.hex(), 10, workers=2 ) == 5
+        assert idx.extend( master_secret, 10 ) == 0
+        assert idx.groups == 20
+        assert len( idx ) == 60
+        for eth,bnb,btc in groups:
+            assert eth[2] == bnb[2]
+            assert sorted( idx.lookup( eth[2] )) == [ ('BNB', bnb[1]), ('ETH', eth[1]) ]
+            assert idx.lookup( btc[2] ) == [ ('BTC', btc[1]) ]
+            assert btc[2] in idx
+            # Hex addresses are found regardless of their checksum case
+            assert idx.lookup( eth[2].lower() ) == idx.lookup( '0x' + eth[2][2:].upper() ) == idx.lookup( eth[2] )
+        beyond			= account( master_secret, 'ETH', "m/44'/60'/0'/0/20" ).address
+        assert beyond not in idx
+        assert idx.lookup( beyond ) == []
+
+        # The master secret is identified by a salted digest, unique to each index
+        assert master_secret.hex() not in name.read_bytes().decode( 'UTF-8', 'replace' )
+        with AddressIndex.create( tmp_path / 'other.idx', master_secret, cryptopaths ) as other:
+            assert other.header['salt'] != idx.header['salt'] and other.header['digest'] != idx.header['digest']
+
+
+def test_address_index_failed_extend( tmp_path, monkeypatch ):
+    """A failed extend leaves the existing index intact, and no temporary file."""
+    master_secret		= b'\xff' * 16
+    name			= tmp_path / 'addresses.idx'
+    with AddressIndex.create( name, master_secret, [ "ETH:m/44'/60'/0'/0/-" ], count=2 ) as idx:
+        def write( filename, header, records ):
+            with open( filename, 'wb' ) as f:
+                f.write( b'partial' )
+            raise OSError( "Disk full" )
+        monkeypatch.setattr( AddressIndex, 'write', staticmethod( write ))
+        with pytest.raises( OSError ):
+            idx.extend( master_secret, 2 )
+        assert list( tmp_path.iterdir() ) == [ name ]
+        assert idx.groups == 2 and len( idx ) == 2
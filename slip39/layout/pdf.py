@@ -25,20 +25,21 @@ import warnings
 
 from datetime		import datetime
 from collections.abc	import Callable
+from concurrent.futures	import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from pathlib		import Path
-from typing		import Dict, List, Tuple, Optional, Sequence, Any
+from typing		import Dict, List, Tuple, Optional, Sequence, Any, Iterator
 
 import qrcode
 import fpdf		# FPDF, FlexTemplate, FPDF_FONT_DIR
 
-from ..api		import Account, cryptopaths_parser, create, enumerate_mnemonic, group_parser
-from ..util		import chunker
+from ..api		import Account, cryptopaths_parser, create, enumerate_mnemonic, group_parser, random_secret
+from ..util		import chunker, lazy_sequence
 from ..recovery		import recover, produce_bip39
 from ..defaults		import (
     FONTS, CARD, CARD_SIZES, PAPER, PAGE_MARGIN, MM_IN, PT_IN,
     WALLET, WALLET_SIZES,
     GROUPS, GROUP_THRESHOLD_RATIO,
-    FILENAME_FORMAT,
+    FILENAME_FORMAT, BITS, BITS_DEFAULT,
 )
 from .components	import (
     Coordinate, Region, Box, Image, Text,
@@ -405,6 +406,7 @@ def write_pdfs(
                 passphrase	= passphrase.encode( 'UTF-8' ) if passphrase else b'',
                 using_bip39	= using_bip39,  # Derive wallet Seed using BIP-39 Mnemonic + passphrase generation
                 cryptopaths	= cryptopaths,
+                lazy		= not ( wallet_pwd or json_pwd ),  # Only accounts[0] is required
             )
             for name in names or [ "SLIP39" ]
         }
@@ -650,6 +652,60 @@ def write_pdfs(
                     paper_format	= pdf_paper,
                 )
 
+        # Return only the accounts used; a lazy sequence's accountgroups generator would otherwise
+        # retain the wallet derivation Seed for as long as the caller retains the results.
+        if isinstance( details.accounts, lazy_sequence ):
+            details		= details._replace( accounts=details.accounts.close() )
         results[pdf_name]	= details
 
     return results
+
+
+def write_pdfs_named(
+    name: str,
+    master_secret: bytes,
+    kwds: Dict[str,Any],
+) -> Tuple[str,List[str]]:
+    """Write the PDF for a single name (eg. in a worker process).  Returns the name and the PDF
+    file names written; the details (w/ their lazily derived accounts) are not returned.
+
+    """
+    return name, list( write_pdfs( names=[ name ], master_secret=master_secret, **kwds ))
+
+
+def write_pdfs_batch(
+    names: Sequence[str],
+    workers: Optional[int]	= None,		# Write PDFs in a pool of this many processes
+    pending: Optional[int]	= None,		# Max. names in progress (default: 2 per worker)
+    strength: int		= BITS_DEFAULT,		# Bits of each name's random master secret
+    **kwds					# write_pdfs keywords, eg. group=..., cryptocurrency=...
+) -> Iterator[Tuple[str,List[str]]]:
+    """Write a PDF containing a unique SLIP-39 encoded Seed Entropy for each of many names, yielding
+    each (<name>, [<filename>, ...]) as it completes (not necessarily in order).
+
+    Each name's master secret is drawn here (in the parent process) via random_secret, just before
+    its create + produce_pdf + output is submitted to the pool.  At most 'pending' names are in
+    progress at once, bounding the memory (and secrets) outstanding regardless of len( names ).
+
+    """
+    assert strength in BITS, f"Invalid {strength}-bit secret length specified"
+    assert 'master_secret' not in kwds, \
+        "Each name in a batch is given a unique random master secret"
+    if not workers:
+        for name in names:
+            yield write_pdfs_named( name, random_secret( strength // 8 ), kwds )
+        return
+
+    names			= iter( names )
+    with ProcessPoolExecutor( max_workers=workers ) as executor:
+        running			= set()
+        while True:
+            for name in names:
+                running.add( executor.submit( write_pdfs_named, name, random_secret( strength // 8 ), kwds ))
+                if len( running ) >= ( pending or workers * 2 ):
+                    break
+            if not running:
+                break
+            done,running	= wait( running, return_when=FIRST_COMPLETED )
+            for future in done:
+                yield future.result()
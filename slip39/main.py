@@ -17,12 +17,13 @@
 
 import argparse
 import codecs
+import functools
 import logging
 
 from .			import Account
 from .api		import random_secret
 from .util		import log_cfg, log_level, input_secure
-from .layout		import write_pdfs
+from .layout		import write_pdfs, write_pdfs_batch
 from .defaults		import (   # noqa: F401
     CARD, CARD_SIZES, PAPER, WALLET, WALLET_SIZES,
     BITS, BITS_DEFAULT,
@@ -108,6 +109,9 @@ def main( argv=None ):
     ap.add_argument( '--watermark',
                      default=None,
                      help="Include a watermark on the output SLIP-39 mnemonic cards" )
+    ap.add_argument( '--workers', type=int,
+                     default=None,
+                     help="Produce the PDFs for multiple names in a pool of this many processes" )
     ap.add_argument( 'names', nargs="*",
                      help="Account names to produce; if --secret Entropy is supplied, only one is allowed.")
     args			= ap.parse_args( argv )
@@ -183,10 +187,15 @@ def main( argv=None ):
         else:
             log.warning( "It is recommended to not use '-j|--json <password>'; specify '-' to read from input" )
 
+    # Multiple names w/o a supplied --secret each get a unique random secret (drawn here, in the parent
+    # process); they may be produced in a pool of --workers processes.
+    batch			= not args.secret and len( args.names ) > 1
     try:
-        write_pdfs(
-            names		= args.names,
-            master_secret	= master_secret,
+        if batch:
+            produce		= functools.partial( write_pdfs_batch, args.names, workers=args.workers, strength=bits_desired )
+        else:
+            produce		= functools.partial( write_pdfs, names=args.names, master_secret=master_secret )
+        results			= produce(
             passphrase		= passphrase,
             using_bip39		= args.using_bip39,
             group		= args.group,
@@ -204,6 +213,9 @@ def main( argv=None ):
             cover_page		= args.cover_page,
             watermark		= args.watermark,
         )
+        if batch:
+            for name,filenames in results:
+                log.info( f"Wrote {name!r} to {', '.join( filenames )}" )
     except Exception as exc:
         log.exception( f"Failed to write PDFs: {exc}" )
         return 1
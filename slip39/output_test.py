@@ -4,8 +4,9 @@ import qrcode
 from pytest 		import approx
 from fpdf		import FPDF, FlexTemplate
 
-from .layout		import Region, Text, Image, Box, Coordinate
+from .layout		import Region, Text, Image, Box, Coordinate, write_pdfs, write_pdfs_batch
 from .defaults		import MM_IN
+from .dependency_test	import SEED_ONES
 
 
 def test_Region():
@@ -74,3 +75,36 @@ def test_Region():
     tpl.render( offsetx = card_size.x * MM_IN, offsety = card_size.y * MM_IN )
 
     #pdf.output( "test.pdf" ) # To view results in test.pdf, uncomment
+
+
+def test_write_pdfs_batch( tmp_path ):
+    names			= [ f"Client {i}" for i in range( 4 ) ]
+    kwds			= dict(
+        group		= [ "One(1/1)", "Fam(2/3)" ],
+        cryptocurrency	= [ "ETH" ],
+        filename	= "{name}.pdf",
+        filepath	= str( tmp_path ),
+        cover_page	= False,
+    )
+    serial			= dict( write_pdfs_batch( names[:1], **kwds ))
+    assert serial == { "Client 0": [ "Client 0.pdf" ] }
+
+    pooled			= dict( write_pdfs_batch( names, workers=2, pending=2, **kwds ))
+    assert sorted( pooled ) == names
+    assert all( ( tmp_path / f"{name}.pdf" ).stat().st_size for name in names )
+
+
+def test_write_pdfs_accounts( tmp_path ):
+    """Only the accounts used are returned; no lazy sequence (retaining the Seed) outlives write_pdfs."""
+    results			= write_pdfs(
+        names		= [ "Lazy" ],
+        master_secret	= SEED_ONES,
+        group		= [ "One(1/1)" ],
+        cryptocurrency	= [ "ETH:.../-99" ],
+        filename	= "{name}.pdf",
+        filepath	= str( tmp_path ),
+        cover_page	= False,
+    )
+    [details]			= results.values()
+    assert isinstance( details.accounts, list ) and len( details.accounts ) == 1
+    assert details.accounts[0][0].address == "0x824b174803e688dE39aF5B3D7Cd39bE6515A19a1"
@@ -15,35 +15,145 @@
 # FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
 #
 
+import functools
+import heapq
 import itertools
 import logging
 
-from typing		import List, Optional
+from collections	import defaultdict
+from concurrent.futures	import ProcessPoolExecutor
+from typing		import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-from shamir_mnemonic	import combine_mnemonics
+from shamir_mnemonic	import decode_mnemonics, recover_ems, EncryptedMasterSecret, MnemonicError
 from mnemonic		import Mnemonic
 
-from ..util		import ordinal
+from ..util		import ordinal, parallel_chunked
 
 from .entropy		import (  # noqa F401
-    shannon_entropy, signal_entropy, analyze_entropy, scan_entropy, display_entropy
+    shannon_entropy, signal_entropy, analyze_entropy, scan_entropy, display_entropy, EntropyScanIncomplete
+)
+from .validate		import (  # noqa F401
+    ShareValidation, validate_mnemonic, validate_mnemonics
+)
+from .screen		import (  # noqa F401
+    EntropyVerdict, entropy_records, screen_entropy, screen_entropy_file
 )
 
 log				= logging.getLogger( __package__ )
 
 
+def recover_shares(
+    mnemonics: Sequence[str],
+) -> Dict[Tuple, Dict[int, Dict[int, Dict[int, int]]]]:
+    """Decode each SLIP-39 mnemonic's metadata, discarding those with invalid checksums (or otherwise
+    undecodable).  Returns the offsets of the valid mnemonics, clustered by their common parameters
+    (identifier, iteration exponent, group threshold and count), group index and member threshold,
+    keyed by member index: {<common>: {<group_index>: {<member_threshold>: {<index>: <offset>}}}}.
+    Duplicate member indices within a group (eg. the same mnemonic supplied twice) are ignored.
+
+    """
+    clusters			= defaultdict( lambda: defaultdict( lambda: defaultdict( dict )))
+    for offset,mnemonic in enumerate( mnemonics ):
+        share			= validate_mnemonic( mnemonic, offset+1 )
+        if not share.valid:
+            log.info( f"Discarding {ordinal( offset+1 )} supplied mnemonic: {share.error}" )
+            continue
+        common			= (share.identifier, share.iteration_exponent, share.group_threshold, share.group_count)
+        members			= clusters[common][share.group_index][share.member_threshold]
+        members.setdefault( share.index, offset )
+    return clusters
+
+
+def recover_candidates(
+    mnemonics: Sequence[str],
+) -> Iterator[Tuple[int, ...]]:
+    """Yield the offsets of each subset of the supplied mnemonics that could satisfy a SLIP-39 recovery,
+    smallest subsets first: group threshold distinct groups, each with exactly its member threshold
+    of distinct members, all sharing the same identifier and common parameters.
+
+    """
+    def cluster_candidates( group_threshold, groups ):
+        # Each group index may be satisfied by any of its (usually just one) member thresholds, if
+        # enough distinct members were supplied.  Order each selection of groups by its size.
+        options			= {
+            group_index: [
+                (member_threshold, sorted( members.values() ))
+                for member_threshold,members in thresholds.items()
+                if len( members ) >= member_threshold
+            ]
+            for group_index,thresholds in groups.items()
+        }
+        plans			= sorted(
+            (
+                sum( member_threshold for member_threshold,_ in plan ),
+                plan
+            )
+            for group_indices in itertools.combinations( sorted( options ), group_threshold )
+            for plan in itertools.product( *( options[group_index] for group_index in group_indices ))
+        )
+        for _,plan in plans:
+            for members in itertools.product( *(
+                itertools.combinations( offsets, member_threshold )
+                for member_threshold,offsets in plan
+            )):
+                yield tuple( sorted( itertools.chain( *members )))
+
+    yield from heapq.merge( *(
+        cluster_candidates( group_threshold, groups )
+        for (_,_,group_threshold,_),groups in recover_shares( mnemonics ).items()
+    ), key=len )
+
+
+def recover_encrypted(
+    mnemonics: Sequence[str],
+) -> Optional[EncryptedMasterSecret]:
+    """Attempt to recover the encrypted master secret from exactly the supplied mnemonics, returning
+    None on failure.  No (costly) decryption is performed.
+
+    """
+    try:
+        return recover_ems( decode_mnemonics( mnemonics ))
+    except (MnemonicError, ValueError):
+        return None
+
+
+def recover_decrypt(
+    encrypted: EncryptedMasterSecret,
+    passphrase: bytes		= b"",
+    decrypted: Optional[Dict[Tuple[bytes,int,int,bytes],bytes]] = None,
+) -> bytes:
+    """Decrypt the encrypted master secret w/ the passphrase, memoizing the result in decrypted (if
+    supplied).  The PBKDF2-based Feistel rounds cost 10,000 x 2^iteration_exponent iterations (see
+    slip39.encryption_costs), so the same secret should never be decrypted twice.
+
+    """
+    key				= (encrypted.ciphertext, encrypted.identifier, encrypted.iteration_exponent, passphrase)
+    if decrypted is not None and key in decrypted:
+        return decrypted[key]
+    secret			= encrypted.decrypt( passphrase )
+    if decrypted is not None:
+        decrypted[key]		= secret
+    return secret
+
+
 def recover(
     mnemonics: List[str],
     passphrase: bytes		= b"",
     using_bip39: bool		= False,
+    workers: Optional[int]	= None,		# Search mnemonic subsets in a pool of this many processes
+    batch: Optional[int]	= None,		# Mnemonic subsets tried per round (default: 4 per worker)
+    decrypted: Optional[Dict] = None,		# Memoize decrypted secrets across calls in this dict
 ) -> bytes:
     """Recover a master secret Seed Entropy from the supplied SLIP-39 mnemonics.  We cannot know what
-    subset of these mnemonics is required and/or valid, so we need to iterate over all subset
+    subset of these mnemonics is required and/or valid, so we need to search the subset
     combinations on failure.
 
-    We'll try to find one of the smallest subsets that satisfies the SLIP-39 recovery.  The
-    resultant secret Entropy is returned as the Seed, with (not widely used) SLIP-39 decryption with
-    the given passphrase.
+    Each mnemonic's metadata is decoded first, discarding any with invalid checksums, and only the
+    subsets that can satisfy the SLIP-39 group and member thresholds of some identifier are tried,
+    smallest first (optionally, in a pool of worker processes).  Only the successfully recovered
+    encrypted secret is (expensively) decrypted, memoized by ciphertext, identifier, iteration exponent
+    and passphrase.  The resultant secret Entropy is returned as the Seed, with (not widely used)
+    SLIP-39 decryption with the given passphrase.
 
     WARNING: SLIP-39 passphrase encryption is not Trezor "Model T" compatible, and is not widely
     used; if you want to hide a wallet, use the Trezor "Hidden wallet" feature instead, where the
@@ -57,31 +167,42 @@ def recover(
     Cards, you are free to destroy your original insecure and unreliable BIP-39 Mnemonic backup(s).
 
     """
-    secret			= None
+    encrypted			= None
     try:
         combo			= range( len( mnemonics ))
-        secret			= combine_mnemonics(
-            mnemonics,
-            passphrase	= b"" if using_bip39 else passphrase
-        )
+        encrypted		= recover_ems( decode_mnemonics( mnemonics ))
     except Exception as exc:
-        # Try a subset of the supplied mnemonics, to silently reject any invalid mnemonic phrases supplied
-        for length in range( len( mnemonics )):
-            for combo in itertools.combinations( range( len( mnemonics )), length ):
-                trial		= list( mnemonics[i] for i in combo )
-                try:
-                    secret	= combine_mnemonics(
-                        trial,
-                        passphrase	= b"" if using_bip39 else passphrase
-                    )
+        # Try only the subsets of the supplied mnemonics that could satisfy the SLIP-39 thresholds, to
+        # silently reject any invalid, duplicate or unrelated mnemonic phrases supplied
+        candidates		= recover_candidates( mnemonics )
+        if workers:
+            batch		= batch or workers * 4
+            with ProcessPoolExecutor( max_workers=workers ) as executor:
+                while not encrypted:
+                    combos	= list( itertools.islice( candidates, batch ))
+                    if not combos:
+                        break
+                    # Of the batch, take the first (ie. smallest) successful subset
+                    for combo,encrypted in zip( combos, executor.map(
+                        recover_encrypted,
+                        ( [ mnemonics[i] for i in combo ] for combo in combos ),
+                    )):
+                        if encrypted:
+                            break
+        else:
+            for combo in candidates:
+                encrypted	= recover_encrypted( [ mnemonics[i] for i in combo ] )
+                if encrypted:
                     break
-                except Exception:
-                    pass
-            if secret:
-                break
-        if not secret:
+        if not encrypted:
             # No recovery; raise the Exception produced by original attempt w/ all mnemonics
             raise exc
+    # Only the recovered encrypted master secret is decrypted (once per distinct secret and passphrase)
+    secret			= recover_decrypt(
+        encrypted,
+        passphrase	= b"" if using_bip39 else passphrase,
+        decrypted	= {} if decrypted is None else decrypted,
+    )
     log.info(
         f"Recovered {len(secret)*8}-bit SLIP-39 Seed Entropy with {len(combo)}"
         f" ({'all' if len(combo) == len(mnemonics) else ', '.join( ordinal(i+1) for i in combo)})"
@@ -112,13 +233,14 @@ def recover_bip39(
         "When recovering original BIP-39 entropy, no passphrase may be specified"
     # Polish up the supplied mnemonic, by eliminating extra spaces; Mnemonic is fragile...
     mnemonic			= ' '.join( w.lower() for w in mnemonic.split( ' ' ) if w )
-    # Unfortunately, Mnemonic.detect_language was unreliable; only checked the first word
-    # and english/french has ambiguous words. TODO: check if python-mnemonic has been fixed.
+    # Unfortunately, Mnemonic.detect_language was unreliable (and slow); some words are ambiguous
+    # (eg. english/french), so try each language whose wordlist contains every word.
     last			= ValueError( "Empty mnemonic" )
-    for word in mnemonic.split( ' ' ):
+    if mnemonic:
+        last			= ValueError( f"No BIP-39 language contains every word of the mnemonic: {mnemonic!r}" )
+    for language in bip39_languages( mnemonic ):
         try:
-            language		= Mnemonic.detect_language( word )
-            m			= Mnemonic( language )
+            m			= bip39_mnemonic( language )
             assert m.check( mnemonic ), \
                 f"Invalid {language} mnemonic: {mnemonic!r}"
             if as_entropy:
@@ -132,13 +254,82 @@ def recover_bip39(
     raise last
 
 
+def recover_bip39_chunk(
+    pairs: Sequence[Tuple[str,Union[str,bytes]]],
+    as_entropy: bool		= False,
+    strict: bool		= True,
+) -> List[Optional[bytes]]:
+    """Recover the BIP-39 seed (or entropy) of each (<mnemonic>, <passphrase>) pair (eg. in a worker
+    process).  Unless strict, an invalid mnemonic produces None, instead of raising an Exception.
+
+    """
+    results			= []
+    for mnemonic,passphrase in pairs:
+        try:
+            results.append( recover_bip39( mnemonic, passphrase, as_entropy=as_entropy ))
+        except Exception as exc:
+            if strict:
+                raise
+            log.warning( f"Invalid BIP-39 mnemonic: {exc}" )
+            results.append( None )
+    return results
+
+
+def recover_bip39_batch(
+    pairs: Iterable[Tuple[str,Union[str,bytes]]],
+    as_entropy: bool		= False,
+    strict: bool		= True,		# Raise on an invalid mnemonic; otherwise, yield None
+    workers: Optional[int]	= None,		# default: os.cpu_count()
+    chunksize: int		= 16,
+) -> Iterator[Optional[bytes]]:
+    """Yields the BIP-39 seed (or entropy) of each of many (<mnemonic>, <passphrase>) pairs, in input
+    order, stretching them (2048 rounds of PBKDF2-HMAC-SHA512 each) in chunks by a pool of worker
+    processes.  For example, to test many passphrase candidates for a BIP-39 mnemonic:
+
+        for passphrase,seed in zip( candidates, recover_bip39_batch(
+                ( mnemonic, passphrase ) for passphrase in candidates )):
+            ...
+
+    """
+    yield from parallel_chunked(
+        functools.partial( recover_bip39_chunk, as_entropy=as_entropy, strict=strict ), pairs,
+        chunksize=chunksize, workers=workers )
+
+
+@functools.lru_cache( maxsize=None )
+def bip39_mnemonic( language: str ) -> Mnemonic:
+    """A Mnemonic for the language; each loads its wordlist from disk, so is only constructed once."""
+    return Mnemonic( language )
+
+
+@functools.lru_cache( maxsize=None )
+def bip39_word_languages() -> Dict[str,FrozenSet[str]]:
+    """Index every (NFKD normalized) word of every BIP-39 wordlist to the set of its languages."""
+    languages			= defaultdict( set )
+    for language in Mnemonic.list_languages():
+        for word in bip39_mnemonic( language ).wordlist:
+            languages[Mnemonic.normalize_string( word )].add( language )
+    return { word: frozenset( langs ) for word,langs in languages.items() }
+
+
+def bip39_languages( mnemonic: str ) -> List[str]:
+    """Return the BIP-39 languages (english first) whose wordlists contain every word of the mnemonic."""
+    index			= bip39_word_languages()
+    languages			= None
+    for word in set( Mnemonic.normalize_string( mnemonic ).split() ):
+        languages		= index.get( word, frozenset() ) if languages is None else languages & index.get( word, frozenset() )
+        if not languages:
+            return []
+    return sorted( languages or (), key=lambda language: ( language != 'english', language ))
+
+
 def produce_bip39(
     entropy: Optional[bytes],
     strength: Optional[int]	= None,
     language: str		= "english",
 ) -> str:
     """Produce a BIP-38 Mnemonic from the provided entropy (or generated, default 128 bits)."""
-    mnemo			= Mnemonic( language )
+    mnemo			= bip39_mnemonic( language )
     if entropy:
         return mnemo.to_mnemonic( entropy )
     return mnemo.generate( strength or 128 )
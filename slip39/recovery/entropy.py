@@ -19,13 +19,19 @@ import cmath
 import codecs
 import logging
 import math
+import time
+
+from array		import array
+from functools		import lru_cache
 
 try:
+    import numpy as np
     from numpy		import fft as np_fft
 except ImportError:
-    np_fft			= None
+    np = np_fft			= None
 
-from collections	import namedtuple, defaultdict
+from collections	import Counter, namedtuple
+from concurrent.futures	import Executor, ProcessPoolExecutor, wait
 from typing		import List, Union, Tuple, Optional, Callable, Sequence
 
 from ..util		import mixed_fraction, ordinal, commas, is_power_of_2, avg, rms
@@ -340,16 +346,116 @@ class Signal( namedtuple('Signal', [ 'dB', 'stride', 'symbols', 'offset', 'detai
         return f"{self.dB:7.2f}dB, at {self.offset=:3}: {self.symbols:2} x {self.stride:2} bits/symbol: {self.details}"
 
 
+class EntropyBits:
+    """A packed (int-backed) bit view of some entropy, for extracting big-endian 'stride'-bit symbols
+    at any bit offset w/o expanding the entropy into a '0101...' str.  The str is only produced (once)
+    if required, eg. for rendering details.  Build one per analysis of an entropy (eg. in
+    scan_entropy), and supply it in place of the entropy bytes to each {signal,shannon}_entropy.
+
+    """
+    __slots__			= ( 'value', 'length', '_entropy', '_bin', '_hex' )
+
+    def __init__( self, entropy: Union[bytes,str] ):
+        self._entropy = self._bin = self._hex = None
+        if isinstance( entropy, str ):  # a '0101...' str of bits
+            self.value,self.length,self._bin = int( entropy or '0', 2 ),len( entropy ),entropy
+        else:
+            self._entropy	= bytes( entropy )
+            self.value,self.length = int.from_bytes( self._entropy, 'big' ),len( self._entropy ) * 8
+
+    def __len__( self ):
+        return self.length
+
+    def symbol_at( self, offset: int, stride: int ) -> int:
+        """The 'stride'-bit symbol beginning at bit 'offset' (0 is the first entropy byte's MSB)."""
+        return self.value >> ( self.length - offset - stride ) & (( 1 << stride ) - 1 )
+
+    def symbols( self, offset: int, stride: int, count: Optional[int] = None ) -> List[int]:
+        """Up to count of the full 'stride'-bit symbols beginning at bit 'offset'."""
+        available		= ( self.length - offset ) // stride
+        count			= available if count is None else min( count, available )
+        mask			= ( 1 << stride ) - 1
+        shift			= self.length - offset - stride
+        value			= self.value
+        return [ value >> ( shift - s * stride ) & mask for s in range( count ) ]
+
+    @property
+    def entropy( self ) -> bytes:
+        if self._entropy is None:
+            self._entropy	= self.value.to_bytes(( self.length + 7 ) // 8, 'big' )
+        return self._entropy
+
+    @property
+    def hex( self ) -> str:
+        if self._hex is None:
+            self._hex		= codecs.encode( self.entropy, 'hex_codec' ).decode( 'ascii' )
+        return self._hex
+
+    def __str__( self ):
+        if self._bin is None:
+            self._bin		= f"{self.value:0{self.length}b}" if self.length else ''
+        return self._bin
+
+
+def entropy_bits( entropy: Union[bytes,str,EntropyBits] ) -> EntropyBits:
+    """The EntropyBits view of the entropy bytes (or '0101...' str), unless it already is one."""
+    return entropy if isinstance( entropy, EntropyBits ) else EntropyBits( entropy )
+
+
+@lru_cache( maxsize=32 )
+def nlog2n( count: int ) -> Tuple[float, ...]:
+    """The table of c * log2( c ) for symbol counts c in [0,count]; 0 * log2( 0 ) is 0."""
+    return (0.0,) + tuple( c * math.log2( c ) for c in range( 1, count + 1 ))
+
+
+class SymbolHistogram:
+    """The counts of each 'stride'-bit symbol value, and the sum of their c * log2( c ) (from a
+    precomputed table), so the Shannon entropy (bits per symbol) needs no per-symbol logarithm:
+
+        H = -sum( c/n * log2( c/n )) = log2( n ) - sum( c * log2( c )) / n
+
+    Up to 'capacity' symbols may be counted.
+
+    """
+    __slots__			= ( 'stride', 'counts', 'total', 'unique', 'nlogn', '_table' )
+
+    def __init__( self, stride: int, capacity: int, symbols: Sequence[int] = () ):
+        self.stride		= stride
+        self.counts		= array( 'I', bytes( array( 'I' ).itemsize << stride ))
+        self.total		= 0
+        self.unique		= 0
+        self.nlogn		= 0.0
+        self._table		= nlog2n( capacity )
+        if symbols:
+            tally		= Counter( symbols )
+            for symbol,n in tally.items():
+                self.counts[symbol] = n
+            self.nlogn		= sum( map( self._table.__getitem__, tally.values() ))
+            self.total		= len( symbols )
+            self.unique		= len( tally )
+
+    def bits( self ) -> float:
+        """The Shannon entropy, in bits per symbol, of the symbols counted (~-0.0,...)."""
+        if not self.total:
+            return 0.0
+        return math.log2( self.total ) - self.nlogn / self.total
+
+    def __getitem__( self, symbol: int ) -> int:
+        return self.counts[symbol]
+
+    def __len__( self ):
+        """The number of unique symbols counted."""
+        return self.unique
+
+
 def entropy_bin_ints( entropy_bin, offset, symbols, stride, cancel_dc=None ):
-    length			= len( entropy_bin )
-    bits			= [
-        entropy_bin[off:off+stride]
-        for off in range( offset, length - stride + 1, stride )
-    ][:symbols]
-    ints			= [ int( b, 2 )  for b in bits ]
+    """The 'stride'-bit x symbols integer values starting at bit 'offset' of the entropy (an
+    EntropyBits, or a '0101...' str).  If cancel_dc, shifts them so '10...' is zero.
+
+    """
+    ints			= entropy_bits( entropy_bin ).symbols( offset, stride, symbols )
     if cancel_dc:
         ints			= [ r - 2**(stride-1) for r in ints ]
-    # print( "bits: " + ' '.join( f"{b:{stride*2}}" for b in bits ))
     # print( "ints: " + ' '.join( f"{r:{stride*2}}" for r in ints ))
     return ints
 
@@ -389,8 +495,90 @@ def int_decode( c, stride=8 ):
     return f"{hex:<{stride}}" if stride <= len( hex ) + 2 else f"0x{hex:<{stride-2}}"
 
 
+def signal_snr( entropy_bin, offset, symbols, stride, threshold, ignore_dc=False ):
+    """Compute the SNR (in dB) of the strongest signals in the DFT of 'stride'-bit x symbols starting
+    at bit 'offset', vs. the denoised threshold target.  Returns (snr_dB, dc, dfts, mags, target,
+    snrd), where snrd is the { index: snr, ... } of each signal bin, strongest first.
+
+    """
+    dfts			= entropy_bin_dfts( entropy_bin, offset, symbols, stride, cancel_dc=not ignore_dc )
+    #print( f"dfts: {' '.join( f'{b:{stride*2}.1f}' for b in dfts )}" )
+    dc				= dfts[0]
+    if ignore_dc:
+        dfts[0]			= 0+0j
+    nrms, mags			= dft_to_rms_mags( dfts )  # abs energy bins, from DC to max freq
+    #print( f"mags: {' '.join( f'{m:{stride*2}.1f}' for m in mags )}: {sum(mags):7.2f} sum, {avg(mags):7.2f} avg, {nrms:7.2f} RMS; dc: {dc:11.1f} == {abs(dc):7.2f} abs" )
+    target, snrs		= denoise_mags( mags, threshold )
+    snrd			= dict( snrs )  # i: snr
+    #print( f"snrs: {' '.join( f'{snrd[i]:{stride*2}.1f}' if i in snrd else (' ' * stride*2) for i in range( len( mags )))}: {target=:7.1f}" )
+
+    # When we have multiple signals, a Signal with several strong signals should have an SNR higher
+    # than something with fewer/weaker signals.  However, only the portion *above* the target
+    # threshold count.  So, sum the tops, and compute the overall Signal SNR.  If all mags are 0
+    # (all sigs were 0), then target will be 0.  However, this means that the signal is totally
+    # predictable (contains infinitely strong signal), so pick an small but non-passing snr (1.0 ==
+    # 0.0dB), so that any other more "legitimate" non-passing signals will likely be chosen as
+    # strongest.  If no signal; report how far below the target our strongest bin is.
+    if snrd:
+        peak			= target + sum( mags[i] - target for i in snrd )
+    else:
+        peak			= max( mags )  # No signals; SNR is greatest bin vs. threshold target
+    snr				= ( peak / target ) if target else 1.0
+    return into_dB( snr ), dc, dfts, mags, target, snrd
+
+
+def signal_snrs( entropy, offsets, symbols, stride, threshold, ignore_dc=False ):
+    """Compute the signal_snr dB for each of the offsets at once, using NumPy.  The entropy is unpacked
+    into bits once, a matrix of each offset's window of symbols is built, and the DFT magnitudes of
+    all windows are computed by a single rfft.  The iterative denoise_mags is performed on all
+    windows at once, each window ceasing once it finds no new peaks.
+
+    """
+    bits			= np.unpackbits( np.frombuffer( entropy, dtype=np.uint8 ))
+    index			= (
+        np.asarray( offsets )[:, None, None]
+        + ( np.arange( symbols ) * stride )[None, :, None]
+        + np.arange( stride )[None, None, :]
+    )
+    weights			= 1 << np.arange( stride - 1, -1, -1 )
+    ints			= ( bits[index] * weights ).sum( axis=2 )
+    if not ignore_dc:
+        ints			= ints - 2**( stride - 1 )
+
+    # The real signal's DFT magnitudes, normalized and w/ each of the bins between DC and max
+    # combined w/ its symmetrical negative frequency bin, as in dft_to_rms_mags
+    mags			= np.abs( np_fft.rfft( ints, axis=1 )) / math.log( symbols, 2 )
+    mags[:, 1:symbols//2]      *= 2
+    if ignore_dc:
+        mags[:, 0]		= 0.0
+
+    # denoise_mags, on all windows
+    snrs			= np.zeros( mags.shape, dtype=bool )
+    curs			= mags.copy()
+    target			= curs.mean( axis=1 ) * threshold
+    active			= np.ones( len( mags ), dtype=bool )
+    while True:
+        peaks			= ~snrs & ( curs >= target[:, None] ) & active[:, None]
+        active			= peaks.any( axis=1 )
+        if not active.any():
+            break
+        snrs		       |= peaks
+        curs[active]		= np.where( snrs[active], target[active, None], mags[active] )
+        target[active]		= curs[active].mean( axis=1 ) * threshold
+
+    peak			= np.where(
+        snrs.any( axis=1 ),
+        target + np.where( snrs, mags - target[:, None], 0.0 ).sum( axis=1 ),
+        mags.max( axis=1 ),
+    )
+    return [
+        into_dB( ( p / t ) if t else 1.0 )
+        for p,t in zip( peak.tolist(), target.tolist() )
+    ]
+
+
 def signal_entropy(
-    entropy: bytes,
+    entropy: Union[bytes,EntropyBits],
     stride: int			= 8,		# bits per symbol
     symbols: Optional[int]	= None,		# symbols per DFT; default to ~128 bits and a power of 2, but < length
     overlap: bool		= False,        # sweep across n-1 bits for symbol start
@@ -418,8 +606,7 @@ def signal_entropy(
     entropy can be rejected as having too much "signal" vs "noise" (entropy).
 
     """
-    entropy_hex			= codecs.encode( entropy, 'hex_codec' ).decode( 'ascii' )
-    entropy_bin			= ''.join( f"{int(h,16):0>4b}" for h in entropy_hex )
+    entropy_bin			= entropy_bits( entropy )
     length			= len( entropy_bin )
     assert not overlap or not ignore_dc, \
         "Cannot specify both overlap and ignore_dc (intended for handling fixed-location symbols)"
@@ -442,52 +629,39 @@ def signal_entropy(
     assert threshold and ( 0 < threshold ), \
         f"A small +'ve ratio threshold of Signal energy (0,...) is required for {length}-bit entropy w/ {stride}-bit symbols eg. 300%, not {threshold=!r}"
     #print( f"signal_entropy: {length:3}-bit entropy w/ {symbols:3} x {stride:2}-bit symbols ({ignore_dc=:5}): {threshold=:f}" )
-    dc				= 0+0j
+    # With NumPy, compute the SNRs of all offsets' windows in one batch; otherwise, each window's
+    # SNR is computed as required.  Either way, only a new strongest window's details are computed.
+    snr_dBs			= None
+    if np is not None:
+        offsets			= [
+            symb + slip
+            for symb in range( 0, length - symbols * stride + 1, stride )
+            for slip in range( stride if overlap else 1 )
+            if length - ( symb + slip ) >= symbols * stride
+        ]
+        snr_dBs			= dict( zip( offsets, signal_snrs(
+            entropy_bin.entropy, offsets, symbols, stride, threshold, ignore_dc=ignore_dc ) if offsets else [] ))
     strongest			= None
-    mags_all			= []
     for symb in range(0, length - symbols * stride + 1, stride ):
         for slip in range( stride if overlap else 1 ):  # noqa: E111
             offset		= symb + slip
             #print( f"=> {symb=:3} + {slip=:3} == {offset}" )
             if length - offset < symbols * stride:
                 break
-            dfts		= entropy_bin_dfts( entropy_bin, offset, symbols, stride, cancel_dc=not ignore_dc )
-            #print( f"dfts: {' '.join( f'{b:{stride*2}.1f}' for b in dfts )}" )
-            dc			= dfts[0]
-            if ignore_dc:
-                dfts[0]		= 0+0j
-            nrms, mags		= dft_to_rms_mags( dfts )  # abs energy bins, from DC to max freq
-            mags_all.append( mags )
-            #print( f"mags: {' '.join( f'{m:{stride*2}.1f}' for m in mags )}: {sum(mags):7.2f} sum, {avg(mags):7.2f} avg, {nrms:7.2f} RMS; dc: {dc:11.1f} == {abs(dc):7.2f} abs" )
-            target, snrs	= denoise_mags( mags, threshold )
-            snrd		= dict( snrs )  # i: snr
-            #print( f"snrs: {' '.join( f'{snrd[i]:{stride*2}.1f}' if i in snrd else (' ' * stride*2) for i in range( len( mags )))}: {target=:7.1f}" )
-
-            # mid			= nrms if middle is None else middle( mags )
-            # target		= mid * threshold
-            # # Find the magnitude, offset of the top magnitudes exceeding target, sorted high to low
-            # tops		= sorted( ( (m,i) for i,m in enumerate( mags ) if m > target ), reverse=True )
-            # # Compute total signal dB SNR vs. target.  If all mags are 0 (all sigs were 0), then top
-            # # and target will all be 0.  However, this means that the signal is totally predictable
-            # # (contains infinitely strong signal), so pick an small but non-passing snr (1.0 ==
-            # # 0.0dB), so that any other more "legitimate" non-passing signals will likely be chosen
-            # # as strongest.  If no signal; report how far below the target our strongest bin is.
-
-            # When we have multiple signals, a Signal with several strong signals should have an SNR
-            # higher than something with fewer/weaker signals.  However, only the portion *above*
-            # the target threshold count.  So, sum the tops, and compute the overall Signal SNR.
-            if snrd:
-                peak		= target + sum( mags[i] - target for i in snrd )
+            if snr_dBs is None:
+                snr_dB,dc,dfts,mags,target,snrd = signal_snr(
+                    entropy_bin, offset, symbols, stride, threshold, ignore_dc=ignore_dc )
             else:
-                peak		= max( mags )  # No signals; SNR is greatest bin vs. threshold target
-            snr			= ( peak / target ) if target else 1.0
-            snr_dB		= into_dB( snr )
-            #print( f"tops: {offset=:3}, {peak=:7.2f}, {threshold=:7.2f}, {target=:7.2f}, {snr=:7.2f}, {snr_dB=:7.2f}" )
+                snr_dB		= snr_dBs[offset]
+            #print( f"tops: {offset=:3}, {threshold=:7.2f}, {snr_dB=:7.2f}" )
             if strongest and snr_dB <= strongest.dB:
                 continue
             if snr_dB < 0 or not show_details:
                 strongest	= Signal( dB=snr_dB, stride=stride, symbols=symbols, offset=offset, details='' )
                 continue
+            if snr_dBs is not None:
+                _,dc,dfts,mags,target,snrd = signal_snr(
+                    entropy_bin, offset, symbols, stride, threshold, ignore_dc=ignore_dc )
 
             # Find the strongest signal frequency bin.  The max frequency (last) bin indicates some
             # pattern sensed in every second symbol (the Nyquist rate, sampled at 2x the max
@@ -513,7 +687,7 @@ def signal_entropy(
             details		= '\n'
             offpref		= ''
             if offset > 8:
-                details	       += f"...x{offset:<3}>{entropy_bin[offset:]}\n"
+                details	       += f"...x{offset:<3}>{str( entropy_bin )[offset:]}\n"
                 offpref		= ' ' * 8
             else:
                 details	       += f"{entropy_bin}\n"
@@ -597,8 +771,6 @@ def signal_entropy(
                 details	       += f"every {commas( harmonic_freq, final_and=True )} symbols"
             details	       += "\n"
             strongest		= Signal( dB=snr_dB, stride=stride, symbols=symbols, offset=offset, details=details )
-    #mags_avgs			= [sum(col)/len(mags_all) for col in zip(*mags_all)]
-    #print( f"avgs: {' '.join( f'{m:{stride*2}.1f}' for m in mags_avgs )}: {sum(mags_avgs):7.2f}" )
     return strongest
 
 signal_entropy.signal_limits	= {  # noqa: E305
@@ -922,7 +1094,7 @@ signal_entropy.signal_limits	= {  # noqa: E305
 
 
 def shannon_entropy(
-    entropy: bytes,
+    entropy: Union[bytes,EntropyBits],
     stride: int			= 8,		# bits per symbol
     overlap: bool		= True,
     threshold: float		= None,         # Allow up to a certain % bits-per-symbol entropy deficit
@@ -953,30 +1125,22 @@ def shannon_entropy(
     only about a 1% rejection rate for good entropy.
 
     """
-    entropy_hex			= codecs.encode( entropy, 'hex_codec' ).decode( 'ascii' )
-    entropy_bin			= ''.join( f"{int(h,16):0>4b}" for h in entropy_hex )
+    entropy_bin			= entropy_bits( entropy )
     length			= len( entropy_bin )
 
-    # Find all the unique n-bit symbols in the entropy at the desired offset(s)
+    # Find all the unique n-bit symbols in the entropy at the desired offset(s).  Every symbol
+    # changes from one bit offset to the next, so each offset's symbols are counted afresh.
     strongest			= None
     for offset in range( stride ) if overlap else (0,):
-        # Calculate the frequency of each unique symbol
-        frequency		= defaultdict( int )
-        # How many full n-bit symbols fit in the entropy at the current symbol-start offset?
-        symbols			= ( length - offset ) // stride
-        for s in range( symbols ):
-            i			= offset + s * stride
-            symbol		= entropy_bin[i:i+stride]
-            frequency[symbol]  += 1
-        assert sum( frequency.values() ) == symbols, \
-            f"Expected {symbols=} sum of probabilities events, found {frequency!r}"
-        assert all( len( s ) == stride for s in frequency ), \
-            f"Expected all {stride}-bit symbols, found {frequency!r}"
-
-        bitspersymbol			= -sum(  # sum may range: (~-0.0,...)
-            probability/symbols * math.log( probability/symbols, 2 )
-            for probability in frequency.values()
-        )
+        # Calculate the frequency of each unique symbol, for all the full n-bit symbols that fit in
+        # the entropy at the current symbol-start offset
+        symbol_ints		= entropy_bin.symbols( offset, stride )
+        symbols			= len( symbol_ints )
+        frequency		= SymbolHistogram( stride, length // stride, symbol_ints )
+        assert frequency.total == symbols, \
+            f"Expected {symbols=} sum of probabilities events, found {frequency.total}"
+
+        bitspersymbol		= frequency.bits()  # may range: (~-0.0,...)
         # For small numbers of symbols, we cannot achieve a full N unique samples.  Therefore, the
         # number of "bits of entropy" per symbol will be low -- even if all of the samples obtained
         # are unique.  Therefore, we return a value in the range (0=bad,1=good) scaled by the bits
@@ -1029,33 +1193,33 @@ def shannon_entropy(
             f"Found {len(frequency):3} unique (of {N_min:3} possible) in {symbols:3}"
             f"x {stride:2}-bit symbols at offset {offset:2} in {length:4}-bit entropy:"
             f" Shannon Entropy {bitspersymbol:7.3f} b/s, P({shannon:7.3f}) unpredictable; {predictability=:7.3f}"
-            f" vs. threshold={thresh:7.3f} == {snr=:7.3f} {snr_dB:7.3f}dB: {entropy_hex}"
+            f" vs. threshold={thresh:7.3f} == {snr=:7.3f} {snr_dB:7.3f}dB: {entropy_bin.hex}"
         )
         if weaker:
             continue
-        longest			= max(len(s) for s in frequency)
         details			= ''
         if snr_dB >= 0 and show_details:
             details	       += f"{len(frequency):2} unique"
             interesting		= sorted(
-                frequency.items(), reverse=True, key=lambda kv: kv[1]
+                (( v, frequency[v] ) for v in dict.fromkeys( symbol_ints )),  # in order of appearance
+                reverse=True, key=lambda kv: kv[1]
             )
             if stride < 7:
                 details	       += f" (base-{2**stride})"
             details	       += ": " + commas(
-                f"{v:>{longest}} = {int_decode( int( v, 2 ), stride=stride ).strip()}: {c:2}"
+                f"{v:0{stride}b} = {int_decode( v, stride=stride ).strip()}: {c:2}"
                 for v,c in ( interesting[:4] if len( interesting ) > 5 else interesting )
             )
             if len( interesting ) > 5:
                 details	       += f", ...x{len( interesting ) - 6}, " + commas(
-                    f"{v:>{longest}} = {int_decode( int( v, 2 ), stride=stride ).strip()}: {c:2}"
+                    f"{v:0{stride}b} = {int_decode( v, stride=stride ).strip()}: {c:2}"
                     for v,c in interesting[-2:]
                 )
             details	       += "\n"
             # Show the frequency of the symbols
             offpref		= ''
             if offset > 8:
-                details	       += f"...x{offset:<3}>{entropy_bin[offset:]}\n"
+                details	       += f"...x{offset:<3}>{str( entropy_bin )[offset:]}\n"
                 offpref		= ' ' * 8
             else:
                 details	       += f"{entropy_bin}\n"
@@ -1065,9 +1229,7 @@ def shannon_entropy(
             least		= min( interesting[-1][1], most - 1 )
             scale		= 255 // ( most - least )
             wav			= ''
-            for s in range( symbols ):
-                i		= offset + s * stride
-                symbol		= entropy_bin[i:i+stride]
+            for symbol in symbol_ints:
                 signal		= ( frequency[symbol] - least ) * scale - 128
                 wav	       += stride * signal_draw( signal )
             details	       += f"{offpref}{wav}\n"
@@ -1185,8 +1347,30 @@ shannon_entropy.shannon_limits	= {  # noqa: E305
 }
 
 
+def entropy_executor( workers: Optional[int] = None ) -> Executor:
+    """A process pool for concurrent scan_entropy analyses w/ this many workers.  Most of the analysis
+    (eg. all of shannon_entropy) is pure Python, and holds the GIL, so threads would not run the
+    analyses in parallel.  The caller is responsible for shutting it down.
+
+    """
+    return ProcessPoolExecutor( max_workers=workers )
+
+
+class EntropyScanIncomplete( TimeoutError ):
+    """A scan_entropy deadline elapsed before all analyses completed; the entropy is not verified.
+    The deficient Signals found by the analyses that did complete are retained.
+
+    """
+    def __init__( self, signals, shannons, completed, analyses, deadline ):
+        super().__init__( f"Entropy scan deadline of {deadline:.3f}s elapsed; only {completed} of {analyses} analyses completed" )
+        self.signals		= signals
+        self.shannons		= shannons
+        self.completed		= completed
+        self.analyses		= analyses
+
+
 def scan_entropy(
-    entropy: bytes,
+    entropy: Union[bytes,EntropyBits],
     strides: Optional[Union[int,Tuple[int,int]]] = None,  # If only a specific stride/s makes sense, eg. for ASCII symbols
     overlap: bool		= True,
     ignore_dc: bool		= False,
@@ -1194,6 +1378,8 @@ def scan_entropy(
     N: Optional[int]		= None,			# shannon_entropy may specify limited unique symbols
     signal_threshold: Optional[float]	= None,
     shannon_threshold: Optional[float]	= None,
+    executor: Optional[Union[bool,Executor]] = None,  # Run each analysis concurrently (True: a new entropy_executor())
+    deadline: Optional[float]	= None,			# Return only the analyses completed in this many seconds
 ) -> Tuple[List[Signal],List[Signal]]:
     """Defaults to as many symbols as we can manage, given 'overlap' (which ensures we scan scan at
     least a full stride of bit offsets).
@@ -1202,6 +1388,16 @@ def scan_entropy(
     0-offset symbols, but perhaps with a couple fewer total symbols, and with a slightly higher
     threshold.
 
+    Each stride's signal_entropy and shannon_entropy analyses are independent; with an executor,
+    they are all submitted at once, and their results merged as they complete.  If a deadline is
+    supplied and elapses first, the remaining analyses are abandoned, and EntropyScanIncomplete is
+    raised w/ the Signals found so far; an incomplete scan never appears to be a clean one.
+
+    The deadline does not stop analyses that are already running (a worker process cannot be
+    interrupted); only those not yet started are cancelled.  With executor=True, a pool is created
+    for this scan, and shut down (w/o waiting) before returning, so its workers exit as soon as
+    their running analyses complete.  A supplied executor's workers remain busy 'til they complete.
+
     """
     if strides is None:
         strides			= (3, 9)
@@ -1211,26 +1407,54 @@ def scan_entropy(
         except TypeError:
             strides		= (int(strides), int(strides)+1)
 
+    entropy			= entropy_bits( entropy )  # shared by all strides' analyses
+    analyses			= [
+        ( signal_entropy, dict( stride=stride, overlap=overlap, ignore_dc=ignore_dc,
+                                show_details=show_details, threshold=signal_threshold ))
+        for stride in range( *strides )
+    ] + [
+        ( shannon_entropy, dict( stride=stride, overlap=overlap, N=N,
+                                 show_details=show_details, threshold=shannon_threshold ))
+        for stride in range( *strides )
+    ]
+    finish			= None if deadline is None else time.monotonic() + deadline
+    results			= {}
+    if executor:
+        owned			= executor is True
+        if owned:
+            executor		= entropy_executor()
+        try:
+            futures		= {
+                executor.submit( analysis, entropy, **kwds ): i
+                for i,(analysis,kwds) in enumerate( analyses )
+            }
+            done,pending	= wait( futures, timeout=deadline )
+            for future in pending:
+                future.cancel()
+            for future in done:
+                results[futures[future]] = future.result()
+        finally:
+            if owned:
+                executor.shutdown( wait=False, cancel_futures=True )
+    else:
+        for i,(analysis,kwds) in enumerate( analyses ):
+            if finish is not None and time.monotonic() >= finish:
+                break
+            results[i]		= analysis( entropy, **kwds )
     signals			= sorted(
         (
             s
-            for s in (
-                signal_entropy( entropy, stride=stride, overlap=overlap, ignore_dc=ignore_dc,
-                                show_details=show_details, threshold=signal_threshold )
-                for stride in range( *strides )
-            )
-            if s.dB >= 0
+            for i,s in results.items()
+            if analyses[i][0] is signal_entropy and s.dB >= 0
         ), reverse=True )
     shannons			= sorted(
         (
             s
-            for s in (
-                shannon_entropy( entropy, stride=stride, overlap=overlap, N=N,
-                                 show_details=show_details, threshold=shannon_threshold )
-                for stride in range( *strides )
-            )
-            if s.dB >= 0
+            for i,s in results.items()
+            if analyses[i][0] is shannon_entropy and s.dB >= 0
         ), reverse=True )
+    if len( results ) < len( analyses ):
+        raise EntropyScanIncomplete( signals, shannons, len( results ), len( analyses ), deadline )
     return signals, shannons
 
 
@@ -1268,6 +1492,8 @@ def analyze_entropy(
     N: Optional[int]		= None,			# shannon_entropy may specify limited unique symbols
     signal_threshold: Optional[float]	= None,
     shannon_threshold: Optional[float]	= None,
+    executor: Optional[Union[bool,Executor]] = None,  # See scan_entropy
+    deadline: Optional[float]	= None,
 ) -> Optional[str]:
     """Analyzes the provided entropy.  If patterns are found, reports the findings; the peak Signal
     and the aggregate report: (Signal, "...").
@@ -1291,10 +1517,19 @@ def analyze_entropy(
     perhaps the analysis on different strides may be related.  So, it might be practical to target
     0.25% failure on each individual test.
 
+    If a deadline elapses before the analysis is complete, a report is always returned, stating
+    that the entropy was not fully analyzed (and any patterns found so far).
+
     """
-    return display_entropy(
-        *scan_entropy(
-            entropy, strides, overlap, ignore_dc=ignore_dc, show_details=show_details, N=N,
-            signal_threshold=signal_threshold, shannon_threshold=shannon_threshold ),
-        what=what
-    )
+    try:
+        return display_entropy(
+            *scan_entropy(
+                entropy, strides, overlap, ignore_dc=ignore_dc, show_details=show_details, N=N,
+                signal_threshold=signal_threshold, shannon_threshold=shannon_threshold,
+                executor=executor, deadline=deadline ),
+            what=what
+        )
+    except EntropyScanIncomplete as exc:
+        log.warning( f"{exc}" )
+        return f"Entropy analysis {('of ' + what) if what else ''} incomplete: {exc}\n\n" + (
+            display_entropy( exc.signals, exc.shannons, what=what ) or '' )
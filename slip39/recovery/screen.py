@@ -0,0 +1,211 @@
+
+#
+# Python-slip39 -- Ethereum SLIP-39 Account Generation and Recovery
+#
+# Copyright (c) 2022, Dominion Research & Development Corp.
+#
+# Python-slip39 is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.  It is also available under alternative (eg. Commercial) licenses, at
+# your option.  See the LICENSE file at the top of the source tree.
+#
+# Python-slip39 is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+
+"""
+Bulk screening of candidate entropy (eg. hardware RNG dumps, dice logs) for the non-random patterns
+detected by scan_entropy, producing a compact verdict per record instead of a formatted report.
+
+Records are read from a stream of hex lines, fixed-size binary records, or lines of die rolls, and
+screened (optionally in chunks by a pool of worker processes) in input order.  Each EntropyVerdict
+holds the strongest Signal harmonic and Shannon entropy deficiencies found (if any); a record
+passes if neither is found.
+"""
+
+import codecs
+import functools
+import itertools
+import json
+import logging
+import time
+
+from collections	import namedtuple
+from typing		import BinaryIO, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from ..util		import parallel_chunked
+from .entropy		import scan_entropy, signal_entropy
+
+log				= logging.getLogger( __package__ )
+
+SCREEN_THRESHOLDS		= ( 300/100, 10/100 )  # Signal, Shannon thresholds for entropy sizes w/o known limits
+SCREEN_FORMATS			= dict(
+    hex		= dict(),					# One hex record per line
+    raw		= dict(),					# Fixed-size binary records
+    dice	= dict( strides=8, overlap=False, ignore_dc=True ),  # Die rolls/coin flips per line, as text
+)
+
+EntropyVerdict			= namedtuple( 'EntropyVerdict', (
+    'record',					# 1-based line (or record) number
+    'bits',
+    'passed',
+    'signal_dB',				# Strongest Signal harmonic deficiency found, or None
+    'signal_stride',
+    'signal_offset',
+    'shannon_dB',				# Strongest Shannon entropy deficiency found, or None
+    'shannon_stride',
+    'shannon_offset',
+    'error',					# Reason the record could not be screened, or None
+) )
+
+
+def dice_sides( rolls: str ) -> int:
+    """Deduce the number of unique symbols (N) of a string of die rolls from its greatest digit: 0/1
+    coin flips, 6-sided dice, or 10-sided dice (w/ 0 entered for the 10 side).
+
+    """
+    return 2 if max( rolls ) <= '1' else 6 if max( rolls ) <= '6' else 10
+
+
+def entropy_records(
+    file: Union[TextIO,BinaryIO,Iterable],
+    format: str			= 'hex',
+    size: int			= 32,		# Bytes per 'raw' record
+) -> Iterator[Tuple[int,Union[bytes,str],Optional[int]]]:
+    """Yield the (<record>, <entropy>, <N>) of each record in the file.  Blank lines and #-comments
+    are skipped (but counted).  For 'dice' records, N is the number of sides deduced from the rolls.
+    An undecodable record yields a str entropy describing the error.
+
+    """
+    if format == 'raw':
+        for record,data in enumerate( iter( lambda: file.read( size ), b'' ), start=1 ):
+            yield record, data, None
+        return
+    for record,line in enumerate( file, start=1 ):
+        if isinstance( line, bytes ):
+            try:
+                line		= line.decode( 'UTF-8' )
+            except UnicodeDecodeError as exc:
+                yield record, f"Invalid UTF-8: {exc}", None
+                continue
+        line			= line.split( '#', 1 )[0].strip()
+        if not line:
+            continue
+        if format == 'dice':
+            if not line.isdigit():
+                yield record, f"Invalid die rolls: {line!r}", None
+                continue
+            yield record, line.encode( 'UTF-8' ), dice_sides( line )
+            continue
+        if line.lower().startswith( '0x' ):
+            line		= line[2:]
+        try:
+            yield record, codecs.decode( line, 'hex_codec' ), None
+        except Exception as exc:
+            yield record, f"Invalid hex: {exc}", None
+
+
+def screen_entropy_record(
+    record: int,
+    entropy: Union[bytes,str],			# A str describes why the record could not be decoded
+    N: Optional[int]		= None,
+    format: str			= 'hex',
+    signal_threshold: Optional[float] = None,
+    shannon_threshold: Optional[float] = None,
+) -> EntropyVerdict:
+    """Screen one record's entropy w/ scan_entropy (w/o details), returning its EntropyVerdict.  The
+    thresholds default to the known limits for the entropy's size, if any; otherwise, to
+    SCREEN_THRESHOLDS.
+
+    """
+    bits			= len( entropy ) * 8 if isinstance( entropy, bytes ) else 0
+    verdict			= EntropyVerdict( record, bits, False, None, None, None, None, None, None, None )
+    if isinstance( entropy, str ):
+        return verdict._replace( error=entropy )
+    kwds			= SCREEN_FORMATS[format]
+    if bits not in signal_entropy.signal_limits.get( kwds.get( 'overlap', True ), {} ):
+        if signal_threshold is None:
+            signal_threshold	= SCREEN_THRESHOLDS[0]
+        if shannon_threshold is None:
+            shannon_threshold	= SCREEN_THRESHOLDS[1]
+    try:
+        signals,shannons	= scan_entropy(
+            entropy, show_details=False, N=N, **kwds,
+            signal_threshold=signal_threshold, shannon_threshold=shannon_threshold )
+    except Exception as exc:
+        return verdict._replace( error=f"{exc}" )
+    if signals:
+        verdict			= verdict._replace(
+            signal_dB		= round( signals[0].dB, 2 ),
+            signal_stride	= signals[0].stride,
+            signal_offset	= signals[0].offset,
+        )
+    if shannons:
+        verdict			= verdict._replace(
+            shannon_dB		= round( shannons[0].dB, 2 ),
+            shannon_stride	= shannons[0].stride,
+            shannon_offset	= shannons[0].offset,
+        )
+    return verdict._replace( passed=not ( signals or shannons ))
+
+
+def screen_entropy_chunk(
+    chunk: List[Tuple[int,Union[bytes,str],Optional[int]]],
+    **kwds
+) -> List[EntropyVerdict]:
+    return [ screen_entropy_record( record, entropy, N, **kwds ) for record,entropy,N in chunk ]
+
+
+def screen_entropy(
+    records: Iterable[Tuple[int,Union[bytes,str],Optional[int]]],  # eg. from entropy_records
+    format: str			= 'hex',
+    signal_threshold: Optional[float] = None,
+    shannon_threshold: Optional[float] = None,
+    workers: Optional[int]	= None,		# Screen in a pool of this many processes
+    chunksize: int		= 64,
+) -> Iterator[EntropyVerdict]:
+    """Yield the EntropyVerdict of each of many (<record>, <entropy>, <N>) records, in input order.
+    With workers, chunks of records are screened by a pool of worker processes, w/ a bounded number
+    of chunks pending.
+
+    """
+    kwds			= dict(
+        format		= format,
+        signal_threshold = signal_threshold,
+        shannon_threshold = shannon_threshold,
+    )
+    if workers:
+        yield from parallel_chunked(
+            functools.partial( screen_entropy_chunk, **kwds ), records,
+            chunksize=chunksize, workers=workers )
+        return
+    records			= iter( records )
+    for chunk in iter( lambda: list( itertools.islice( records, chunksize )), [] ):
+        yield from screen_entropy_chunk( chunk, **kwds )
+
+
+def screen_entropy_file(
+    file: Union[TextIO,BinaryIO,Iterable],
+    output: TextIO,
+    format: str			= 'hex',
+    size: int			= 32,
+    **kwds					# eg. workers=N, signal_threshold=...
+) -> Tuple[int,int,float]:
+    """Screen the entropy records of a file, writing each EntropyVerdict as a line of JSON to output.
+    Returns the number of records screened, the number failing, and the elapsed seconds.
+
+    """
+    count = bits = failed	= 0
+    began			= time.monotonic()
+    for verdict in screen_entropy( entropy_records( file, format=format, size=size ), format=format, **kwds ):
+        output.write( json.dumps( verdict._asdict(), separators=( ',', ':' )) + '\n' )
+        count		       += 1
+        bits		       += verdict.bits
+        failed		       += not verdict.passed
+    elapsed			= time.monotonic() - began
+    log.info(
+        f"Screened {count} records ({bits} bits) in {elapsed:.3f}s: {count / ( elapsed or 1e-9 ):.1f} records/s;"
+        f" {failed} failed" )
+    return count, failed, elapsed
@@ -0,0 +1,93 @@
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Python-slip39 -- Ethereum SLIP-39 Account Generation and Recovery
+#
+# Copyright (c) 2022, Dominion Research & Development Corp.
+#
+# Python-slip39 is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.  It is also available under alternative (eg. Commercial) licenses, at
+# your option.  See the LICENSE file at the top of the source tree.
+#
+# Python-slip39 is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+
+"""
+Bulk validation of SLIP-39 mnemonic shares: word lookup, RS1024 checksum and metadata decoding,
+reporting each share's validity (and the reason, if invalid) rather than raising on the first
+invalid share.
+
+Each share is decoded by shamir_mnemonic's public Share.from_mnemonic, so the validation tracks the
+installed shamir_mnemonic's share format (eg. the customization string and extendable flag of newer
+versions).
+"""
+
+import logging
+
+from collections	import namedtuple
+from typing		import Iterable, Iterator
+
+from shamir_mnemonic	import MnemonicError
+from shamir_mnemonic.share import Share
+
+log				= logging.getLogger( __package__ )
+
+
+ShareValidation			= namedtuple( 'ShareValidation', (
+    'line',					# 1-based line (or item) number of the mnemonic
+    'valid',
+    'error',					# Reason invalid, or None
+    'words',
+    'identifier',
+    'iteration_exponent',
+    'group_index',
+    'group_threshold',
+    'group_count',
+    'index',					# Member index
+    'member_threshold',
+    'extendable',				# Extendable backup flag (False, if unsupported)
+) )
+
+
+def validate_mnemonic( mnemonic: str, line: int = 1 ) -> ShareValidation:
+    """Validate one SLIP-39 mnemonic share, returning its ShareValidation.  The metadata is only
+    decoded for valid shares.
+
+    """
+    invalid			= ShareValidation( line, False, None, len( mnemonic.split() ),
+                                                   None, None, None, None, None, None, None, None )
+    try:
+        share			= Share.from_mnemonic( mnemonic )
+    except ( MnemonicError, ValueError ) as exc:
+        return invalid._replace( error=f"{exc}".rstrip( '.' ))
+    return invalid._replace(
+        valid			= True,
+        identifier		= share.identifier,
+        iteration_exponent	= share.iteration_exponent,
+        group_index		= share.group_index,
+        group_threshold		= share.group_threshold,
+        group_count		= share.group_count,
+        index			= share.index,
+        member_threshold	= share.member_threshold,
+        extendable		= getattr( share, 'extendable', False ),
+    )
+
+
+def validate_mnemonics( mnemonics: Iterable[str] ) -> Iterator[ShareValidation]:
+    """Validate a stream of SLIP-39 mnemonic shares (eg. the lines of a file), yielding a
+    ShareValidation for each; blank lines and #-comments are skipped, but counted:
+
+        with open( "shares.txt" ) as f:
+            for share in validate_mnemonics( f ):
+                if not share.valid:
+                    print( f"line {share.line}: {share.error}" )
+
+    """
+    for line,mnemonic in enumerate( mnemonics, start=1 ):
+        mnemonic		= mnemonic.split( '#', 1 )[0]
+        if not mnemonic.strip():
+            continue
+        yield validate_mnemonic( mnemonic, line )
@@ -3,6 +3,7 @@ import cmath
 import codecs
 import csv
 import hashlib
+import io
 import itertools
 import json
 import logging
@@ -12,13 +13,19 @@ import pytest
 import secrets
 import multiprocessing
 
-from collections	import deque
+from collections	import Counter, deque
+from concurrent.futures	import ThreadPoolExecutor
 
 import shamir_mnemonic
 
 from .api		import create, account, path_hardened
-from .recovery		import recover, recover_bip39, shannon_entropy, signal_entropy, analyze_entropy
+from .recovery		import (
+    recover, recover_bip39, recover_bip39_batch, recover_candidates, validate_mnemonics, bip39_languages, produce_bip39,
+    shannon_entropy, signal_entropy, analyze_entropy,
+)
 from .recovery.entropy	import fft, ifft, pfft, dft, dft_on_real, dft_to_rms_mags, entropy_bin_dfts, denoise_mags, signal_draw, signal_recover_real, scan_entropy
+from .recovery.screen	import entropy_records, screen_entropy, screen_entropy_file, screen_entropy_record
+from .recovery.entropy	import np, EntropyScanIncomplete, signal_snr, signal_snrs, EntropyBits, entropy_bin_ints, SymbolHistogram
 from .dependency_test	import substitute, nonrandom_bytes, SEED_XMAS, SEED_ONES
 from .util		import avg, rms, ordinal, commas, round_onto
 
@@ -100,6 +107,97 @@ def test_recover():
     assert "Invalid set of mnemonics" in str(excinfo.value)
 
 
+def test_recover_pruned():
+    """A bulk scan supplying many groups of shares, some corrupt and some from another SLIP-39, is
+    recovered by trying only the subsets satisfying the group and member thresholds."""
+    groups			= { f"g{g}": (2,3) for g in range( 16 ) }
+    details			= create( "pruned", 8, groups, SEED_XMAS, cryptopaths=[] )
+    others			= create( "others", 2, dict( one = (1,1), two = (1,1) ), SEED_ONES, cryptopaths=[] )
+    corrupt			= details.groups['g0'][1][0].split()
+    corrupt[-1]			= 'academic' if corrupt[-1] != 'academic' else 'acid'
+    mnemonics			= (
+        [ ' '.join( corrupt ) ]
+        + others.groups['one'][1]
+        + [ mnemonic for _,(_,group) in details.groups.items() for mnemonic in group ]
+        + details.groups['g1'][1][:1]  # duplicate
+    )
+    with pytest.raises( shamir_mnemonic.MnemonicError ):
+        shamir_mnemonic.combine_mnemonics( mnemonics )
+
+    # The (smallest) candidates from each identifier; the 1-of-1 group of "others" can never
+    # satisfy its group threshold of 2 alone, so all candidates are from "details"
+    candidates			= itertools.islice( recover_candidates( mnemonics ), 10 )
+    first			= next( candidates )
+    assert len( first ) == 16
+    assert all( len( combo ) == 16 for combo in candidates )
+    assert recover( mnemonics ) == SEED_XMAS
+    assert recover( mnemonics, workers=2 ) == SEED_XMAS
+
+    # Adding the 2nd "others" group allows a smaller recovery of that secret
+    mnemonics		       += others.groups['two'][1]
+    assert len( next( recover_candidates( mnemonics ))) == 2
+    assert recover( mnemonics ) == SEED_ONES
+
+    # No recovery possible; the original Exception is raised
+    with pytest.raises( shamir_mnemonic.MnemonicError ):
+        recover( mnemonics[:10] )
+
+
+def test_recover_decrypted():
+    """Only the recovered encrypted secret is decrypted, and is memoized across calls if desired."""
+    details			= create( "decrypted", 2, groups_example, SEED_XMAS, passphrase=b"secret", cryptopaths=[] )
+    mnemonics			= details.groups['one'][1] + details.groups['fren'][1][:4]
+    decrypts			= []
+    decrypt			= shamir_mnemonic.EncryptedMasterSecret.decrypt
+
+    def counting( self, passphrase ):
+        decrypts.append( passphrase )
+        return decrypt( self, passphrase )
+
+    decrypted			= {}
+    with substitute( shamir_mnemonic.EncryptedMasterSecret, 'decrypt', counting ):
+        assert recover( mnemonics, passphrase=b"secret", decrypted=decrypted ) == SEED_XMAS
+        assert recover( mnemonics[::-1], passphrase=b"secret", decrypted=decrypted ) == SEED_XMAS
+        assert recover( mnemonics, passphrase=b"wrong", decrypted=decrypted ) != SEED_XMAS
+    assert decrypts == [ b"secret", b"wrong" ]
+    assert len( decrypted ) == 2
+
+
+def test_validate_mnemonics():
+    """Bulk validation agrees w/ shamir_mnemonic's Share decoding, for valid and corrupted shares."""
+    mnemonics			= [
+        mnemonic
+        for strength in (128, 256)
+        for g in create( "validate", 2, groups_example, strength=strength, cryptopaths=[] ).groups.values()
+        for mnemonic in g[1]
+    ]
+    corrupted			= []
+    for mnemonic in mnemonics[:6]:
+        words			= mnemonic.split()
+        for i in ( 0, 3, 4, len( words ) - 1 ):
+            corrupted.append( ' '.join( words[:i] + [ 'academic' if words[i] != 'academic' else 'acid' ] + words[i+1:] ))
+    corrupted.extend( [ "academic acid xyzzy", ' '.join( mnemonics[0].split()[:-1] ), ] )
+    lines			= [ "# Scanned shares", "" ] + [ m.upper() for m in mnemonics[:1] ] + mnemonics[1:] + corrupted
+
+    reports			= list( validate_mnemonics( f"{line}\n" for line in lines ))
+    assert len( reports ) == len( lines ) - 2
+    assert reports[0].line == 3
+    for report in reports:
+        try:
+            share		= shamir_mnemonic.share.Share.from_mnemonic( lines[report.line - 1] )
+        except shamir_mnemonic.MnemonicError:
+            assert not report.valid and report.error
+            continue
+        assert report.valid and report.error is None
+        assert report.words == len( lines[report.line - 1].split() )
+        assert ( report.identifier, report.iteration_exponent, report.group_index, report.group_threshold,
+                 report.group_count, report.index, report.member_threshold ) == (
+                     share.identifier, share.iteration_exponent, share.group_index, share.group_threshold,
+                     share.group_count, share.index, share.member_threshold )
+    assert sum( r.valid for r in reports ) == len( mnemonics )
+    assert reports[-2].error.startswith( "Invalid mnemonic word" )
+
+
 @substitute( shamir_mnemonic.shamir, 'RANDOM_BYTES', nonrandom_bytes )
 def test_recover_bip39():
     """Go through the 3 methods for producing accounts from the same 0xffff...ffff Seed Entropy."""
@@ -257,6 +355,32 @@ def into_boolean( val, truthy=(), falsey=() ):
     raise ValueError( val )
 
 
+def test_bip39_languages():
+    assert bip39_languages( 'abandon' ) == ['english', 'french']  # in both wordlists
+    assert bip39_languages( 'abandon ' * 11 + 'about' ) == ['english']
+    assert bip39_languages( 'abandon xyzzy' ) == []
+    assert bip39_languages( '' ) == []
+    french			= produce_bip39( entropy=b'\x01' * 16, language='french' )
+    assert bip39_languages( french ) == ['french']
+    assert recover_bip39( french, as_entropy=True ) == b'\x01' * 16
+    with pytest.raises( ValueError ) as excinfo:
+        recover_bip39( 'abandon xyzzy' )
+    assert "No BIP-39 language" in str( excinfo.value )
+
+
+def test_recover_bip39_batch():
+    mnemonic			= 'zoo ' * 11 + 'wrong'
+    candidates			= [ f"pass{i}" for i in range( 40 ) ]
+    seeds			= list( recover_bip39_batch(
+        (( mnemonic, passphrase ) for passphrase in candidates ), workers=2, chunksize=3 ))
+    assert seeds == [ recover_bip39( mnemonic, passphrase ) for passphrase in candidates ]
+
+    pairs			= [ (mnemonic, ''), ('zoo ' * 12, ''), (mnemonic, '') ]
+    assert list( recover_bip39_batch( pairs, as_entropy=True, strict=False, workers=1 )) == [ b'\xff' * 16, None, b'\xff' * 16 ]
+    with pytest.raises( AssertionError ):
+        list( recover_bip39_batch( pairs, workers=1 ))
+
+
 def test_recover_bip39_vectors():
     # Test some BIP-39 encodings that have caused issues for other platforms:
     #
@@ -570,6 +694,22 @@ def test_denoise_mags():
         print( f"{signal}" )
 
 
+@pytest.mark.skipif( not np,
+                     reason="Batched signal SNRs require NumPy" )
+def test_signal_snrs():
+    """The batched NumPy window SNRs match those computed for each window by signal_snr."""
+    for entropy in ( b'\x01\x23\x45\x67\x89\xab\xcd\xef' * 4, b'0123456789abcdef' * 2, secrets.token_bytes( 32 ) ):
+        entropy_bin		= ''.join( f"{b:08b}" for b in entropy )
+        for stride in range( 3, 9 ):
+            for ignore_dc in ( False, True ):
+                symbols		= len( entropy_bin ) // ( stride * 2 ) * 2 - 2
+                offsets		= list( range( len( entropy_bin ) - symbols * stride + 1 ))
+                snr_dBs		= signal_snrs( entropy, offsets, symbols, stride, 3.0, ignore_dc=ignore_dc )
+                for offset,snr_dB in zip( offsets, snr_dBs ):
+                    assert snr_dB == pytest.approx( signal_snr(
+                        entropy_bin, offset, symbols, stride, 3.0, ignore_dc=ignore_dc )[0], abs=1e-9 )
+
+
 def test_signal_entropy():
     # See if we can detect patterns of bits in various frequency bins.  With 8x 8-bit real-valued
     # samples, we get DC + 4 frequency bins, with the highest frequency bin representing changes in
@@ -700,6 +840,38 @@ def test_signal_lots():
     assert "every 6+2/5, 3+5/9 and 3+1/5 symbols" in signal.details
 
 
+def test_entropy_bits():
+    entropy			= bytes.fromhex( 'a5c3' )
+    bits			= EntropyBits( entropy )
+    assert len( bits ) == 16 and str( bits ) == '1010010111000011' and bits.hex == 'a5c3'
+    assert bits.symbol_at( 0, 4 ) == 0xa and bits.symbol_at( 4, 8 ) == 0x5c and bits.symbol_at( 13, 3 ) == 0b011
+    assert bits.symbols( 1, 3 ) == [ 0b010, 0b010, 0b111, 0b000, 0b011 ]
+    assert bits.symbols( 0, 8, 1 ) == [ 0xa5 ]
+    # A '0101...' str is equivalent
+    assert EntropyBits( str( bits )).entropy == entropy
+    assert entropy_bin_ints( str( bits ), 2, 3, 4 ) == entropy_bin_ints( bits, 2, 3, 4 ) == [ 0b1001, 0b0111, 0b0000 ]
+    assert entropy_bin_ints( bits, 2, 3, 4, cancel_dc=True ) == [ 1, -1, -8 ]
+
+
+def test_symbol_histogram():
+    symbols			= EntropyBits( SEED_XMAS ).symbols( 0, 4 )
+
+    def bits( syms ):
+        return -sum( c/len( syms ) * math.log2( c/len( syms )) for c in Counter( syms ).values() )
+
+    hist			= SymbolHistogram( 4, len( symbols ), symbols )
+    assert hist.total == len( symbols ) and len( hist ) == len( set( symbols ))
+    assert hist[symbols[0]] == symbols.count( symbols[0] )
+    assert hist.bits() == pytest.approx( bits( symbols ))
+
+    # Any window of the symbols
+    for i in range( 1, len( symbols ) - 8 ):
+        window			= SymbolHistogram( 4, 8, symbols[i:i+8] )
+        assert len( window ) == len( set( symbols[i:i+8] ))
+        assert window.bits() == pytest.approx( bits( symbols[i:i+8] ))
+    assert SymbolHistogram( 4, 8, [ 5 ] * 8 ).bits() == 0
+
+
 def test_shannon_entropy():
     shannon			= shannon_entropy( SEED_ONES )
     shannon			= shannon_entropy( SEED_ONES, overlap=False )
@@ -929,6 +1101,22 @@ def test_poor_entropy():
     #assert len( signals ) == 3
     assert len( shannons ) == 3
 
+    # Concurrent analyses produce the same results; a deadline returns only those completed
+    with ThreadPoolExecutor( max_workers=4 ) as executor:
+        assert scan_entropy( entropy, shannon_threshold=10/100, executor=executor ) == ( signals, shannons )
+    assert scan_entropy( entropy, shannon_threshold=10/100, executor=True, deadline=60 ) == ( signals, shannons )
+    # An incomplete scan is never mistaken for acceptable entropy
+    with pytest.raises( EntropyScanIncomplete ) as incomplete:
+        scan_entropy( entropy, shannon_threshold=10/100, deadline=0 )
+    assert incomplete.value.completed == 0 and incomplete.value.analyses == 12
+    # Each executor=True scan uses (and shuts down) its own pool, so an abandoned scan's stale
+    # analyses never delay the next one
+    with pytest.raises( EntropyScanIncomplete ):
+        scan_entropy( entropy, shannon_threshold=10/100, executor=True, deadline=0 )
+    assert scan_entropy( entropy, shannon_threshold=10/100, executor=True, deadline=60 ) == ( signals, shannons )
+    assert "incomplete" in analyze_entropy( SEED_XMAS, deadline=0 )
+    assert analyze_entropy( SEED_XMAS, deadline=60 ) is None
+
     analysis			= analyze_entropy( entropy )
     print( f"Analysis of base-64 phrase: {analysis}" )
     assert analysis and "Shannon entropy reduced at offset 5 in 41x 6-bit symbols" in analysis
@@ -977,6 +1165,39 @@ def test_good_entropy():
     assert len( signals_bad ) / cycles < 3/100
 
 
+def test_screen_entropy():
+    lines			= [
+        "# Candidate seeds",
+        SEED_XMAS.hex(),
+        "",
+        SEED_ONES.hex(),
+        "0x" + ( SEED_XMAS + SEED_XMAS ).hex(),
+        "not hex",
+    ]
+    verdicts			= list( screen_entropy( entropy_records( lines )))
+    assert [ v.record for v in verdicts ] == [ 2, 4, 5, 6 ]
+    assert [ v.bits for v in verdicts ] == [ 128, 128, 256, 0 ]
+    assert [ v.passed for v in verdicts ] == [ True, False, False, False ]
+    assert verdicts[0].signal_dB is verdicts[0].shannon_dB is None
+    assert verdicts[1].signal_dB > 0 and verdicts[1].shannon_dB > 0 and verdicts[1].shannon_stride
+    assert verdicts[3].error.startswith( "Invalid hex" )
+
+    # An undecodable line yields an error verdict; the remaining records are still screened
+    verdicts_bytes		= list( screen_entropy( entropy_records( [ b"\xff\xfe\n", SEED_XMAS.hex().encode() ] )))
+    assert [ v.record for v in verdicts_bytes ] == [ 1, 2 ]
+    assert verdicts_bytes[0].error.startswith( "Invalid UTF-8" ) and verdicts_bytes[1].passed
+
+    # An explicit threshold (even 0.0) is used, not replaced by the SCREEN_THRESHOLDS default
+    verdict_96			= screen_entropy_record( 1, SEED_XMAS[:12], signal_threshold=0.0 )
+    assert "threshold=0.0" in verdict_96.error
+
+    # The same verdicts are produced by a pool of workers, and written as JSONL
+    assert list( screen_entropy( entropy_records( lines ), workers=2, chunksize=1 )) == verdicts
+    output			= io.StringIO()
+    assert screen_entropy_file( io.BytesIO( SEED_XMAS + SEED_ONES ), output, format='raw', size=16 )[:2] == ( 2, 1 )
+    assert [ json.loads( line )['passed'] for line in output.getvalue().splitlines() ] == [ True, False ]
+
+
 def test_rngs_entropy( detailed=False ):
     """Test various RNGs to observe that they exhibit similar spectral features.
 
@@ -18,11 +18,19 @@
 import colorsys
 import fractions
 import getpass
+import hashlib
+import itertools
 import logging
 import math
+import os
 import sys
+import threading
 
+from collections	import deque
+from collections.abc	import Sequence
+from concurrent.futures	import ProcessPoolExecutor
 from functools		import wraps
+from typing		import Callable, Iterable, Iterator, Optional, Union
 
 # util.timer
 #
@@ -194,6 +202,47 @@ def chunker( sequence, size ):
         sequence		= sequence[size:]
 
 
+SECRET_DIGEST_ROUNDS		= 100_000  # PBKDF2-HMAC-SHA256 rounds stretching each secret_digest
+
+
+def secret_digest( secret: Union[str,bytes], salt: bytes, rounds: int = SECRET_DIGEST_ROUNDS ) -> str:
+    """Identify a secret (eg. a seed hex/bytes, or an xpub/xprv) w/o revealing it, as a salted and
+    stretched PBKDF2-HMAC-SHA256 hex digest.  Use a random salt per file (stored w/ the digest), so
+    each file's digest must be attacked separately, at the cost of the stretching per guess.
+
+    """
+    if isinstance( secret, bytes ):
+        secret			= secret.hex()
+    return hashlib.pbkdf2_hmac( 'sha256', secret.lower().encode( 'UTF-8' ), b"slip39:" + salt, rounds ).hex()
+
+
+def parallel_chunked(
+    function: Callable[[list], Iterable],
+    items: Iterable,
+    chunksize: int,
+    workers: Optional[int]	= None,		# default: os.cpu_count()
+) -> Iterator:
+    """Yield the results of function( chunk ) for each chunksize list of the items, in order,
+    computed by a pool of worker processes.  At most 2 chunks per worker are pending, so the items
+    may be unbounded.  The function (eg. a functools.partial of a module-level function) and items
+    must be picklable.  Closing the generator shuts down the pool, cancelling any pending chunks.
+
+    """
+    items			= iter( items )
+    workers			= workers or os.cpu_count() or 1
+    executor			= ProcessPoolExecutor( max_workers=workers )
+    try:
+        pending			= deque()
+        for chunk in iter( lambda: list( itertools.islice( items, chunksize )), [] ):
+            pending.append( executor.submit( function, chunk ))
+            if len( pending ) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown( wait=False, cancel_futures=True )
+
+
 def hex_to_rgb( value, real=False, precision=4 ):
     """
     Convert hex color to ints, or reals rounded to a certain precision.
@@ -345,3 +394,69 @@ class mixed_fraction( fractions.Fraction ):
         if whole and rest:
             return f"{whole}+{fractions.Fraction( rest, self.denominator)}"
         return super().__str__()
+
+
+class lazy_sequence( Sequence ):
+    """A Sequence of the items of an iterable, produced (and memoized) only as they are indexed or
+    iterated.  Only a len(), negative index or exhaustive iteration produces every item.
+
+    >>> produced = []
+    >>> seq = lazy_sequence( produced.append( i ) or i * i for i in range( 5 ))
+    >>> seq[1], produced
+    (1, [0, 1])
+    >>> seq[:3], bool( seq ), produced
+    ([0, 1, 4], True, [0, 1, 2])
+    >>> [(a,)] = lazy_sequence( [ ('a',) ] )
+    >>> len( seq ), seq[-1], list( seq ), produced
+    (5, 16, [0, 1, 4, 9, 16], [0, 1, 2, 3, 4])
+    >>> seq = lazy_sequence( i * i for i in range( 5 ))
+    >>> seq[1], seq.close(), len( seq ), seq
+    (1, [0, 1], 2, lazy_sequence([0, 1]))
+    """
+    def __init__( self, iterable ):
+        self.iterator		= iter( iterable )
+        self.items		= []
+        self.lock		= threading.Lock()
+
+    def produce( self, count=None ):
+        """Produce items 'til at least count are memoized (or all, if None); returns count memoized."""
+        with self.lock:
+            while self.iterator is not None and ( count is None or len( self.items ) < count ):
+                try:
+                    self.items.append( next( self.iterator ))
+                except StopIteration:
+                    self.iterator	= None
+            return len( self.items )
+
+    def close( self ):
+        """Produce no more items, closing (and releasing) the iterable; returns the items memoized."""
+        with self.lock:
+            iterator,self.iterator = self.iterator,None
+        if hasattr( iterator, 'close' ):
+            iterator.close()
+        return self.items
+
+    def __getitem__( self, index ):
+        if isinstance( index, slice ):
+            if ( index.step or 1 ) < 0 or ( index.start or 0 ) < 0 or index.stop is None or index.stop < 0:
+                self.produce()
+            else:
+                self.produce( index.stop )
+            return self.items[index]
+        self.produce( None if index < 0 else index + 1 )
+        return self.items[index]
+
+    def __len__( self ):
+        return self.produce()
+
+    def __bool__( self ):
+        return bool( self.produce( 1 ))
+
+    def __iter__( self ):
+        i			= 0
+        while i < self.produce( i + 1 ):
+            yield self.items[i]
+            i		       += 1
+
+    def __repr__( self ):
+        return f"{self.__class__.__name__}({self.items!r}{'' if self.iterator is None else ' + ...'})"